@@ -23,10 +23,50 @@ class Settings(BaseSettings):
 
     # Anthropic Claude API
     anthropic_api_key: str = ""
+    anthropic_base_url: str = ""                # 비우면 SDK 기본값 (로컬 스텁 서버 테스트 시 지정)
+
+    # LLM 게이트웨이
+    llm_max_concurrency: int = 8                # 프로세스당 동시 API 호출 수
+    llm_queue_timeout_seconds: float = 10.0     # 동시 호출 슬롯 대기 한도
+    llm_request_timeout_seconds: float = 60.0   # 단일 API 호출 타임아웃
+    llm_max_retries: int = 2                    # 429/5xx/연결 오류 재시도 횟수
+    llm_retry_base_delay_seconds: float = 0.5   # 지수 백오프 기준 (full jitter)
+    llm_retry_max_delay_seconds: float = 8.0
+    llm_user_rate_per_minute: int = 20          # 사용자(비로그인은 IP)별 분당 호출 수, 0이면 무제한
+    llm_breaker_failure_threshold: int = 5      # 연속 실패 시 서킷 오픈
+    llm_breaker_reset_seconds: int = 30         # 오픈 후 시험 호출까지 대기
+    llm_cache_enabled: bool = True              # 동일 프롬프트 응답 재사용 (초안 재생성, FAQ성 질문)
+    llm_cache_size: int = 256                   # 메모리 LRU 항목 수
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_sqlite_path: str = ""             # 지정 시 SQLite 파일에도 저장 (재시작 후 유지, 예: ./data/llm_cache.sqlite3)
+
+    # 챗봇 프롬프트 예산 (시스템 프롬프트 제외 추정 토큰)
+    chat_prompt_budget_tokens: int = 6000
+    chat_history_budget_ratio: float = 0.4      # 남은 예산 중 대화 히스토리 몫
+    chat_max_history_turns: int = 10
+
+    # 챗봇 대화 세션 (서버 저장 히스토리)
+    chat_conversation_ttl_hours: int = 24          # 마지막 메시지 후 이 시간이 지나면 만료/삭제
+    chat_conversation_max_messages: int = 40       # 대화당 저장할 최근 메시지 수 (user/assistant 합계)
+    chat_conversation_purge_interval_minutes: int = 60
+
+    # 변경 이벤트 피드 (트랜잭션 아웃박스)
+    outbox_retention_days: int = 7                 # 이보다 오래된 변경 이벤트 삭제
+    outbox_visibility_grace_seconds: int = 5       # 이보다 최근의 seq 빈 자리 앞에서는 읽기 중단 (커밋 순서 보정)
 
     # Google Sheets 동기화
     google_sheets_credentials_file: str = ""
     google_sheets_spreadsheet_id: str = ""
+    google_sheets_batch_rows: int = 5000  # values_batch_update 1회 요청당 최대 행 수
+    google_sheets_sync_interval_minutes: int = 0   # 주기 동기화 간격, 0이면 수동만
+    google_sheets_max_workers: int = 4             # 워크시트 동시 반영 스레드 수
+    google_sheets_requests_per_minute: int = 60    # API 호출 제한 (Sheets 기본 할당량: 사용자당 분당 60회 쓰기), 0이면 무제한
+    google_sheets_burst: int = 10                  # 토큰 버킷 순간 최대 호출 수
+    google_sheets_max_retries: int = 4             # 429/5xx/연결 오류 재시도 횟수
+    google_sheets_retry_base_delay_seconds: float = 1.0
+    google_sheets_import_conflict_policy: str = "flag"  # 시트·DB 모두 바뀐 행: flag(충돌 기록), sheet(시트 우선), db(DB 우선)
+    google_sheets_scheduled_import: bool = False        # 주기 동기화 때 내보내기 전에 시트 편집 가져오기
+    google_sheets_job_stale_minutes: int = 30      # 하트비트가 이보다 오래된 실행 중 작업은 중단된 것으로 간주
 
     # SMTP 이메일 설정
     smtp_host: str = "smtp.gmail.com"
@@ -34,6 +74,44 @@ class Settings(BaseSettings):
     smtp_user: str = ""          # e.g. yjt@yjturbo.com (Gmail or Google Workspace)
     smtp_password: str = ""      # 앱 비밀번호 (2단계 인증 후 생성)
     smtp_from_name: str = "YJT Smart Maintenance"
+    smtp_from_email: str = ""            # 보내는 주소, 비우면 smtp_user (인증 없는 릴레이는 지정 필요)
+    smtp_starttls: bool = True           # 로컬 테스트 서버(aiosmtpd 등)는 false
+    smtp_auth: bool = True               # false면 로그인 생략 (인증 없는 릴레이/테스트 서버)
+    smtp_timeout_seconds: int = 30
+    smtp_idle_close_seconds: int = 60    # 발송 없이 이 시간이 지나면 유지 중인 SMTP 연결 닫기
+    email_batch_size: int = 50           # 워커가 한 번에 가져와 같은 연결로 보내는 메일 수
+    email_poll_seconds: int = 5          # 재시도/다른 프로세스가 넣은 메일 확인 주기
+    email_max_attempts: int = 5          # 이 횟수만큼 실패하면 dead letter로 이동
+    email_retry_base_seconds: int = 30   # 재시도 간격 = base * 2^(시도-1) + 지터
+    email_connect_backoff_max_seconds: int = 300  # SMTP 서버 연결/로그인 실패 시 워커 대기 상한 (poll * 2^연속 실패)
+    email_sent_retention_days: int = 30  # 발송 완료 기록 보관 기간, 0이면 삭제 안 함
+    email_campaign_rate_per_minute: int = 300   # 대량 발송 속도 제한 (개별 메일은 제한 없음), 0이면 무제한
+    email_campaign_max_recipients: int = 20000  # 대량 발송 1건당 최대 수신자 수
+    email_claim_timeout_minutes: int = 10  # 발송 중 선점이 이보다 오래되면 중단된 워커 것으로 보고 큐로 되돌림
+    email_worker_id: str = ""              # 비우면 호스트 이름 - 같은 ID로 재시작하면 이전 프로세스가 잡아 둔 메일을 바로 되돌림 (호스트당 워커 1개 기준)
+
+    # 접속 상태(Presence)
+    presence_timeout_seconds: int = 900            # 마지막 하트비트 후 15분 지나면 오프라인
+    presence_heartbeat_interval_seconds: int = 60  # 토큰 사용 시 last_seen 최소 갱신 간격
+
+    # Activity Log 보존/아카이브
+    activity_log_retention_days: int = 180                   # 0이면 아카이브 비활성화
+    activity_log_archive_dir: str = "./archive/activity_logs"  # gzip JSONL 아카이브 저장 경로
+    activity_log_retention_interval_hours: int = 24          # 보존 작업 실행 주기
+    activity_log_count_cache_seconds: int = 60               # 로그 목록 total 캐시 TTL
+
+    # 알림 팬아웃
+    notification_fanout_async: bool = True    # False면 요청 스레드에서 즉시 발송 (스크립트/디버깅용)
+    low_stock_alert_window_minutes: int = 60  # 동일 재고 저재고 알림 중복 방지 창
+    notification_counter_reconcile_minutes: int = 10  # 읽지 않은 알림 카운터를 실제 COUNT로 다시 맞추는 주기, 0이면 안 함
+
+    # 챗봇 RAG
+    catalogue_matcher_refresh_seconds: int = 30  # 다른 워커의 부품 카탈로그 변경 확인 주기
+    rag_context_cache_seconds: int = 300         # 컨텍스트 블록 캐시 TTL (다른 워커 변경/초과 작업 반영 주기)
+    rag_context_cache_size: int = 512            # 캐시할 컨텍스트 블록 최대 개수
+    semantic_index_dir: str = "./data/semantic_index"  # 의미 검색 인덱스 저장 경로 (.npy + meta.json)
+    semantic_index_refresh_seconds: int = 60           # 다른 워커 변경분 반영 주기
+    semantic_index_delta_max: int = 500                # 델타 문서가 이보다 많으면 전체 재빌드
 
     # CORS
     frontend_url: str = "http://localhost:3000"
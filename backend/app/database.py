@@ -1,3 +1,4 @@
+import logging
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from sqlalchemy.pool import StaticPool, QueuePool
@@ -52,6 +53,17 @@ def get_db():
         db.close()
 
 
+def ensure_indexes(bind=None):
+    """모델에 선언된 인덱스 중 DB에 없는 것만 생성 (create_all은 기존 테이블에 나중에 추가한 인덱스를 만들지 않음)"""
+    bind = bind or engine
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=bind, checkfirst=True)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"⚠️ Index {index.name} not created: {e}")
+
+
 def dispose_engine():
     """서버 종료 시 모든 커넥션 정리 (CLOSE_WAIT 방지)"""
     engine.dispose()
@@ -1,15 +1,73 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
-from app.database import engine, Base, dispose_engine
-from app.routers import parts, inventory, customers, service_orders, inquiries, chatbot, auth, i18n, notifications, analytics, sync, email, vessels, equipment, running_hours, maintenance, activity_log
+from app.database import engine, Base, dispose_engine, ensure_indexes
+from app.routers import parts, inventory, customers, service_orders, inquiries, chatbot, auth, i18n, notifications, analytics, sync, email, vessels, equipment, running_hours, maintenance, activity_log, events
 
 logger = logging.getLogger("uvicorn.error")
 settings = get_settings()
 
 
+# ── 백그라운드: Activity Log 보존기간 아카이브 ────────────────
+async def _activity_log_retention_loop():
+    from app.services.activity_log_service import run_activity_log_retention
+    while True:
+        await asyncio.to_thread(run_activity_log_retention)
+        await asyncio.sleep(settings.activity_log_retention_interval_hours * 3600)
+
+
+# ── 백그라운드: 만료된 챗봇 대화 삭제 ─────────────────────────
+async def _conversation_purge_loop():
+    from app.services.conversation_service import purge_expired_conversations
+    while True:
+        try:
+            await asyncio.to_thread(purge_expired_conversations)
+        except Exception as e:
+            logger.error(f"⚠️ Conversation purge failed: {e}")
+        await asyncio.sleep(settings.chat_conversation_purge_interval_minutes * 60)
+
+
+# ── 백그라운드: 보존 기간이 지난 변경 이벤트 삭제 ───────────
+async def _outbox_purge_loop():
+    from app.services.outbox_service import purge_old_events
+    while True:
+        try:
+            await asyncio.to_thread(purge_old_events)
+        except Exception as e:
+            logger.error(f"⚠️ Outbox purge failed: {e}")
+        await asyncio.sleep(3600)
+
+
+# ── 백그라운드: 읽지 않은 알림 카운터 재계산 ───────────
+async def _notification_counter_reconcile_loop():
+    from app.services.notification_service import run_unread_count_reconcile
+    while True:
+        await asyncio.sleep(settings.notification_counter_reconcile_minutes * 60)
+        try:
+            fixed = await asyncio.to_thread(run_unread_count_reconcile)
+            if fixed:
+                logger.info(f"🔔 Reconciled {fixed} unread notification counter(s)")
+        except Exception as e:
+            logger.error(f"⚠️ Notification counter reconcile failed: {e}")
+
+
+# ── 백그라운드: Google Sheets 주기 동기화 작업 등록 ───────────
+async def _sheets_sync_schedule_loop():
+    from app.services.sync_job_service import sheets_sync_jobs
+    while True:
+        await asyncio.sleep(settings.google_sheets_sync_interval_minutes * 60)
+        try:
+            if settings.google_sheets_scheduled_import:
+                # 시트 편집을 먼저 가져와야 내보내기가 충돌 행을 덮어쓰지 않음 (워커가 순서대로 실행)
+                await asyncio.to_thread(sheets_sync_jobs.submit, trigger="scheduled", kind="sheets_import")
+            await asyncio.to_thread(sheets_sync_jobs.submit, trigger="scheduled")
+        except Exception as e:
+            logger.error(f"⚠️ Scheduled Google Sheets sync failed to enqueue: {e}")
+
+
 # ── Lifespan: startup + shutdown 관리 ─────────────────────────
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -22,11 +80,21 @@ async def lifespan(app: FastAPI):
         from app.models.maintenance_plan import MaintenancePlan  # noqa: F401
         from app.models.work_order import WorkOrder  # noqa: F401
         from app.models.activity_log import ActivityLog  # noqa: F401
+        from app.models.user_presence import UserPresence  # noqa: F401
+        from app.models.chat_conversation import ChatConversation  # noqa: F401
+        from app.models.sheet_sync import SheetRowIndex  # noqa: F401
+        from app.models.sync_job import SyncJob  # noqa: F401
+        from app.models.outbox import OutboxEvent  # noqa: F401
+        from app.models.outbound_email import OutboundEmail, EmailDeadLetter, EmailCampaign  # noqa: F401
         Base.metadata.create_all(bind=engine)
+        ensure_indexes(engine)  # 마이그레이션이 없으므로 기존 테이블에 추가된 인덱스도 여기서 생성
         logger.info("✅ DB tables created")
     except Exception as e:
         logger.error(f"❌ DB table creation failed: {e}")
 
+    from app.services.part_search_service import ensure_search_index
+    ensure_search_index(engine)
+
     try:
         from app.seed.seed_data import seed_database
         seed_database()
@@ -34,8 +102,43 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"⚠️ Seed data error (non-critical): {e}")
 
+    retention_task = None
+    if settings.activity_log_retention_days > 0:
+        retention_task = asyncio.create_task(_activity_log_retention_loop())
+    purge_task = asyncio.create_task(_conversation_purge_loop())
+    outbox_task = asyncio.create_task(_outbox_purge_loop())
+    reconcile_task = None
+    if settings.notification_counter_reconcile_minutes > 0:
+        reconcile_task = asyncio.create_task(_notification_counter_reconcile_loop())
+
+    from app.services.mail_queue_service import mail_queue, smtp_configured
+    if smtp_configured():
+        mail_queue.start()  # 재시작 전에 남은 메일 발송
+
+    from app.services.sync_job_service import sheets_sync_jobs
+    sheets_sync_jobs.recover()
+    schedule_task = None
+    if (
+        settings.google_sheets_sync_interval_minutes > 0
+        and settings.google_sheets_credentials_file
+        and settings.google_sheets_spreadsheet_id
+    ):
+        schedule_task = asyncio.create_task(_sheets_sync_schedule_loop())
+
     logger.info("✅ Application started - DB ready")
     yield
+    if retention_task:
+        retention_task.cancel()
+    purge_task.cancel()
+    outbox_task.cancel()
+    if reconcile_task:
+        reconcile_task.cancel()
+    if schedule_task:
+        schedule_task.cancel()
+    sheets_sync_jobs.stop()
+    mail_queue.stop()
+    from app.services.notification_fanout_service import fanout
+    fanout.stop()
     # ▶ Shutdown: 모든 DB 커넥션 정리 (CLOSE_WAIT 방지 핵심)
     dispose_engine()
     logger.info("🛑 Application shutdown - all connections disposed")
@@ -68,6 +171,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # keyset 페이지네이션 커서
 )
 
 
@@ -99,6 +203,7 @@ app.include_router(equipment.router, prefix="/api", tags=["Equipment"])
 app.include_router(running_hours.router, prefix="/api/running-hours", tags=["Running Hours"])
 app.include_router(maintenance.router, prefix="/api/pms", tags=["PMS"])
 app.include_router(activity_log.router, prefix="/api/activity-log", tags=["Activity Log"])
+app.include_router(events.router, prefix="/api/events", tags=["Events"])
 
 
 @app.get("/")
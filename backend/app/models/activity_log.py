@@ -1,10 +1,15 @@
 """Activity Log 모델 - 사용자 로그인/로그아웃 기록"""
+from datetime import datetime, timezone
 import uuid
 from sqlalchemy import Column, String, DateTime, Text
 from sqlalchemy.sql import func
 from app.database import Base
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
 
@@ -16,4 +21,4 @@ class ActivityLog(Base):
     ip_address = Column(String, default="")
     user_agent = Column(Text, default="")
     details = Column(Text, default="")  # 추가 상세 (예: 실패 사유)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now(), index=True)  # SQLite CURRENT_TIMESTAMP는 초 단위 문자열이라 커서 비교가 어긋남 → Python 기본값 우선
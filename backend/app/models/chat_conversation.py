@@ -0,0 +1,18 @@
+"""챗봇 대화 세션 모델 - 대화 ID별 최근 메시지를 서버에 보관 (클라이언트는 새 메시지만 전송)"""
+import uuid
+from datetime import datetime
+from sqlalchemy import String, DateTime, Text, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class ChatConversation(Base):
+    __tablename__ = "chat_conversations"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    owner_key: Mapped[str] = mapped_column(String(100), index=True)  # user:<id> 또는 ip:<주소>
+    language: Mapped[str] = mapped_column(String(10), default="ko")
+    messages: Mapped[str] = mapped_column(Text, default="[]")  # [{"role", "content"}] JSON
+    message_count: Mapped[int] = mapped_column(Integer, default=0)  # 누적 메시지 수 (잘린 것 포함)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)  # 만료 기준
@@ -15,7 +15,7 @@ class Customer(Base):
     phone: Mapped[str | None] = mapped_column(String(50), nullable=True)
     country: Mapped[str] = mapped_column(String(100))
     vessel_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
     service_orders = relationship("ServiceOrder", back_populates="customer")
     inquiries = relationship("Inquiry", back_populates="customer")
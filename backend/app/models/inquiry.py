@@ -15,6 +15,6 @@ class Inquiry(Base):
     contact_email: Mapped[str] = mapped_column(String(200))
     is_resolved: Mapped[bool] = mapped_column(Boolean, default=False)
     response: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
     customer = relationship("Customer", back_populates="inquiries")
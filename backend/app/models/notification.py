@@ -1,11 +1,16 @@
 """알림 모델"""
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, Index, Integer
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
 import uuid
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class Notification(Base):
     __tablename__ = "notifications"
 
@@ -15,8 +20,20 @@ class Notification(Base):
     message = Column(Text, nullable=False)
     type = Column(String, default="info")  # info, warning, success, order, inquiry
     is_read = Column(Boolean, default=False)
-    reference_id = Column(String, nullable=True)  # 관련 엔티티 ID (주문, 문의 등)
+    reference_id = Column(String, nullable=True, index=True)  # 관련 엔티티 ID (주문, 문의 등)
     reference_type = Column(String, nullable=True)  # order, inquiry, inventory 등
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())  # SQLite CURRENT_TIMESTAMP는 초 단위 문자열이라 커서 비교가 어긋남 → Python 기본값 우선
 
     user = relationship("User", backref="notifications")
+
+    __table_args__ = (
+        Index("ix_notifications_user_created", "user_id", "created_at"),  # 사용자별 최신순 커서 조회
+    )
+
+
+class NotificationCounter(Base):
+    """사용자별 읽지 않은 알림 수 캐시 (생성/읽음/모두읽음 시 갱신)"""
+    __tablename__ = "notification_counters"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,57 @@
+"""발송 메일 큐 모델 - 요청은 큐에 넣기만 하고 백그라운드 워커가 SMTP로 발송"""
+import uuid
+from datetime import datetime
+from sqlalchemy import String, DateTime, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class OutboundEmail(Base):
+    __tablename__ = "outbound_emails"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    to_email: Mapped[str] = mapped_column(String(255))
+    subject: Mapped[str] = mapped_column(String(500))
+    html: Mapped[str] = mapped_column(Text)                # 서명/공통 레이아웃까지 조립된 본문
+    from_header: Mapped[str] = mapped_column(String(255))
+    reply_to: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default="queued", index=True)  # queued, sending, sent, dead, cancelled
+    campaign_id: Mapped[str | None] = mapped_column(String(36), nullable=True, index=True)  # 대량 발송이면 email_campaigns.id
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    claimed_by: Mapped[str | None] = mapped_column(String(36), nullable=True)  # 발송 중인 워커 토큰
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class EmailDeadLetter(Base):
+    """재시도를 모두 소진했거나 영구 오류(5xx)로 발송하지 못한 메일 (관리자 확인/재발송용)"""
+    __tablename__ = "email_dead_letters"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    email_id: Mapped[str] = mapped_column(String(36), index=True)  # outbound_emails.id
+    to_email: Mapped[str] = mapped_column(String(255))
+    subject: Mapped[str] = mapped_column(String(500))
+    html: Mapped[str] = mapped_column(Text)
+    from_header: Mapped[str] = mapped_column(String(255))
+    reply_to: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    failed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    requeued_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class EmailCampaign(Base):
+    """대량 발송 - 수신자별 상태는 campaign_id가 같은 outbound_emails 행"""
+    __tablename__ = "email_campaigns"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    subject: Mapped[str] = mapped_column(String(500))   # 템플릿 원본 ({{name}} 등 포함)
+    body: Mapped[str] = mapped_column(Text)
+    audience: Mapped[str] = mapped_column(Text, default="{}")  # 수신자 조건 JSON (직접 지정 목록이면 {"source": "list"})
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    created_by: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    cancelled_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,17 @@
+"""변경 이벤트 아웃박스 - 추적 대상 엔티티의 insert/update/delete를 같은 트랜잭션에 기록"""
+from datetime import datetime
+from sqlalchemy import BigInteger, Integer, String, DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    seq: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity: Mapped[str] = mapped_column(String(50), index=True)   # 테이블명 (parts, inventory, ...)
+    entity_id: Mapped[str] = mapped_column(String(36))
+    op: Mapped[str] = mapped_column(String(10))                   # insert, update, delete
+    changed: Mapped[str | None] = mapped_column(Text, nullable=True)  # update 시 바뀐 컬럼 목록 JSON
+    payload: Mapped[str] = mapped_column(Text)                    # 변경 후 행 스냅샷 JSON (delete는 마지막 값)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
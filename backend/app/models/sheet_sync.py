@@ -0,0 +1,39 @@
+"""Google Sheets 증분 동기화 상태 - 시트별 행 키 → 시트 행 번호 / 내용 해시, 해시 버전, 가져오기 충돌"""
+import uuid
+from datetime import datetime
+from sqlalchemy import String, DateTime, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class SheetRowIndex(Base):
+    __tablename__ = "sheet_row_index"
+
+    sheet: Mapped[str] = mapped_column(String(100), primary_key=True)   # 워크시트 제목
+    row_key: Mapped[str] = mapped_column(String(36), primary_key=True)  # 원본 엔티티 ID
+    row_number: Mapped[int] = mapped_column(Integer)                    # 시트 행 번호 (헤더 다음 2부터)
+    row_hash: Mapped[str] = mapped_column(String(32))                   # 마지막으로 쓴 값의 해시
+    synced_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class SheetSyncState(Base):
+    """시트별 행 인덱스 메타 - 인덱스 해시를 계산한 방식의 버전 (버전이 다르면 해시 비교 불가)"""
+    __tablename__ = "sheet_sync_state"
+
+    sheet: Mapped[str] = mapped_column(String(100), primary_key=True)
+    hash_version: Mapped[int] = mapped_column(Integer)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SheetSyncConflict(Base):
+    """시트 가져오기 충돌 - 마지막 동기화 이후 시트와 DB가 모두 바뀐 행 (관리자 확인용)"""
+    __tablename__ = "sheet_sync_conflicts"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    sheet: Mapped[str] = mapped_column(String(100), index=True)
+    row_key: Mapped[str] = mapped_column(String(36), index=True)
+    sheet_values: Mapped[str] = mapped_column(Text)  # 시트 쪽 편집 가능 필드 JSON
+    db_values: Mapped[str] = mapped_column(Text)     # 감지 시점 DB 값 JSON
+    status: Mapped[str] = mapped_column(String(20), default="open", index=True)  # open, resolved_sheet, resolved_db
+    detected_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    resolved_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,23 @@
+"""동기화 작업 모델 - 백그라운드 Google Sheets 동기화 요청/진행/결과 기록"""
+import uuid
+from datetime import datetime
+from sqlalchemy import String, DateTime, Text, Boolean
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class SyncJob(Base):
+    __tablename__ = "sync_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind: Mapped[str] = mapped_column(String(50), default="sheets_sync", index=True)
+    status: Mapped[str] = mapped_column(String(20), default="queued", index=True)  # queued, running, succeeded, failed
+    trigger: Mapped[str] = mapped_column(String(20), default="manual")  # manual, scheduled
+    full: Mapped[bool] = mapped_column(Boolean, default=False)  # 시트 전체 재작성 여부
+    requested_by: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    progress: Mapped[str] = mapped_column(Text, default="{}")  # {시트 이름: {status, rows, ...}} JSON
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)  # 진행 중 갱신 (중단 감지)
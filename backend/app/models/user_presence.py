@@ -0,0 +1,17 @@
+"""사용자 접속 상태(Presence) 모델 - 사용자당 1행, 로그인/로그아웃/토큰 사용 시 갱신"""
+from datetime import datetime
+from sqlalchemy import String, DateTime, Boolean
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class UserPresence(Base):
+    __tablename__ = "user_presence"
+
+    user_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_email: Mapped[str] = mapped_column(String(200))
+    user_name: Mapped[str] = mapped_column(String(200))
+    is_online: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
+    last_login_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_logout_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)  # 마지막 하트비트
@@ -4,7 +4,8 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
 from app.services.auth_service import get_developer_user
-from app.services.activity_log_service import get_activity_logs, get_online_users
+from app.services.activity_log_service import get_activity_logs, archive_old_activity_logs
+from app.services.presence_service import get_online_users
 
 router = APIRouter()
 
@@ -15,14 +16,16 @@ def list_activity_logs(
     user_id: str | None = Query(None, description="Filter by user_id"),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Opaque next_cursor from the previous page"),
     dev: User = Depends(get_developer_user),
     db: Session = Depends(get_db),
 ):
     """개발자: 활동 로그 목록 (최신순)"""
-    result = get_activity_logs(db, action=action, user_id=user_id, limit=limit, offset=offset)
+    result = get_activity_logs(db, action=action, user_id=user_id, limit=limit, offset=offset, cursor=cursor)
     logs = result["logs"]
     return {
         "total": result["total"],
+        "next_cursor": result["next_cursor"],
         "logs": [
             {
                 "id": log.id,
@@ -45,5 +48,15 @@ def list_online_users(
     dev: User = Depends(get_developer_user),
     db: Session = Depends(get_db),
 ):
-    """개발자: 현재 온라인 사용자 목록"""
+    """개발자: 현재 온라인 사용자 목록 (last_seen 포함)"""
     return get_online_users(db)
+
+
+@router.post("/archive")
+def archive_activity_logs(
+    retention_days: int | None = Query(None, ge=1, description="Override retention days"),
+    dev: User = Depends(get_developer_user),
+    db: Session = Depends(get_db),
+):
+    """개발자: 보존기간이 지난 로그를 즉시 아카이브 (gzip JSONL)"""
+    return archive_old_activity_logs(db, retention_days=retention_days)
@@ -16,6 +16,7 @@ from app.services.auth_service import (
     hash_password, verify_password, create_access_token, get_current_user, get_admin_user, get_developer_user
 )
 from app.services.activity_log_service import record_activity
+from app.services.presence_service import mark_login, mark_logout
 from app.services.email_service import send_password_reset_email
 
 logger = logging.getLogger(__name__)
@@ -120,6 +121,11 @@ def login(data: UserLogin, request: Request, db: Session = Depends(get_db)):
         except Exception:
             pass  # activity log 실패해도 로그인은 계속
 
+        try:
+            mark_login(db, user)
+        except Exception:
+            db.rollback()  # presence 실패해도 로그인은 계속
+
         token = create_access_token(user.id)
         return TokenResponse(
             access_token=token,
@@ -142,6 +148,10 @@ def logout(request: Request, user: User = Depends(get_current_user), db: Session
         db, user_id=user.id, user_email=user.email, user_name=user.full_name,
         action="logout", ip_address=ip_address, user_agent=user_agent,
     )
+    try:
+        mark_logout(db, user)
+    except Exception:
+        db.rollback()  # presence 실패해도 로그아웃은 계속
     return {"message": "Logged out successfully"}
 
 
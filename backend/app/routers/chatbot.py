@@ -1,9 +1,19 @@
+import json
+import asyncio
 import logging
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.services.chatbot_service import chat_with_ai
+from app.models.user import User
+from app.services.auth_service import decode_token, get_admin_user
+from app.services.chatbot_service import chat_with_ai, stream_chat_with_ai
+from app.services.conversation_service import (
+    load_history, append_turn, load_history_standalone, append_turn_standalone,
+)
+from app.services.llm_gateway_service import gateway
+from app.services.prompt_budget_service import prompt_metrics
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -11,20 +21,80 @@ router = APIRouter()
 
 class ChatMessage(BaseModel):
     message: str
-    history: list[dict] = []
+    conversation_id: str | None = None  # 서버 저장 대화 ID (없으면 새 대화)
+    history: list[dict] = []  # 하위 호환: conversation_id 없이 보낸 경우에만 사용
     language: str = "ko"  # 사용자 선택 언어
 
 
 class ChatResponse(BaseModel):
     response: str
     source: str = "ai"
+    conversation_id: str | None = None
+
+
+def _user_key(request: Request) -> str:
+    """LLM 호출 제한/대화 소유 키 - 로그인 사용자는 ID, 비로그인은 클라이언트 IP (DB 조회 없음)
+
+    프록시 뒤에서는 uvicorn이 신뢰 프록시(--forwarded-allow-ips)의 X-Forwarded-For를 오른쪽부터 따라가
+    request.client를 실제 클라이언트로 바꿔 둠. 신뢰 대역 밖에서 보낸 헤더는 무시되므로 위조 불가.
+    """
+    auth = request.headers.get("authorization", "")
+    if auth.lower().startswith("bearer "):
+        user_id = decode_token(auth[7:].strip())
+        if user_id:
+            return f"user:{user_id}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
 
 
 @router.post("", response_model=ChatResponse)
-def chat(data: ChatMessage, db: Session = Depends(get_db)):
+def chat(
+    data: ChatMessage,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    user_key = _user_key(request)
+    conversation_id, history = load_history(db, data.conversation_id, user_key)
+    if not data.conversation_id and data.history:
+        history = data.history
     try:
-        response = chat_with_ai(data.message, data.history, db, data.language)
-        return ChatResponse(response=response)
+        response = chat_with_ai(data.message, history, db, data.language, user_key)
+        append_turn(db, conversation_id, user_key, data.language, data.message, response)
+        return ChatResponse(response=response, conversation_id=conversation_id)
     except Exception as e:
         logger.error(f"Chatbot error: {e}", exc_info=True)
         return ChatResponse(response=f"⚠️ 오류가 발생했습니다: {str(e)}", source="error")
+
+
+@router.post("/stream")
+async def chat_stream(data: ChatMessage, request: Request):
+    """SSE 스트리밍 응답 - data: {"delta": "..."} 반복 후 event: done (data: {"conversation_id"})"""
+    user_key = _user_key(request)
+    conversation_id, history = await asyncio.to_thread(load_history_standalone, data.conversation_id, user_key)
+    if not data.conversation_id and data.history:
+        history = data.history
+
+    async def event_source():
+        try:
+            chunks: list[str] = []
+            async for chunk in stream_chat_with_ai(data.message, history, data.language, user_key):
+                chunks.append(chunk)
+                yield f"data: {json.dumps({'delta': chunk}, ensure_ascii=False)}\n\n"
+            await asyncio.to_thread(
+                append_turn_standalone, conversation_id, user_key, data.language, data.message, "".join(chunks),
+            )
+            yield f"event: done\ndata: {json.dumps({'conversation_id': conversation_id})}\n\n"
+        except Exception as e:
+            logger.error(f"Chatbot stream error: {e}", exc_info=True)
+            yield f"event: error\ndata: {json.dumps({'detail': f'⚠️ 오류가 발생했습니다: {str(e)}'}, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/metrics")
+def llm_metrics(admin: User = Depends(get_admin_user)):
+    """LLM 게이트웨이 지표 (요청/성공/실패 사유/재시도/토큰/지연시간/서킷 상태) + 프롬프트 크기 분포"""
+    return {**gateway.metrics(), "prompt": prompt_metrics.snapshot()}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from app.database import get_db
@@ -6,14 +6,17 @@ from app.models.customer import Customer
 from app.models.user import User
 from app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
 from app.services.auth_service import get_current_user, get_admin_user
+from app.services.pagination_service import paginate, NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[CustomerResponse])
 def get_customers(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: str | None = None,
     search: str | None = None,
     country: str | None = None,
     user: User = Depends(get_current_user),
@@ -30,7 +33,12 @@ def get_customers(
         )
     if country:
         query = query.filter(Customer.country == country)
-    return query.offset(skip).limit(limit).all()
+    items, next_cursor = paginate(
+        query, [Customer.created_at, Customer.id], limit, cursor=cursor, skip=skip, descending=False,
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
 
 
 @router.get("/{customer_id}", response_model=CustomerResponse)
@@ -1,11 +1,17 @@
-"""이메일 발송 API - 고객에게 직접 이메일 발송 (관리자 전용)"""
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+"""이메일 발송 API - 고객에게 직접 이메일 발송 / 발송 큐 상태 (관리자 전용)"""
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
+from app.models.outbound_email import EmailDeadLetter, EmailCampaign
 from app.services.auth_service import get_admin_user
 from app.services.email_service import send_email
+from app.services.mail_queue_service import mail_queue, smtp_configured
+from app.services.email_campaign_service import (
+    CampaignError, create_campaign, campaign_summary, campaign_recipients, cancel_campaign,
+)
 
 router = APIRouter()
 
@@ -17,13 +23,33 @@ class SendEmailRequest(BaseModel):
     cc_email: str = ""     # 참조
 
 
+class CampaignRecipient(BaseModel):
+    email: EmailStr
+    name: str = ""
+    company: str = ""
+
+
+class CampaignAudience(BaseModel):
+    source: Literal["customers", "vessel_users", "order_customers"]
+    country: str | None = None       # customers
+    vessel_id: str | None = None     # vessel_users
+    order_status: str | None = None  # order_customers
+
+
+class CampaignCreate(BaseModel):
+    subject: str           # {{name}}, {{company}}, {{email}} 사용 가능
+    body: str              # 본문 텍스트 (HTML로 변환, 같은 필드 사용 가능)
+    recipients: list[CampaignRecipient] = []
+    audience: CampaignAudience | None = None
+
+
 @router.post("/send")
 def send_email_endpoint(
     data: SendEmailRequest,
     admin: User = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
-    """고객에게 이메일 발송 (관리자 전용, 네임카드 서명 자동 삽입)"""
+    """고객에게 이메일 발송 (관리자 전용, 네임카드 서명 자동 삽입) - 발송 큐에 등록 후 바로 반환"""
     # 본문 텍스트를 HTML로 변환 (줄바꿈 유지)
     body_html = f'<div style="font-size:14px; color:#1e293b; white-space:pre-wrap;">{data.body}</div>'
 
@@ -38,3 +64,132 @@ def send_email_endpoint(
         raise HTTPException(status_code=500, detail=result["message"])
 
     return result
+
+
+@router.get("/queue")
+def email_queue_stats(admin: User = Depends(get_admin_user)):
+    """발송 큐 상태별 건수 + 미처리 dead letter 수"""
+    return mail_queue.stats()
+
+
+@router.get("/dead-letters")
+def list_dead_letters(
+    limit: int = Query(50, ge=1, le=200),
+    admin: User = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """발송 실패로 보관된 메일 목록 (최신순)"""
+    letters = (
+        db.query(EmailDeadLetter)
+        .filter(EmailDeadLetter.requeued_at.is_(None))
+        .order_by(EmailDeadLetter.failed_at.desc())
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "id": d.id,
+            "email_id": d.email_id,
+            "to_email": d.to_email,
+            "subject": d.subject,
+            "attempts": d.attempts,
+            "error": d.error,
+            "failed_at": d.failed_at.isoformat() if d.failed_at else None,
+        }
+        for d in letters
+    ]
+
+
+@router.post("/dead-letters/{letter_id}/retry")
+def retry_dead_letter(
+    letter_id: str,
+    admin: User = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """보관된 메일 재발송 (원래 큐 항목을 다시 대기 상태로, 없으면 새로 등록)"""
+    letter = db.query(EmailDeadLetter).filter(EmailDeadLetter.id == letter_id).first()
+    if not letter:
+        raise HTTPException(status_code=404, detail="Dead letter not found")
+    if letter.requeued_at:
+        raise HTTPException(status_code=400, detail="Already requeued")
+    email_id = mail_queue.requeue_dead_letter(db, letter)
+    return {"success": True, "email_id": email_id}
+
+
+# ── 대량 발송 (캠페인) ──
+
+def _get_campaign(db: Session, campaign_id: str) -> EmailCampaign:
+    campaign = db.query(EmailCampaign).filter(EmailCampaign.id == campaign_id).first()
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return campaign
+
+
+@router.post("/campaigns", status_code=202)
+def create_email_campaign(
+    data: CampaignCreate,
+    admin: User = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """수신자 목록/조건 + 템플릿으로 대량 발송 등록 - 발송은 백그라운드에서 속도 제한에 맞춰 진행"""
+    if not smtp_configured():
+        raise HTTPException(status_code=400, detail="SMTP is not configured. Set SMTP_HOST and SMTP_USER/SMTP_PASSWORD (or SMTP_AUTH=false with SMTP_FROM_EMAIL) in .env")
+    if not data.recipients and not data.audience:
+        raise HTTPException(status_code=400, detail="Provide recipients or audience")
+    try:
+        campaign = create_campaign(
+            db, admin, data.subject, data.body,
+            recipients=[r.model_dump() for r in data.recipients],
+            audience=data.audience.model_dump(exclude_none=True) if data.audience else None,
+        )
+    except CampaignError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"campaign_id": campaign.id, **campaign_summary(db, campaign)}
+
+
+@router.get("/campaigns")
+def list_email_campaigns(
+    limit: int = Query(20, ge=1, le=100),
+    admin: User = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """최근 대량 발송 목록 + 상태별 건수"""
+    campaigns = db.query(EmailCampaign).order_by(EmailCampaign.created_at.desc()).limit(limit).all()
+    return [campaign_summary(db, c) for c in campaigns]
+
+
+@router.get("/campaigns/{campaign_id}")
+def get_email_campaign(
+    campaign_id: str,
+    admin: User = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """대량 발송 진행 상태 (queued/sending/sent/dead/cancelled 건수)"""
+    return campaign_summary(db, _get_campaign(db, campaign_id))
+
+
+@router.get("/campaigns/{campaign_id}/recipients")
+def list_campaign_recipients(
+    campaign_id: str,
+    status: str | None = Query(None, description="queued, sending, sent, dead, cancelled"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    admin: User = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """수신자별 발송 상태"""
+    _get_campaign(db, campaign_id)
+    return campaign_recipients(db, campaign_id, status, limit, offset)
+
+
+@router.post("/campaigns/{campaign_id}/cancel")
+def cancel_email_campaign(
+    campaign_id: str,
+    admin: User = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """아직 발송하지 않은 메일 취소"""
+    campaign = _get_campaign(db, campaign_id)
+    if campaign.cancelled_at:
+        raise HTTPException(status_code=400, detail="Campaign already cancelled")
+    return {"cancelled": cancel_campaign(db, campaign)}
@@ -0,0 +1,34 @@
+"""변경 이벤트 라우터 - 아웃박스 변경 피드 조회 (관리자 전용)"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models.user import User
+from app.services.auth_service import get_admin_user
+from app.services.outbox_service import read_events, latest_seq, TRACKED_ENTITIES
+
+router = APIRouter()
+
+
+@router.get("")
+def list_events(
+    after: int = Query(0, ge=0, description="Last processed seq (next_after from the previous page)"),
+    limit: int = Query(100, ge=1, le=1000),
+    entity: list[str] | None = Query(None, description=f"Filter: {', '.join(TRACKED_ENTITIES)}"),
+    user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """seq 순서 변경 이벤트 페이지 - 소비자는 next_after를 저장해 두고 이어서 읽음"""
+    if entity:
+        unknown = set(entity) - set(TRACKED_ENTITIES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown entity: {', '.join(sorted(unknown))}")
+    return read_events(db, after=after, limit=limit, entities=entity)
+
+
+@router.get("/head")
+def events_head(
+    user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """현재 마지막 seq - 과거 이벤트 없이 지금부터 구독할 때 after로 사용"""
+    return {"seq": latest_seq(db)}
@@ -1,5 +1,5 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from app.database import get_db
@@ -7,8 +7,10 @@ from app.models.inquiry import Inquiry
 from app.models.user import User
 from app.schemas.inquiry import InquiryCreate, InquiryUpdate, InquiryResponse
 from app.services.auth_service import get_current_user, get_admin_user
-from app.services.notification_service import notify_customer_by_email, notify_admins
+from app.services.notification_service import notify_customer_by_email, enqueue_admin_notification
 from app.services.email_service import send_inquiry_response_email
+from app.services.pagination_service import paginate, NEXT_CURSOR_HEADER
+from app.services.llm_gateway_service import gateway, LLMGatewayError
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +19,10 @@ router = APIRouter()
 
 @router.get("", response_model=list[InquiryResponse])
 def get_inquiries(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: str | None = None,
     resolved: bool | None = None,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -26,7 +30,12 @@ def get_inquiries(
     query = db.query(Inquiry)
     if resolved is not None:
         query = query.filter(Inquiry.is_resolved == resolved)
-    return query.order_by(Inquiry.created_at.desc()).offset(skip).limit(limit).all()
+    items, next_cursor = paginate(
+        query, [Inquiry.created_at, Inquiry.id], limit, cursor=cursor, skip=skip,
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
 
 
 @router.get("/my-inquiries", response_model=list[InquiryResponse])
@@ -50,9 +59,8 @@ def create_inquiry(data: InquiryCreate, user: User = Depends(get_current_user),
     db.commit()
     db.refresh(inquiry)
 
-    # 새 문의 시 관리자에게 알림
-    notify_admins(
-        db,
+    # 새 문의 시 관리자에게 알림 (백그라운드 팬아웃)
+    enqueue_admin_notification(
         title="New Inquiry Received",
         message=f"New inquiry from {inquiry.contact_email}: {inquiry.subject}",
         type="inquiry",
@@ -85,7 +93,7 @@ def generate_inquiry_draft(
         raise HTTPException(status_code=404, detail="Inquiry not found")
 
     detected_lang = _detect_language(inquiry.message)
-    draft = _generate_ai_draft(inquiry.subject, inquiry.message, detected_lang)
+    draft = _generate_ai_draft(inquiry.subject, inquiry.message, detected_lang, user_key=f"user:{admin.id}")
 
     return DraftResponse(draft=draft, detected_language=detected_lang)
 
@@ -204,8 +212,8 @@ LANGUAGE_NAMES = {
 }
 
 
-def _generate_ai_draft(subject: str, message: str, language: str) -> str:
-    """Claude API로 문의 답변 초안 생성"""
+def _generate_ai_draft(subject: str, message: str, language: str, user_key: str | None = None) -> str:
+    """Claude API로 문의 답변 초안 생성 (LLM 게이트웨이 경유)"""
     from app.config import get_settings
     settings = get_settings()
 
@@ -215,9 +223,6 @@ def _generate_ai_draft(subject: str, message: str, language: str) -> str:
         return _fallback_draft(subject, message, language)
 
     try:
-        import anthropic
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-
         system_prompt = f"""You are a professional customer service representative for YONGJIN TURBO CO., LTD. (용진터보), a turbocharger maintenance company based in Busan, South Korea.
 
 Generate a professional and helpful response draft for the customer inquiry below.
@@ -232,19 +237,19 @@ Rules:
 - Keep the response concise (3-5 paragraphs)
 - Do NOT include greeting/closing - just the body content (the system will add signature automatically)"""
 
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
+        return gateway.create(
             max_tokens=1024,
             system=system_prompt,
             messages=[{
                 "role": "user",
                 "content": f"Subject: {subject}\n\nCustomer Message:\n{message}"
             }],
+            user_key=user_key,
+            cache=True,
         )
-        return response.content[0].text
 
-    except Exception as e:
-        logger.error(f"[AI-DRAFT] Claude API error: {e}")
+    except LLMGatewayError as e:
+        logger.error(f"[AI-DRAFT] Claude API unavailable ({e.reason}): {e}")
         return _fallback_draft(subject, message, language)
 
 
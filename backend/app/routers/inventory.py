@@ -2,7 +2,6 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
 from app.models.inventory import Inventory
-from app.models.part import Part
 from app.models.user import User
 from app.schemas.inventory import (
     InventoryCreate,
@@ -121,9 +120,8 @@ def adjust_inventory(inventory_id: str, data: InventoryAdjust, admin: User = Dep
     db.commit()
     db.refresh(inv)
 
-    # 저재고 알림 트리거
-    part = db.query(Part).filter(Part.id == inv.part_id).first()
-    if part:
-        check_low_stock_notification(db, part.name, new_qty, inv.min_quantity, inv.id)
+    # 저재고 알림 트리거 (백그라운드 팬아웃)
+    if inv.part:
+        check_low_stock_notification(inv.part.name, new_qty, inv.min_quantity, inv.id)
 
     return inv
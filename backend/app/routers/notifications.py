@@ -1,31 +1,38 @@
 """알림 라우터"""
-from fastapi import APIRouter, Depends
+import json
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.models.notification import Notification
 from app.models.user import User
 from app.schemas.notification import NotificationResponse, UnreadCountResponse
-from app.services.auth_service import get_current_user
+from app.services.auth_service import get_current_user, create_stream_ticket, redeem_stream_ticket, STREAM_TICKET_EXPIRE_SECONDS
+from app.services.notification_service import get_unread_count as _get_unread_count, mark_read, mark_all_read
+from app.services.notification_stream_service import broker
+from app.services.pagination_service import paginate, NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[NotificationResponse])
 def get_notifications(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: str | None = None,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """현재 사용자의 알림 목록"""
-    return (
-        db.query(Notification)
-        .filter(Notification.user_id == user.id)
-        .order_by(Notification.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    """현재 사용자의 알림 목록 (다음 페이지 커서는 X-Next-Cursor 헤더)"""
+    query = db.query(Notification).filter(Notification.user_id == user.id)
+    items, next_cursor = paginate(
+        query, [Notification.created_at, Notification.id], limit, cursor=cursor, skip=skip,
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
 
 
 @router.get("/unread-count", response_model=UnreadCountResponse)
@@ -33,15 +40,81 @@ def get_unread_count(
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """읽지 않은 알림 수"""
-    count = (
-        db.query(Notification)
-        .filter(Notification.user_id == user.id, Notification.is_read == False)
-        .count()
-    )
+    """읽지 않은 알림 수 (카운터 캐시)"""
+    count = _get_unread_count(db, user.id)
+    db.commit()  # 최초 조회 시 초기화된 카운터 행 저장
     return {"count": count}
 
 
+STREAM_RESYNC_SECONDS = 20  # 다른 워커에서 발생한 변경 반영 + keep-alive 주기
+
+
+def _read_unread_count(user_id: str) -> int:
+    db = SessionLocal()
+    try:
+        count = _get_unread_count(db, user_id)
+        db.commit()
+        return count
+    finally:
+        db.close()
+
+
+@router.post("/stream-ticket")
+def issue_stream_ticket(user: User = Depends(get_current_user)):
+    """알림 스트림 연결용 1회용 티켓 발급 (쿼리스트링이 접근 로그에 남으므로 액세스 토큰 대신 사용)"""
+    return {"ticket": create_stream_ticket(user.id), "expires_in": STREAM_TICKET_EXPIRE_SECONDS}
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    ticket: str = Query(..., description="One-time stream ticket from POST /notifications/stream-ticket"),
+):
+    """알림 SSE 스트림 - 새 알림/읽지 않은 수 변경을 푸시"""
+    user_id = redeem_stream_ticket(ticket)
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Invalid, expired or already used stream ticket")
+
+    def _exists() -> bool:
+        db = SessionLocal()
+        try:
+            return db.query(User.id).filter(User.id == user_id, User.is_active == True).first() is not None
+        finally:
+            db.close()
+
+    if not await asyncio.to_thread(_exists):
+        raise HTTPException(status_code=401, detail="User not found or deactivated")
+
+    queue = broker.subscribe(user_id)
+
+    async def event_source():
+        try:
+            last_count = await asyncio.to_thread(_read_unread_count, user_id)
+            yield f"event: unread\ndata: {json.dumps({'count': last_count})}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=STREAM_RESYNC_SECONDS)
+                except asyncio.TimeoutError:
+                    count = await asyncio.to_thread(_read_unread_count, user_id)
+                    if count != last_count:
+                        last_count = count
+                        yield f"event: unread\ndata: {json.dumps({'count': count})}\n\n"
+                    else:
+                        yield ": keep-alive\n\n"
+                    continue
+                data = event["data"]
+                last_count = data.get("unread_count", data.get("count", last_count))
+                yield f"event: {event['event']}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        finally:
+            broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.put("/{notification_id}/read", response_model=NotificationResponse)
 def mark_as_read(
     notification_id: str,
@@ -49,16 +122,7 @@ def mark_as_read(
     db: Session = Depends(get_db),
 ):
     """알림 읽음 처리"""
-    notif = (
-        db.query(Notification)
-        .filter(Notification.id == notification_id, Notification.user_id == user.id)
-        .first()
-    )
-    if notif:
-        notif.is_read = True
-        db.commit()
-        db.refresh(notif)
-    return notif
+    return mark_read(db, user.id, notification_id)
 
 
 @router.put("/read-all")
@@ -67,8 +131,5 @@ def mark_all_as_read(
     db: Session = Depends(get_db),
 ):
     """모든 알림 읽음 처리"""
-    db.query(Notification).filter(
-        Notification.user_id == user.id, Notification.is_read == False
-    ).update({"is_read": True})
-    db.commit()
+    mark_all_read(db, user.id)
     return {"message": "All notifications marked as read"}
@@ -1,40 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
 from app.models.part import Part
 from app.models.inventory import Inventory
 from app.models.user import User
 from app.schemas.part import PartCreate, PartUpdate, PartResponse, PartWithInventory
 from app.services.auth_service import get_current_user, get_admin_user
+from app.services.pagination_service import paginate, NEXT_CURSOR_HEADER
+from app.services.part_search_service import search_part_ids
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[PartWithInventory])
 def get_parts(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: str | None = None,
     brand: str | None = None,
     category: str | None = None,
     search: str | None = None,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    query = db.query(Part)
-    if brand:
-        query = query.filter(Part.brand == brand)
-    if category:
-        query = query.filter(Part.category == category)
     if search:
-        query = query.filter(
-            or_(
-                Part.name.ilike(f"%{search}%"),
-                Part.part_number.ilike(f"%{search}%"),
-                Part.turbo_model.ilike(f"%{search}%"),
-            )
+        # 검색은 관련도 순 정렬이므로 커서 대신 skip/limit 사용
+        part_ids = search_part_ids(db, [search], limit=skip + limit, brand=brand, category=category)[skip:]
+        rank = {pid: i for i, pid in enumerate(part_ids)}
+        parts = sorted(
+            db.query(Part).options(joinedload(Part.inventory)).filter(Part.id.in_(part_ids)).all(),
+            key=lambda p: rank[p.id],
+        ) if part_ids else []
+    else:
+        query = db.query(Part).options(joinedload(Part.inventory))
+        if brand:
+            query = query.filter(Part.brand == brand)
+        if category:
+            query = query.filter(Part.category == category)
+        parts, next_cursor = paginate(
+            query, [Part.created_at, Part.id], limit, cursor=cursor, skip=skip, descending=False,
         )
-    parts = query.offset(skip).limit(limit).all()
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     result = []
     for part in parts:
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
 from app.models.service_order import ServiceOrder
@@ -12,14 +12,17 @@ from app.schemas.service_order import (
 )
 from app.services.auth_service import get_current_user, get_admin_user
 from app.services.notification_service import notify_customer_by_email
+from app.services.pagination_service import paginate, NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[ServiceOrderWithCustomer])
 def get_orders(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: str | None = None,
     status: str | None = None,
     order_type: str | None = None,
     user: User = Depends(get_current_user),
@@ -31,7 +34,11 @@ def get_orders(
     if order_type:
         query = query.filter(ServiceOrder.order_type == order_type)
 
-    orders = query.order_by(ServiceOrder.created_at.desc()).offset(skip).limit(limit).all()
+    orders, next_cursor = paginate(
+        query, [ServiceOrder.created_at, ServiceOrder.id], limit, cursor=cursor, skip=skip,
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     result = []
     for order in orders:
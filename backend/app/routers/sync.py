@@ -1,35 +1,120 @@
-"""동기화 라우터 - Google Sheets 데이터 내보내기"""
-from fastapi import APIRouter, Depends, HTTPException
+"""동기화 라우터 - Google Sheets 내보내기/가져오기 (백그라운드 작업)"""
+import json
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from app.database import get_db
 from app.config import get_settings
+from app.database import get_db
 from app.models.user import User
+from app.models.sheet_sync import SheetSyncConflict
 from app.services.auth_service import get_admin_user
+from app.services.sync_job_service import sheets_sync_jobs
 
 router = APIRouter()
 
 
-@router.post("/sheets")
-def sync_to_google_sheets(
-    user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db),
-):
-    """DB 데이터를 Google Sheets로 동기화 (관리자 전용)"""
-    settings = get_settings()
+class ConflictResolve(BaseModel):
+    use: Literal["sheet", "db"]  # 적용할 쪽
+
 
+def _require_sheets_config():
+    settings = get_settings()
     if not settings.google_sheets_credentials_file or not settings.google_sheets_spreadsheet_id:
         raise HTTPException(
             status_code=400,
             detail="Google Sheets is not configured. Set GOOGLE_SHEETS_CREDENTIALS_FILE and GOOGLE_SHEETS_SPREADSHEET_ID in .env",
         )
 
-    try:
-        from app.services.google_sheets_service import sync_all
-        result = sync_all(
-            db=db,
-            credentials_file=settings.google_sheets_credentials_file,
-            spreadsheet_id=settings.google_sheets_spreadsheet_id,
-        )
-        return {"status": "success", **result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
+
+@router.post("/sheets", status_code=202)
+def sync_to_google_sheets(
+    full: bool = False,
+    user: User = Depends(get_admin_user),
+):
+    """DB 데이터를 Google Sheets로 동기화 (관리자 전용) - 작업 ID 즉시 반환
+
+    기본은 변경분만, full=true면 시트 전체 재작성. 대기/실행 중인 동기화가 있으면 그 작업을 반환.
+    """
+    _require_sheets_config()
+    job, deduplicated = sheets_sync_jobs.submit(full=full, trigger="manual", requested_by=user.id)
+    return {"job_id": job["id"], "deduplicated": deduplicated, **job}
+
+
+@router.post("/sheets/import", status_code=202)
+def import_from_google_sheets(
+    user: User = Depends(get_admin_user),
+):
+    """시트에서 편집한 재고/단가를 DB로 가져오기 (관리자 전용) - 작업 ID 즉시 반환"""
+    _require_sheets_config()
+    job, deduplicated = sheets_sync_jobs.submit(trigger="manual", requested_by=user.id, kind="sheets_import")
+    return {"job_id": job["id"], "deduplicated": deduplicated, **job}
+
+
+@router.get("/conflicts")
+def list_sync_conflicts(
+    status: str = "open",
+    user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """시트 가져오기 충돌 목록 - 마지막 동기화 이후 시트와 DB가 모두 바뀐 행 (관리자 전용)"""
+    conflicts = (
+        db.query(SheetSyncConflict)
+        .filter(SheetSyncConflict.status == status)
+        .order_by(SheetSyncConflict.detected_at.desc())
+        .limit(200)
+        .all()
+    )
+    return [
+        {
+            "id": c.id,
+            "sheet": c.sheet,
+            "row_key": c.row_key,
+            "sheet_values": json.loads(c.sheet_values),
+            "db_values": json.loads(c.db_values),
+            "status": c.status,
+            "detected_at": c.detected_at.isoformat() if c.detected_at else None,
+            "resolved_at": c.resolved_at.isoformat() if c.resolved_at else None,
+        }
+        for c in conflicts
+    ]
+
+
+@router.post("/conflicts/{conflict_id}/resolve")
+def resolve_sync_conflict(
+    conflict_id: str,
+    data: ConflictResolve,
+    user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """충돌 해결 - sheet: 시트 값을 DB에 반영 / db: DB 값 유지 (다음 내보내기에서 시트에 반영)"""
+    from app.services.sheets_import_service import resolve_conflict
+
+    conflict = db.query(SheetSyncConflict).filter(SheetSyncConflict.id == conflict_id).first()
+    if not conflict:
+        raise HTTPException(status_code=404, detail="Conflict not found")
+    if conflict.status != "open":
+        raise HTTPException(status_code=400, detail="Conflict already resolved")
+    resolve_conflict(db, conflict, data.use)
+    return {"status": conflict.status}
+
+
+@router.get("/jobs")
+def list_sync_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    user: User = Depends(get_admin_user),
+):
+    """최근 동기화 작업 목록 (관리자 전용)"""
+    return sheets_sync_jobs.recent(limit)
+
+
+@router.get("/jobs/{job_id}")
+def get_sync_job(
+    job_id: str,
+    user: User = Depends(get_admin_user),
+):
+    """동기화 작업 상태 / 시트별 진행률 / 오류 (관리자 전용)"""
+    job = sheets_sync_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job
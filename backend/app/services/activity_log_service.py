@@ -1,7 +1,22 @@
-"""Activity Log 서비스 - 로그 기록 및 조회"""
+"""Activity Log 서비스 - 로그 기록, 조회, 보존기간 아카이브"""
+import gzip
+import json
+import uuid
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import text
+from app.config import get_settings
 from app.models.activity_log import ActivityLog
+from app.services.pagination_service import paginate
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# ── total 카운트 캐시 (인메모리) ──
+_count_cache: dict[tuple, tuple[int, float]] = {}  # {(action, user_id): (total, expires_at)}
 
 
 def record_activity(
@@ -35,56 +50,107 @@ def get_activity_logs(
     user_id: str | None = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
 ):
-    """활동 로그 조회 (최신순)"""
+    """활동 로그 조회 (최신순, cursor가 있으면 keyset 페이지네이션)"""
     query = db.query(ActivityLog)
     if action:
         query = query.filter(ActivityLog.action == action)
     if user_id:
         query = query.filter(ActivityLog.user_id == user_id)
-    total = query.count()
-    logs = query.order_by(desc(ActivityLog.created_at)).offset(offset).limit(limit).all()
-    return {"total": total, "logs": logs}
-
-
-def get_online_users(db: Session):
-    """현재 온라인 사용자 (마지막 로그인이 로그아웃보다 최신인 사용자)
-    서브쿼리로 각 유저의 마지막 login/logout 시간 비교
-    """
-    from sqlalchemy import func, case, and_
-    from sqlalchemy.orm import aliased
-
-    # 각 유저의 마지막 로그인/로그아웃 시간
-    subq = (
-        db.query(
-            ActivityLog.user_id,
-            ActivityLog.user_email,
-            ActivityLog.user_name,
-            func.max(
-                case(
-                    (ActivityLog.action == "login", ActivityLog.created_at),
-                    else_=None,
-                )
-            ).label("last_login"),
-            func.max(
-                case(
-                    (ActivityLog.action == "logout", ActivityLog.created_at),
-                    else_=None,
-                )
-            ).label("last_logout"),
-        )
-        .group_by(ActivityLog.user_id, ActivityLog.user_email, ActivityLog.user_name)
-        .all()
+    total = _cached_count(db, query, action, user_id)
+    logs, next_cursor = paginate(
+        query, [ActivityLog.created_at, ActivityLog.id], limit, cursor=cursor, skip=offset,
     )
+    return {"total": total, "logs": logs, "next_cursor": next_cursor}
+
+
+def _cached_count(db: Session, query, action: str | None, user_id: str | None) -> int:
+    """필터별 total 카운트 (TTL 캐시, PostgreSQL 무필터 조회는 pg_class 추정치 사용)"""
+    key = (action, user_id)
+    now = time.monotonic()
+    cached = _count_cache.get(key)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    total = None
+    if action is None and user_id is None and db.bind.dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :name"),
+            {"name": ActivityLog.__tablename__},
+        ).scalar()
+        if estimate is not None and estimate >= 0:  # -1: 아직 ANALYZE 안 됨
+            total = int(estimate)
+    if total is None:
+        total = query.count()
+
+    _count_cache[key] = (total, now + settings.activity_log_count_cache_seconds)
+    return total
+
+
+def archive_old_activity_logs(db: Session, retention_days: int | None = None, batch_size: int = 1000) -> dict:
+    """보존기간이 지난 활동 로그를 gzip JSONL 파일로 옮기고 테이블에서 삭제"""
+    retention_days = settings.activity_log_retention_days if retention_days is None else retention_days
+    if retention_days <= 0:
+        return {"archived": 0, "file": None}
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    if db.query(ActivityLog.id).filter(ActivityLog.created_at < cutoff).first() is None:
+        return {"archived": 0, "file": None}
+
+    archive_dir = Path(settings.activity_log_archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    # 같은 초에 두 번 실행돼도 기존 아카이브를 덮어쓰지 않도록 고유 접미사 + 배타 생성(x)
+    archive_file = archive_dir / f"activity_logs_{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}_{uuid.uuid4().hex[:8]}.jsonl.gz"
+
+    archived = 0
+    with gzip.open(archive_file, "xt", encoding="utf-8") as f:
+        while True:
+            rows = (
+                db.query(ActivityLog)
+                .filter(ActivityLog.created_at < cutoff)
+                .order_by(ActivityLog.created_at)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            for log in rows:
+                f.write(json.dumps({
+                    "id": log.id,
+                    "user_id": log.user_id,
+                    "user_email": log.user_email,
+                    "user_name": log.user_name,
+                    "action": log.action,
+                    "ip_address": log.ip_address,
+                    "user_agent": log.user_agent,
+                    "details": log.details,
+                    "created_at": log.created_at.isoformat() if log.created_at else None,
+                }, ensure_ascii=False) + "\n")
+            # 파일에 먼저 기록한 뒤 삭제 (중단 시 중복은 가능하나 유실은 없음)
+            f.flush()
+            db.query(ActivityLog).filter(
+                ActivityLog.id.in_([log.id for log in rows])
+            ).delete(synchronize_session=False)
+            db.commit()
+            archived += len(rows)
+
+    _count_cache.clear()
+    logger.info(f"[ACTIVITY-LOG] Archived {archived} rows older than {retention_days}d → {archive_file}")
+    return {"archived": archived, "file": str(archive_file)}
+
+
+
+def run_activity_log_retention() -> dict:
+    """보존 작업 단독 실행 (백그라운드 루프용, 자체 세션 사용)"""
+    from app.database import SessionLocal
 
-    online = []
-    for row in subq:
-        # 로그인 기록이 있고, 로그아웃이 없거나 로그인이 더 최신
-        if row.last_login and (row.last_logout is None or row.last_login > row.last_logout):
-            online.append({
-                "user_id": row.user_id,
-                "user_email": row.user_email,
-                "user_name": row.user_name,
-                "last_login": row.last_login.isoformat() if row.last_login else None,
-            })
-    return online
+    db = SessionLocal()
+    try:
+        return archive_old_activity_logs(db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"[ACTIVITY-LOG] Retention job failed: {e}")
+        return {"archived": 0, "file": None, "error": str(e)}
+    finally:
+        db.close()
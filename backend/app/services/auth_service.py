@@ -1,4 +1,6 @@
 """인증 서비스 - JWT + Password Hashing + 역할 기반 접근 제어"""
+import uuid
+import threading
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 import bcrypt
@@ -8,6 +10,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.config import get_settings
+from app.services.presence_service import heartbeat
 
 settings = get_settings()
 
@@ -15,6 +18,8 @@ settings = get_settings()
 SECRET_KEY = settings.secret_key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24 * 7  # 7일
+STREAM_TICKET_EXPIRE_SECONDS = 60  # 알림 스트림 티켓 (쿼리스트링으로 전달되어 접근 로그에 남으므로 짧게)
+STREAM_TICKET_SCOPE = "notification_stream"
 
 # ── Bearer 토큰 인증 ──
 security = HTTPBearer(auto_error=False)
@@ -37,12 +42,45 @@ def create_access_token(user_id: str) -> str:
 
 
 def decode_token(token: str) -> str | None:
-    """토큰에서 user_id 추출. 실패 시 None 반환."""
+    """토큰에서 user_id 추출. 실패 시 None 반환 (용도 제한 티켓은 액세스 토큰으로 쓸 수 없음)."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("sub")
     except JWTError:
         return None
+    if payload.get("scope"):
+        return None
+    return payload.get("sub")
+
+
+# ── 알림 스트림 티켓 (EventSource는 헤더를 보낼 수 없어 쿼리로 전달 → 액세스 토큰 대신 1회용 단기 티켓) ──
+
+_used_tickets: dict[str, float] = {}  # jti → 만료 시각 (1회 사용 확인, 만료분은 정리)
+_used_tickets_lock = threading.Lock()
+
+
+def create_stream_ticket(user_id: str) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(seconds=STREAM_TICKET_EXPIRE_SECONDS)
+    payload = {"sub": user_id, "exp": expire, "scope": STREAM_TICKET_SCOPE, "jti": uuid.uuid4().hex}
+    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def redeem_stream_ticket(ticket: str) -> str | None:
+    """티켓에서 user_id 추출 (용도/만료/재사용 확인). 실패 시 None 반환."""
+    try:
+        payload = jwt.decode(ticket, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    jti = payload.get("jti")
+    if payload.get("scope") != STREAM_TICKET_SCOPE or not jti:
+        return None
+    now = datetime.now(timezone.utc).timestamp()
+    with _used_tickets_lock:
+        for key in [k for k, exp in _used_tickets.items() if exp < now]:
+            del _used_tickets[key]
+        if jti in _used_tickets:
+            return None
+        _used_tickets[jti] = payload["exp"]
+    return payload.get("sub")
 
 
 def get_current_user(
@@ -70,6 +108,8 @@ def get_current_user(
             detail="User not found or deactivated",
         )
 
+    # 접속 상태 하트비트 (스로틀 적용)
+    heartbeat(db, user)
     return user
 
 
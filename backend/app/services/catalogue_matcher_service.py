@@ -0,0 +1,198 @@
+"""부품 카탈로그 매처 - 질문 문장을 한 번 훑어 부품 ID로 직접 해석 (Aho-Corasick)
+
+부품번호 / 터보 모델 / 브랜드 / 분류(한글 별칭 포함)를 패턴으로 하는 오토마톤을
+메모리에 구축해 두고, 메시지 1회 스캔으로 일치한 패턴 → 부품 ID 점수를 합산한다.
+RAG 조회는 결과 ID에 대한 PK IN (...) 조회 1번으로 끝난다.
+
+- 이 프로세스에서 부품이 커밋되면 즉시 재구축 대상으로 표시
+- 다른 워커의 변경은 catalogue_matcher_refresh_seconds 주기로 (개수, 최종 수정시각) 비교
+"""
+import time
+import logging
+import threading
+from collections import deque
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.part import Part
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 분류 별칭 (영문 키워드 / 한글) → Part.category
+CATEGORY_ALIASES = {
+    "nozzle": "Nozzle Ring", "노즐": "Nozzle Ring",
+    "bearing": "Bearing", "베어링": "Bearing",
+    "blade": "Turbine Blade", "블레이드": "Turbine Blade",
+    "compressor": "Compressor Wheel", "컴프레서": "Compressor Wheel",
+    "shaft": "Shaft", "샤프트": "Shaft",
+    "seal": "Seal", "씰": "Seal",
+    "gasket": "Gasket", "가스켓": "Gasket",
+    "casing": "Casing", "케이싱": "Casing",
+    "cartridge": "Cartridge", "카트리지": "Cartridge",
+    "filter": "Filter", "필터": "Filter",
+}
+
+# 패턴 종류별 가중치 (부품번호 > 모델 > 분류 > 브랜드)
+_WEIGHTS = {"part_number": 8, "turbo_model": 4, "category": 2, "brand": 1}
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+class _Automaton:
+    """소문자 패턴 집합에 대한 Aho-Corasick 오토마톤"""
+
+    def __init__(self, patterns: list[str]):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[list[int]] = [[]]
+        self.patterns = patterns
+        for idx, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(idx)
+
+        # BFS로 실패 링크 연결
+        bfs = deque(self.goto[0].values())
+        while bfs:
+            node = bfs.popleft()
+            for ch, nxt in self.goto[node].items():
+                bfs.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, text: str) -> set[int]:
+        """text(소문자)에서 단어 경계가 맞는 패턴 인덱스 집합"""
+        found: set[int] = set()
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for idx in self.out[node]:
+                pattern = self.patterns[idx]
+                start = i - len(pattern) + 1
+                # ASCII 영숫자끼리 붙어 있으면 다른 단어의 일부 (예: "man" in "manual")
+                if _is_word_char(pattern[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(pattern[-1]) and i + 1 < len(text) and _is_word_char(text[i + 1]):
+                    continue
+                found.add(idx)
+        return found
+
+
+class CatalogueMatcher:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (오토마톤, 패턴 인덱스 → ((part_id, weight), ...)) - 읽는 쪽이 짝이 맞는 한 쌍을 보도록 한 속성으로 교체
+        self._index: tuple[_Automaton, tuple[tuple[tuple[str, int], ...], ...]] | None = None
+        self._dirty = True
+        self._signature: tuple | None = None
+        self._checked_at = 0.0
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def match(self, db: Session, text: str, limit: int = 15) -> list[str]:
+        """메시지에서 언급된 부품 ID를 점수 순으로 반환 (없으면 빈 목록)"""
+        self._ensure_fresh(db)
+        index = self._index
+        if index is None:
+            return []
+        automaton, targets = index
+
+        scores: dict[str, int] = {}
+        for idx in automaton.find(text.lower()):
+            for part_id, weight in targets[idx]:
+                scores[part_id] = scores.get(part_id, 0) + weight
+        ranked = sorted(scores.items(), key=lambda kv: -kv[1])
+        return [part_id for part_id, _ in ranked[:limit]]
+
+    def _ensure_fresh(self, db: Session):
+        now = time.monotonic()
+        if not self._dirty and now - self._checked_at < settings.catalogue_matcher_refresh_seconds:
+            return
+        with self._lock:
+            if not self._dirty and now - self._checked_at < settings.catalogue_matcher_refresh_seconds:
+                return
+            dirty, self._dirty = self._dirty, False
+            signature = tuple(db.query(func.count(Part.id), func.max(Part.updated_at)).one())
+            if dirty or signature != self._signature:
+                self._build(db)
+                self._signature = signature
+            self._checked_at = now
+
+    def _build(self, db: Session):
+        pattern_index: dict[str, int] = {}
+        targets: list[dict[str, int]] = []
+
+        def add(pattern: str | None, part_id: str, kind: str, curated: bool = False):
+            if not pattern:
+                return
+            pattern = pattern.strip().lower()
+            # 데이터에서 온 1글자 값은 오탐이 많아 제외, 직접 정한 별칭("씰" 등)은 길이와 무관하게 사용
+            if not pattern or (not curated and len(pattern) < 2) or pattern == "other":
+                return
+            idx = pattern_index.get(pattern)
+            if idx is None:
+                idx = pattern_index[pattern] = len(targets)
+                targets.append({})
+            weights = targets[idx]
+            weights[part_id] = max(weights.get(part_id, 0), _WEIGHTS[kind])
+
+        aliases_by_category: dict[str, list[str]] = {}
+        for alias, category in CATEGORY_ALIASES.items():
+            aliases_by_category.setdefault(category, []).append(alias)
+
+        rows = db.query(Part.id, Part.part_number, Part.turbo_model, Part.brand, Part.category).all()
+        for row in rows:
+            add(row.part_number, row.id, "part_number")
+            add(row.turbo_model, row.id, "turbo_model")
+            # "NR29/S" → "nr29s" 처럼 구분자 없이 입력한 모델명도 인식
+            if row.turbo_model:
+                add("".join(ch for ch in row.turbo_model if ch.isalnum()), row.id, "turbo_model")
+            add(row.brand, row.id, "brand")
+            add(row.category, row.id, "category")
+            for alias in aliases_by_category.get(row.category, ()):
+                add(alias, row.id, "category", curated=True)
+
+        self._index = (
+            (_Automaton(list(pattern_index)), tuple(tuple(t.items()) for t in targets))
+            if pattern_index else None
+        )
+        logger.info(f"[CATALOGUE] Matcher built: {len(rows)} parts, {len(pattern_index)} patterns")
+
+
+catalogue_matcher = CatalogueMatcher()
+
+
+# ── 이 프로세스에서 부품 변경이 커밋되면 재구축 표시 ──
+
+@event.listens_for(Session, "after_flush")
+def _track_part_changes(session: Session, flush_context):
+    if any(isinstance(obj, Part) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["parts_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session):
+    if session.info.pop("parts_changed", False):
+        catalogue_matcher.mark_dirty()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session):
+    session.info.pop("parts_changed", None)
@@ -4,23 +4,33 @@ YJT AI 챗봇 서비스
 - 폴백 모드: 스마트 키워드 매칭 + DB 조회
 """
 import re
+import asyncio
 import logging
-import anthropic
+from typing import AsyncIterator
 
 logger = logging.getLogger(__name__)
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_, func
 from app.config import get_settings
+from app.database import SessionLocal
 from app.models.part import Part
-from app.models.inventory import Inventory
 from app.models.service_order import ServiceOrder
 from app.models.customer import Customer
 from app.models.vessel import Vessel
 from app.models.equipment import Equipment
 from app.models.work_order import WorkOrder
+from app.services.part_search_service import search_part_ids
+from app.services.catalogue_matcher_service import catalogue_matcher, CATEGORY_ALIASES
+from app.services.rag_cache_service import context_cache, normalize_query
+from app.services.semantic_index_service import get_semantic_context
+from app.services.prompt_budget_service import budget_prompt
+from app.services.intent_router_service import classify, Intents
+from app.services.llm_gateway_service import gateway, LLMGatewayError, LLMAuthError, LLMRateLimitedError
 
 settings = get_settings()
 
+CHAT_MODEL = "claude-sonnet-4-20250514"
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 할루시네이션 방지 시스템 프롬프트
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -93,12 +103,15 @@ Nozzle Ring, Bearing (Journal/Thrust), Turbine Blade, Compressor Wheel, Shaft, S
 - 기술 용어(부품명, 모델명)는 영어 원문 유지
 """
 
+# 정적 시스템 프롬프트는 프롬프트 캐시 접두부로 지정 (요청마다 바뀌는 데이터는 user 메시지에만)
+SYSTEM_PROMPT_BLOCKS = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # DB 조회 함수들
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 def _extract_keywords(query: str) -> list[str]:
-    """사용자 질문에서 검색 키워드 추출"""
+    """카탈로그 매처가 부품을 찾지 못했을 때 검색 인덱스에 넘길 키워드 추출"""
     # 터보 모델명 패턴 (NR29/S, MET42, HPR3000, VTR254 등)
     model_patterns = re.findall(r'[A-Za-z]{2,4}[\-]?\d{2,5}[/]?[A-Za-z]?', query)
 
@@ -107,140 +120,154 @@ def _extract_keywords(query: str) -> list[str]:
     found_brands = [b for b in brands if b.lower() in query.lower()]
 
     # 부품 카테고리
-    categories = {
-        "nozzle": "Nozzle Ring", "노즐": "Nozzle Ring",
-        "bearing": "Bearing", "베어링": "Bearing",
-        "blade": "Turbine Blade", "블레이드": "Turbine Blade",
-        "compressor": "Compressor Wheel", "컴프레서": "Compressor Wheel",
-        "shaft": "Shaft", "샤프트": "Shaft",
-        "seal": "Seal", "씰": "Seal",
-        "gasket": "Gasket", "가스켓": "Gasket",
-        "casing": "Casing", "케이싱": "Casing",
-        "cartridge": "Cartridge", "카트리지": "Cartridge",
-        "filter": "Filter", "필터": "Filter",
-    }
-    found_categories = [v for k, v in categories.items() if k in query.lower()]
+    found_categories = list(dict.fromkeys(v for k, v in CATEGORY_ALIASES.items() if k in query.lower()))
 
     keywords = model_patterns + found_brands + found_categories
+    if keywords:
+        return keywords
 
-    # 일반 단어도 추가 (2글자 이상)
-    for word in query.split():
-        cleaned = re.sub(r'[^\w/]', '', word)
-        if len(cleaned) >= 2 and cleaned not in keywords:
-            keywords.append(cleaned)
-
-    return keywords if keywords else [query]
+    # 그 외에는 인덱스 검색 가능한 3글자 이상 단어만 (최대 5개)
+    words = [re.sub(r'[^\w/]', '', w) for w in query.split()]
+    return [w for w in words if len(w) >= 3][:5] or [query]
 
 
 def get_inventory_context(db: Session, query: str) -> str:
-    """사용자 질문에서 관련 재고 정보를 검색하여 컨텍스트 생성"""
-    keywords = _extract_keywords(query)
-    context_parts = []
-
-    # 키워드별로 OR 검색
-    filters = []
-    for kw in keywords:
-        filters.extend([
-            Part.name.ilike(f"%{kw}%"),
-            Part.part_number.ilike(f"%{kw}%"),
-            Part.turbo_model.ilike(f"%{kw}%"),
-            Part.brand.ilike(f"%{kw}%"),
-            Part.category.ilike(f"%{kw}%"),
-        ])
-
-    parts = (
-        db.query(Part)
-        .join(Inventory, Part.id == Inventory.part_id, isouter=True)
-        .filter(or_(*filters))
-        .limit(15)
-        .all()
-    )
+    """사용자 질문에서 관련 재고 정보를 검색하여 컨텍스트 생성 (블록 단위 캐시)"""
+    # 카탈로그 매처로 언급된 부품 ID 해석 (없으면 검색 인덱스 키워드)
+    part_ids = catalogue_matcher.match(db, query, limit=15)
+    if part_ids:
+        key = ("ids", tuple(part_ids))
+        find_ids = lambda: part_ids
+    else:
+        keywords = _extract_keywords(query)
+        key = ("kw", tuple(sorted({normalize_query(k) for k in keywords})))
+        find_ids = lambda: search_part_ids(db, keywords, limit=15)
+
+    context_parts = [
+        context_cache.get_or_build(
+            "inventory", key, ("parts", "inventory"), lambda: _build_parts_block(db, find_ids()),
+        ),
+        context_cache.get_or_build(
+            "order_summary", None, ("service_orders",), lambda: _build_order_summary_block(db),
+        ),
+    ]
+    context_parts = [c for c in context_parts if c]
+    return "\n".join(context_parts) if context_parts else "검색 결과 없음 - 해당 키워드와 일치하는 부품이 DB에 없습니다."
 
-    if parts:
-        context_parts.append("## 📦 관련 부품 재고 정보 (DB 실시간 조회 결과)")
-        for part in parts:
-            qty = part.inventory.quantity if part.inventory else 0
-            min_qty = part.inventory.min_quantity if part.inventory else 0
-            warehouse = part.inventory.warehouse if part.inventory else "N/A"
-            status = "⚠️ 재고부족" if part.inventory and part.inventory.is_low_stock else "✅ 정상"
-            context_parts.append(
-                f"- **{part.name}** ({part.part_number})\n"
-                f"  브랜드: {part.brand} | 모델: {part.turbo_model} | 분류: {part.category}\n"
-                f"  재고: {qty}개 (안전재고: {min_qty}개) | 창고: {warehouse} | 상태: {status}\n"
-                f"  단가: ${part.unit_price:,.2f}"
-            )
 
-    # 주문 통계
-    total_orders = db.query(ServiceOrder).count()
-    pending_orders = db.query(ServiceOrder).filter(ServiceOrder.status == "Pending").count()
-    in_progress = db.query(ServiceOrder).filter(ServiceOrder.status == "In Progress").count()
+def _build_parts_block(db: Session, part_ids: list[str]) -> str:
+    """부품 ID 목록(관련도 순) → 재고 정보 블록"""
+    if not part_ids:
+        return ""
+    rank = {pid: i for i, pid in enumerate(part_ids)}
+    parts = sorted(
+        db.query(Part).options(joinedload(Part.inventory)).filter(Part.id.in_(part_ids)).all(),
+        key=lambda p: rank[p.id],
+    )
+    if not parts:
+        return ""
 
-    if total_orders > 0:
-        context_parts.append(
-            f"\n## 📋 서비스 주문 현황\n"
-            f"- 전체: {total_orders}건 | 대기: {pending_orders}건 | 진행중: {in_progress}건"
+    lines = ["## 📦 관련 부품 재고 정보 (DB 실시간 조회 결과)"]
+    for part in parts:
+        qty = part.inventory.quantity if part.inventory else 0
+        min_qty = part.inventory.min_quantity if part.inventory else 0
+        warehouse = part.inventory.warehouse if part.inventory else "N/A"
+        status = "⚠️ 재고부족" if part.inventory and part.inventory.is_low_stock else "✅ 정상"
+        lines.append(
+            f"- **{part.name}** ({part.part_number})\n"
+            f"  브랜드: {part.brand} | 모델: {part.turbo_model} | 분류: {part.category}\n"
+            f"  재고: {qty}개 (안전재고: {min_qty}개) | 창고: {warehouse} | 상태: {status}\n"
+            f"  단가: ${part.unit_price:,.2f}"
         )
+    return "\n".join(lines)
 
-    return "\n".join(context_parts) if context_parts else "검색 결과 없음 - 해당 키워드와 일치하는 부품이 DB에 없습니다."
 
+def _build_order_summary_block(db: Session) -> str:
+    """서비스 주문 현황 (상태별 집계 1회 조회)"""
+    counts = _count_orders_by_status(db)
+    total_orders = sum(counts.values())
+    if total_orders == 0:
+        return ""
+    return (
+        f"\n## 📋 서비스 주문 현황\n"
+        f"- 전체: {total_orders}건 | 대기: {counts.get('Pending', 0)}건 | 진행중: {counts.get('In Progress', 0)}건"
+    )
 
-def get_vessel_pms_context(db: Session, query: str) -> str:
-    """선박/장비/PMS 관련 컨텍스트"""
-    context_parts = []
 
+def get_vessel_pms_context(db: Session, query: str) -> str:
+    """선박/장비/PMS 관련 컨텍스트 (선단 요약은 데이터 변경 시에만 재계산)"""
     # 선박 관련 키워드 감지
     vessel_keywords = ["vessel", "ship", "선박", "선박", "pms", "정비", "maintenance",
                        "work order", "작업", "overdue", "초과", "장비", "equipment"]
     has_vessel_query = any(kw in query.lower() for kw in vessel_keywords)
+    if not has_vessel_query:
+        return ""
 
-    if has_vessel_query:
-        # 선박 현황
-        vessels = db.query(Vessel).filter(Vessel.is_active == True).all()
-        if vessels:
-            context_parts.append("## 🚢 선박 현황 (DB 조회)")
-            for v in vessels:
-                eq_count = db.query(Equipment).filter(
-                    Equipment.vessel_id == v.id, Equipment.is_active == True
-                ).count()
-                context_parts.append(f"- {v.name} ({v.vessel_type}) - 장비 {eq_count}개")
-
-        # 초과 작업지시서
-        from datetime import datetime
-        now = datetime.utcnow()
-        overdue = (
-            db.query(WorkOrder)
-            .filter(
-                WorkOrder.status.in_(["Planned", "InProgress"]),
-                WorkOrder.due_date < now,
-            )
-            .limit(10)
+    return context_cache.get_or_build(
+        "fleet_summary", None, ("vessels", "equipment", "work_orders"), lambda: _build_fleet_summary_block(db),
+    )
+
+
+def _build_fleet_summary_block(db: Session) -> str:
+    """선박 현황 + 초과 작업지시서 + PMS 통계"""
+    context_parts = []
+
+    # 선박 현황 (장비 수는 선박별 집계 1회 조회)
+    vessels = db.query(Vessel).filter(Vessel.is_active == True).all()
+    if vessels:
+        eq_counts = dict(
+            db.query(Equipment.vessel_id, func.count(Equipment.id))
+            .filter(Equipment.is_active == True)
+            .group_by(Equipment.vessel_id)
             .all()
         )
-        if overdue:
-            context_parts.append(f"\n## ⚠️ 초과 작업지시서 ({len(overdue)}건)")
-            for wo in overdue:
-                eq = db.query(Equipment).filter(Equipment.id == wo.equipment_id).first()
-                v = db.query(Vessel).filter(Vessel.id == wo.vessel_id).first()
-                context_parts.append(
-                    f"- [{wo.priority}] {wo.title} | {v.name if v else 'N/A'} | "
-                    f"{eq.name if eq else 'N/A'} | 기한: {wo.due_date.strftime('%Y-%m-%d') if wo.due_date else 'N/A'}"
-                )
-
-        # PMS 통계
-        total_wo = db.query(WorkOrder).count()
-        completed_wo = db.query(WorkOrder).filter(WorkOrder.status == "Completed").count()
-        if total_wo > 0:
-            rate = round(completed_wo / total_wo * 100, 1)
+        context_parts.append("## 🚢 선박 현황 (DB 조회)")
+        for v in vessels:
+            context_parts.append(f"- {v.name} ({v.vessel_type}) - 장비 {eq_counts.get(v.id, 0)}개")
+
+    # 초과 작업지시서 (장비/선박명은 조인으로 함께 조회)
+    from datetime import datetime
+    now = datetime.utcnow()
+    overdue = (
+        db.query(WorkOrder, Equipment.name, Vessel.name)
+        .outerjoin(Equipment, Equipment.id == WorkOrder.equipment_id)
+        .outerjoin(Vessel, Vessel.id == WorkOrder.vessel_id)
+        .filter(
+            WorkOrder.status.in_(["Planned", "InProgress"]),
+            WorkOrder.due_date < now,
+        )
+        .limit(10)
+        .all()
+    )
+    if overdue:
+        context_parts.append(f"\n## ⚠️ 초과 작업지시서 ({len(overdue)}건)")
+        for wo, eq_name, vessel_name in overdue:
             context_parts.append(
-                f"\n## 📊 PMS 통계\n"
-                f"- 전체 작업지시서: {total_wo}건 | 완료: {completed_wo}건 | 완료율: {rate}%"
+                f"- [{wo.priority}] {wo.title} | {vessel_name or 'N/A'} | "
+                f"{eq_name or 'N/A'} | 기한: {wo.due_date.strftime('%Y-%m-%d') if wo.due_date else 'N/A'}"
             )
 
+    # PMS 통계
+    total_wo = db.query(WorkOrder).count()
+    completed_wo = db.query(WorkOrder).filter(WorkOrder.status == "Completed").count()
+    if total_wo > 0:
+        rate = round(completed_wo / total_wo * 100, 1)
+        context_parts.append(
+            f"\n## 📊 PMS 통계\n"
+            f"- 전체 작업지시서: {total_wo}건 | 완료: {completed_wo}건 | 완료율: {rate}%"
+        )
+
     return "\n".join(context_parts) if context_parts else ""
 
 
 def get_order_context(db: Session, query: str) -> str:
-    """주문 관련 컨텍스트"""
+    """주문 관련 컨텍스트 (정규화된 질문 기준 캐시)"""
+    return context_cache.get_or_build(
+        "orders", normalize_query(query), ("service_orders",), lambda: _build_order_context(db, query),
+    )
+
+
+def _build_order_context(db: Session, query: str) -> str:
     orders = (
         db.query(ServiceOrder)
         .filter(
@@ -277,42 +304,76 @@ LANGUAGE_NAMES = {
 }
 
 
-def chat_with_ai(message: str, history: list[dict], db: Session, language: str = "ko") -> str:
+API_KEY_ERROR_MESSAGE = "⚠️ API 키가 유효하지 않습니다. .env 파일의 ANTHROPIC_API_KEY를 확인해주세요."
+RATE_LIMIT_MESSAGE = "⚠️ API 호출 한도에 도달했습니다. 잠시 후 다시 시도해주세요.\n\n긴급 문의: yjt@yjturbo.com"
+
+
+def chat_with_ai(
+    message: str, history: list[dict], db: Session, language: str = "ko", user_key: str | None = None,
+) -> str:
     """
     챗봇 메인 함수
     - API 키 있으면: Claude API + RAG (할루시네이션 방지)
     - API 키 없으면: 스마트 폴백
+    - user_key: LLM 게이트웨이 사용자별 호출 제한 키 (사용자 ID 또는 IP)
     """
     if not settings.anthropic_api_key:
         return _smart_fallback(message, db)
 
-    return _claude_rag_response(message, history, db, language)
+    return _claude_rag_response(message, history, db, language, user_key)
 
 
-def _claude_rag_response(message: str, history: list[dict], db: Session, language: str = "ko") -> str:
+def _claude_rag_response(
+    message: str, history: list[dict], db: Session, language: str = "ko", user_key: str | None = None,
+) -> str:
     """Claude API + RAG 기반 응답 (할루시네이션 방지 + 다국어)"""
 
     # 1) DB에서 관련 데이터 수집
     inventory_context = get_inventory_context(db, message)
     order_context = get_order_context(db, message)
     vessel_pms_context = get_vessel_pms_context(db, message)
+    semantic_context = get_semantic_context(db, message)
 
-    # 2) 대화 히스토리 구성 (최근 10개)
-    messages = []
-    for h in history[-10:]:
-        messages.append({"role": h["role"], "content": h["content"]})
-
-    # 3) 응답 언어 지정
-    lang_name = LANGUAGE_NAMES.get(language, "English")
+    messages = _build_rag_messages(
+        message, history, language, inventory_context, order_context, vessel_pms_context, semantic_context,
+    )
 
-    # 4) 사용자 메시지 + DB 데이터 주입
-    data_block = f"""
-[시스템 참고 데이터 - 아래 데이터는 DB에서 실시간 조회한 결과입니다. 이 데이터만 사실로 답변하세요.]
+    try:
+        return gateway.create(
+            model=CHAT_MODEL,
+            max_tokens=2048,
+            system=SYSTEM_PROMPT_BLOCKS,
+            messages=messages,
+            user_key=user_key,
+            cache=True,
+        )
+    except LLMAuthError:
+        return API_KEY_ERROR_MESSAGE
+    except LLMRateLimitedError:
+        return RATE_LIMIT_MESSAGE
+    except LLMGatewayError as e:
+        # 재시도 실패 / 서킷 오픈 / 혼잡 시 폴백으로 전환
+        logger.warning(f"Claude API 사용 불가({e.reason}) → 폴백 전환")
+        return _smart_fallback(message, db)
+    except Exception as e:
+        # 예상치 못한 오류(응답 형식 등)도 폴백으로 전환
+        logger.error(f"Claude API 오류 → 폴백 전환: {type(e).__name__}: {e}")
+        return _smart_fallback(message, db)
 
-{inventory_context}
-{order_context if order_context else ""}
-{vessel_pms_context if vessel_pms_context else ""}
 
+def _build_rag_messages(
+    message: str,
+    history: list[dict],
+    language: str,
+    inventory_context: str,
+    order_context: str,
+    vessel_pms_context: str,
+    semantic_context: str = "",
+) -> list[dict]:
+    """대화 히스토리 + DB 조회 결과를 토큰 예산 안에서 Claude 메시지 목록으로 구성"""
+    # 응답 언어 지정 + 규칙 리마인더 (항상 포함)
+    lang_name = LANGUAGE_NAMES.get(language, "English")
+    reminder = f"""
 [규칙 리마인더]
 - 위 데이터에 있는 수치(재고, 가격)만 정확히 전달하세요.
 - 데이터에 없는 정보는 "시스템에 등록되지 않은 정보"라고 안내하세요.
@@ -322,224 +383,295 @@ def _claude_rag_response(message: str, history: list[dict], db: Session, languag
 - 반드시 {lang_name} 로 답변하세요. 부품명/모델명 등 기술 용어는 영어 원문을 유지하세요.
 """.strip()
 
-    user_content = f"{message}\n\n{data_block}"
-    messages.append({"role": "user", "content": user_content})
+    # 히스토리 최근 턴 우선 + 이전 턴 요약, 컨텍스트 블록은 관련도 순으로 예산 안에서 선택
+    prompt = budget_prompt(
+        message,
+        history,
+        [
+            ("inventory", inventory_context),
+            ("orders", order_context),
+            ("vessel_pms", vessel_pms_context),
+            ("semantic", semantic_context),
+        ],
+        system=SYSTEM_PROMPT,
+        fixed_text=reminder,
+    )
+
+    # 사용자 메시지 + DB 데이터 주입
+    data_block = "\n\n".join([
+        "[시스템 참고 데이터 - 아래 데이터는 DB에서 실시간 조회한 결과입니다. 이 데이터만 사실로 답변하세요.]",
+        *prompt.blocks,
+        *([prompt.history_summary] if prompt.history_summary else []),
+        reminder,
+    ])
 
+    messages = list(prompt.history)
+    messages.append({"role": "user", "content": f"{message}\n\n{data_block}"})
+    return messages
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 스트리밍 챗봇 (SSE용 - 토큰 단위 전달)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def _run_with_session(fn):
+    """스레드에서 독립 세션으로 DB 조회 실행 (fn(db) 호출)"""
+    db = SessionLocal()
+    try:
+        return fn(db)
+    finally:
+        db.close()
+
+
+async def stream_chat_with_ai(
+    message: str, history: list[dict], language: str = "ko", user_key: str | None = None,
+) -> AsyncIterator[str]:
+    """
+    스트리밍 챗봇 - 응답 텍스트 조각을 도착하는 대로 yield
+    - RAG 조회(정확 일치 3종 + 의미 검색)는 각자 세션으로 동시에 실행
+    - LLM 게이트웨이 비동기 스트림 사용 (워커 스레드 점유 없음)
+    """
+    if not settings.anthropic_api_key:
+        yield await asyncio.to_thread(_run_with_session, lambda db: _smart_fallback(message, db))
+        return
+
+    lookups = asyncio.gather(
+        asyncio.to_thread(_run_with_session, lambda db: get_inventory_context(db, message)),
+        asyncio.to_thread(_run_with_session, lambda db: get_order_context(db, message)),
+        asyncio.to_thread(_run_with_session, lambda db: get_vessel_pms_context(db, message)),
+        asyncio.to_thread(_run_with_session, lambda db: get_semantic_context(db, message)),
+    )
+    inventory_context, order_context, vessel_pms_context, semantic_context = await lookups
+    messages = _build_rag_messages(
+        message, history, language, inventory_context, order_context, vessel_pms_context, semantic_context,
+    )
+
+    sent_any = False
     try:
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
+        async for text in gateway.stream(
+            model=CHAT_MODEL,
             max_tokens=2048,
-            system=SYSTEM_PROMPT,
+            system=SYSTEM_PROMPT_BLOCKS,
             messages=messages,
-        )
-        return response.content[0].text
-    except anthropic.AuthenticationError:
-        return "⚠️ API 키가 유효하지 않습니다. .env 파일의 ANTHROPIC_API_KEY를 확인해주세요."
-    except anthropic.RateLimitError:
-        return "⚠️ API 호출 한도에 도달했습니다. 잠시 후 다시 시도해주세요.\n\n긴급 문의: yjt@yjturbo.com"
+            user_key=user_key,
+            cache=True,
+        ):
+            sent_any = True
+            yield text
+    except LLMAuthError:
+        yield API_KEY_ERROR_MESSAGE
+    except LLMRateLimitedError:
+        yield RATE_LIMIT_MESSAGE
+    except LLMGatewayError as e:
+        logger.warning(f"Claude API 스트리밍 사용 불가({e.reason})")
+        if not sent_any:
+            yield await asyncio.to_thread(_run_with_session, lambda db: _smart_fallback(message, db))
     except Exception as e:
-        # API 오류 시 폴백으로 전환
-        logger.error(f"Claude API 오류 → 폴백 전환: {type(e).__name__}: {e}")
-        return _smart_fallback(message, db)
+        logger.error(f"Claude API 스트리밍 오류: {type(e).__name__}: {e}")
+        if not sent_any:
+            yield await asyncio.to_thread(_run_with_session, lambda db: _smart_fallback(message, db))
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 스마트 폴백 (API 없이 동작)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 def _smart_fallback(message: str, db: Session) -> str:
-    """API 키 없이도 동작하는 스마트 응답 시스템"""
+    """API 키 없이도 동작하는 스마트 응답 시스템 - 의도 우선순위 순으로 첫 응답 반환"""
     msg = message.lower().strip()
-    keywords = _extract_keywords(message)
+    intents = classify(msg)
+    for intent in intents.ranked:
+        reply = _FALLBACK_HANDLERS[intent](message, msg, intents, db)
+        if reply:
+            return reply
+    return _fallback_help()
+
+
+# ── 1. 인사/환영 ──
+def _fallback_greeting(message: str, msg: str, intents: Intents, db: Session) -> str | None:
+    if len(msg) >= 20:
+        return None  # 긴 문장 속 인사말은 다음 의도로
+    return (
+        "안녕하세요! 용진터보(YJT) AI 어시스턴트입니다. 🚢\n\n"
+        "아래 질문들을 도와드릴 수 있습니다:\n\n"
+        "📦 **부품/재고 조회**\n"
+        "   예: \"MAN NR29/S 베어링 재고\", \"KBB 부품 목록\"\n\n"
+        "🔧 **오버홀 서비스**\n"
+        "   예: \"오버홀 절차\", \"카트리지 오버홀이란?\"\n\n"
+        "💰 **견적/가격 문의**\n"
+        "   예: \"NR34/S 노즐링 가격\", \"견적 요청\"\n\n"
+        "📞 **연락처/위치**\n"
+        "   예: \"연락처\", \"위치\"\n\n"
+        "🏢 **회사 소개**\n"
+        "   예: \"용진터보 소개\", \"지원 브랜드\"\n\n"
+        "질문을 입력해주세요!"
+    )
 
-    # ── 1. 인사/환영 ──
-    greetings = ["안녕", "hello", "hi", "헬로", "처음", "시작"]
-    if any(g in msg for g in greetings) and len(msg) < 20:
-        return (
-            "안녕하세요! 용진터보(YJT) AI 어시스턴트입니다. 🚢\n\n"
-            "아래 질문들을 도와드릴 수 있습니다:\n\n"
-            "📦 **부품/재고 조회**\n"
-            "   예: \"MAN NR29/S 베어링 재고\", \"KBB 부품 목록\"\n\n"
-            "🔧 **오버홀 서비스**\n"
-            "   예: \"오버홀 절차\", \"카트리지 오버홀이란?\"\n\n"
-            "💰 **견적/가격 문의**\n"
-            "   예: \"NR34/S 노즐링 가격\", \"견적 요청\"\n\n"
-            "📞 **연락처/위치**\n"
-            "   예: \"연락처\", \"위치\"\n\n"
-            "🏢 **회사 소개**\n"
-            "   예: \"용진터보 소개\", \"지원 브랜드\"\n\n"
-            "질문을 입력해주세요!"
-        )
 
-    # ── 2. 부품/재고 조회 ──
-    inventory_kw = ["재고", "stock", "inventory", "부품", "part", "가격", "price", "견적", "quote", "얼마"]
-    brand_kw = ["man", "mhi", "kbb", "abb", "napier"]
-    part_kw = ["nozzle", "노즐", "bearing", "베어링", "blade", "블레이드", "seal", "씰",
-               "gasket", "가스켓", "shaft", "샤프트", "cartridge", "카트리지", "casing", "케이싱",
-               "compressor", "컴프레서", "filter", "필터", "wheel", "휠"]
-    model_match = re.search(r'[A-Za-z]{2,4}[\-]?\d{2,5}[/]?[A-Za-z]?', msg)
-
-    if any(kw in msg for kw in inventory_kw) or any(kw in msg for kw in brand_kw) or \
-       any(kw in msg for kw in part_kw) or model_match:
-
-        context = get_inventory_context(db, message)
-
-        if "검색 결과 없음" not in context:
-            # 가격 관련 질문이면 견적 안내 추가
-            price_note = ""
-            if any(kw in msg for kw in ["가격", "price", "견적", "quote", "얼마", "cost"]):
-                price_note = (
-                    "\n\n💰 **견적 안내**\n"
-                    "위 단가는 참고 가격이며, 실제 견적은 수량·납기·운송 조건에 따라 달라질 수 있습니다.\n"
-                    "정확한 견적: 📧 yjt@yjturbo.com / 📞 +82-51-271-7823"
-                )
-            return f"[재고 DB 조회 결과]\n\n{context}{price_note}"
-        else:
-            return (
-                f"검색하신 '{message}'와 일치하는 부품을 찾지 못했습니다.\n\n"
-                "💡 **검색 팁:**\n"
-                "- 모델명으로 검색: `NR29/S`, `MET42`, `HPR3000`\n"
-                "- 브랜드로 검색: `MAN`, `KBB`, `ABB`\n"
-                "- 부품 종류로 검색: `베어링`, `노즐링`, `가스켓`\n\n"
-                "또는 📧 yjt@yjturbo.com으로 문의해주세요."
-            )
+# ── 2. 부품/재고 조회 ──
+def _fallback_inventory(message: str, msg: str, intents: Intents, db: Session) -> str:
+    context = get_inventory_context(db, message)
 
-    # ── 3. 오버홀 서비스 ──
-    if any(kw in msg for kw in ["오버홀", "overhaul", "정비", "수리", "maintenance"]):
-        if any(kw in msg for kw in ["절차", "과정", "순서", "flow", "process", "어떻게"]):
-            return (
-                "🔧 **터보차저 오버홀 작업 절차**\n\n"
-                "1️⃣ **입고 및 외관 검사** - 터보차저 수령 후 외관 상태 확인\n"
-                "2️⃣ **분해 (Disassembly)** - 완전 분해 및 부품별 분리\n"
-                "3️⃣ **세척 (Cleaning)** - Special Cleaning (G.O.C, G.I.C)\n"
-                "4️⃣ **정밀 검사 및 측정** - 각 부품 치수, 마모도, 크랙 검사\n"
-                "5️⃣ **부품 교체 판정** - 교체 필요 부품 식별 및 고객 협의\n"
-                "6️⃣ **재조립 (Reassembly)** - 신품/수리 부품으로 재조립\n"
-                "7️⃣ **동적 균형 (Dynamic Balancing)** - 로터 밸런싱\n"
-                "8️⃣ **성능 테스트** - 최종 성능 확인\n"
-                "9️⃣ **출하** - 포장 및 배송\n\n"
-                "⏱️ **소요 기간**: 일반적으로 7~14일\n"
-                "✅ **보증**: 1년 보증 제공\n"
-                "🌍 **현장 서비스**: 48시간 내 전세계 엔지니어 파견 가능\n\n"
-                "견적 요청: 📧 yjt@yjturbo.com / 📞 +82-51-271-7823"
+    if "검색 결과 없음" not in context:
+        # 가격 관련 질문이면 견적 안내 추가
+        price_note = ""
+        if "price" in intents:
+            price_note = (
+                "\n\n💰 **견적 안내**\n"
+                "위 단가는 참고 가격이며, 실제 견적은 수량·납기·운송 조건에 따라 달라질 수 있습니다.\n"
+                "정확한 견적: 📧 yjt@yjturbo.com / 📞 +82-51-271-7823"
             )
-        elif any(kw in msg for kw in ["종류", "타입", "type", "카트리지", "cartridge"]):
-            return (
-                "🔧 **오버홀 서비스 종류**\n\n"
-                "**1. Standard Overhaul (표준 오버홀)**\n"
-                "   - 전체 분해, 세척, 검사, 재조립\n"
-                "   - 마모/손상 부품 교체\n"
-                "   - 동적 균형 조정 + 성능 테스트\n\n"
-                "**2. Cartridge Overhaul (카트리지 오버홀)**\n"
-                "   - 카트리지(회전체) 단위 오버홀\n"
-                "   - 현장에서 빠른 교체 가능\n"
-                "   - Exchange Basis 서비스 지원\n\n"
-                "**3. Special Cleaning (특수 세척)**\n"
-                "   - G.O.C (Gas Outlet Casing) 세척\n"
-                "   - G.I.C (Gas Inlet Casing) 세척\n"
-                "   - 성능 저하 방지용 정기 세척\n\n"
-                "지원 브랜드: MAN, MHI, KBB, ABB, Napier\n"
-                "문의: 📧 yjt@yjturbo.com / 📞 +82-51-271-7823"
-            )
-        else:
-            # 관련 주문도 함께 표시
-            order_info = get_order_context(db, message)
-            order_section = f"\n\n{order_info}" if order_info else ""
-            return (
-                "🔧 **오버홀 서비스 안내**\n\n"
-                "용진터보는 전 세계 터보차저 오버홀 전문 기업입니다.\n\n"
-                "**서비스 종류:**\n"
-                "- Standard Overhaul (표준 오버홀)\n"
-                "- Cartridge Overhaul (카트리지 오버홀)\n"
-                "- Special Cleaning (특수 세척)\n"
-                "- Dynamic Balancing (동적 균형 조정)\n\n"
-                "**지원 브랜드:** MAN, MHI, KBB, ABB, Napier\n"
-                "**실적:** 연간 약 1,990건 오버홀 수행\n"
-                "**보증:** 1년 보증 제공\n"
-                "**대응:** 48시간 내 전세계 엔지니어 파견\n\n"
-                "더 자세한 안내를 원하시면:\n"
-                "- \"오버홀 절차\" → 작업 단계별 안내\n"
-                "- \"오버홀 종류\" → 서비스 유형별 안내\n\n"
-                f"견적 요청: 📧 yjt@yjturbo.com / 📞 +82-51-271-7823{order_section}"
-            )
-
-    # ── 4. 회사 정보 ──
-    if any(kw in msg for kw in ["회사", "소개", "about", "company", "용진", "yjt", "yongjin"]):
+        return f"[재고 DB 조회 결과]\n\n{context}{price_note}"
+    else:
         return (
-            "🏢 **용진터보 (YONGJIN TURBO CO., LTD.)** 소개\n\n"
-            "대한민국 부산 소재 **터보차저 전문 기업**입니다.\n\n"
-            "**📊 주요 실적:**\n"
-            "- 연간 약 1,990건 오버홀 수행\n"
-            "- $17,000,000 규모 부품 재고 보유\n"
-            "- 세계 최대 MAN NR Type 부품 재고\n\n"
-            "**🌍 글로벌 네트워크:**\n"
-            "- 31개국+ 서비스 (아시아 15, 유럽 8, 아메리카 5, 오세아니아 2, 아프리카 1)\n"
-            "- 48시간 내 전세계 엔지니어 파견\n"
-            "- 24시간 7일 상담 가능\n\n"
-            "**🔧 지원 브랜드:** MAN, MHI, KBB, ABB, Napier\n\n"
-            "**📍 위치:** 부산시 사하구 신산로 78번지\n"
-            "**📧 이메일:** yjt@yjturbo.com\n"
-            "**📞 전화:** +82-51-271-7823"
+            f"검색하신 '{message}'와 일치하는 부품을 찾지 못했습니다.\n\n"
+            "💡 **검색 팁:**\n"
+            "- 모델명으로 검색: `NR29/S`, `MET42`, `HPR3000`\n"
+            "- 브랜드로 검색: `MAN`, `KBB`, `ABB`\n"
+            "- 부품 종류로 검색: `베어링`, `노즐링`, `가스켓`\n\n"
+            "또는 📧 yjt@yjturbo.com으로 문의해주세요."
         )
 
-    # ── 5. 연락처 ──
-    if any(kw in msg for kw in ["연락", "contact", "문의", "전화", "이메일", "email", "phone", "위치", "주소", "address", "location"]):
+
+# ── 3. 오버홀 서비스 ──
+def _fallback_overhaul(message: str, msg: str, intents: Intents, db: Session) -> str:
+    if "overhaul_process" in intents:
         return (
-            "📞 **용진터보 연락처**\n\n"
-            "📧 **이메일:** yjt@yjturbo.com\n"
-            "📞 **전화:** +82-51-271-7823\n"
-            "📍 **주소:** 부산시 사하구 신산로 78번지 (우: 49434)\n\n"
-            "⏰ **운영:** 24시간 7일 상담 가능\n"
-            "🌍 **글로벌 서비스:** 48시간 내 전세계 엔지니어 파견"
+            "🔧 **터보차저 오버홀 작업 절차**\n\n"
+            "1️⃣ **입고 및 외관 검사** - 터보차저 수령 후 외관 상태 확인\n"
+            "2️⃣ **분해 (Disassembly)** - 완전 분해 및 부품별 분리\n"
+            "3️⃣ **세척 (Cleaning)** - Special Cleaning (G.O.C, G.I.C)\n"
+            "4️⃣ **정밀 검사 및 측정** - 각 부품 치수, 마모도, 크랙 검사\n"
+            "5️⃣ **부품 교체 판정** - 교체 필요 부품 식별 및 고객 협의\n"
+            "6️⃣ **재조립 (Reassembly)** - 신품/수리 부품으로 재조립\n"
+            "7️⃣ **동적 균형 (Dynamic Balancing)** - 로터 밸런싱\n"
+            "8️⃣ **성능 테스트** - 최종 성능 확인\n"
+            "9️⃣ **출하** - 포장 및 배송\n\n"
+            "⏱️ **소요 기간**: 일반적으로 7~14일\n"
+            "✅ **보증**: 1년 보증 제공\n"
+            "🌍 **현장 서비스**: 48시간 내 전세계 엔지니어 파견 가능\n\n"
+            "견적 요청: 📧 yjt@yjturbo.com / 📞 +82-51-271-7823"
         )
-
-    # ── 6. 브랜드 정보 ──
-    if any(kw in msg for kw in ["브랜드", "brand", "지원", "취급"]):
-        # 브랜드별 재고 통계
-        brand_stats = (
-            db.query(Part.brand, func.count(Part.id))
-            .group_by(Part.brand)
-            .all()
+    elif "overhaul_types" in intents:
+        return (
+            "🔧 **오버홀 서비스 종류**\n\n"
+            "**1. Standard Overhaul (표준 오버홀)**\n"
+            "   - 전체 분해, 세척, 검사, 재조립\n"
+            "   - 마모/손상 부품 교체\n"
+            "   - 동적 균형 조정 + 성능 테스트\n\n"
+            "**2. Cartridge Overhaul (카트리지 오버홀)**\n"
+            "   - 카트리지(회전체) 단위 오버홀\n"
+            "   - 현장에서 빠른 교체 가능\n"
+            "   - Exchange Basis 서비스 지원\n\n"
+            "**3. Special Cleaning (특수 세척)**\n"
+            "   - G.O.C (Gas Outlet Casing) 세척\n"
+            "   - G.I.C (Gas Inlet Casing) 세척\n"
+            "   - 성능 저하 방지용 정기 세척\n\n"
+            "지원 브랜드: MAN, MHI, KBB, ABB, Napier\n"
+            "문의: 📧 yjt@yjturbo.com / 📞 +82-51-271-7823"
         )
-        stats_text = "\n".join([f"  - {b}: {c}종" for b, c in brand_stats])
+    else:
+        # 관련 주문도 함께 표시
+        order_info = get_order_context(db, message)
+        order_section = f"\n\n{order_info}" if order_info else ""
         return (
-            "🏭 **지원 터보차저 브랜드**\n\n"
-            "**MAN** (HD Hyundai Marine Engine)\n"
-            "  모델: NR12/R, NR15/R, NR20/R, NR24/R, NR26/R, NR29/S, NR34/S, NA40/S, TCA series\n\n"
-            "**MHI** (Mitsubishi Heavy Industries)\n"
-            "  모델: MET18, MET26, MET33, MET42, MET53, MET66, MET83, MET90\n\n"
-            "**KBB**\n"
-            "  모델: HPR3000, HPR4000, HPR5000, ST18, ST23, ST27\n\n"
-            "**ABB**\n"
-            "  모델: VTR series, A100, A200, TPL series\n\n"
-            "**Napier**\n"
-            "  모델: NA series\n\n"
-            f"📦 **현재 보유 부품:**\n{stats_text}\n\n"
-            "특정 모델의 부품을 조회하시려면 모델명을 입력해주세요.\n"
-            "예: \"NR29/S 부품\", \"MET42 재고\""
+            "🔧 **오버홀 서비스 안내**\n\n"
+            "용진터보는 전 세계 터보차저 오버홀 전문 기업입니다.\n\n"
+            "**서비스 종류:**\n"
+            "- Standard Overhaul (표준 오버홀)\n"
+            "- Cartridge Overhaul (카트리지 오버홀)\n"
+            "- Special Cleaning (특수 세척)\n"
+            "- Dynamic Balancing (동적 균형 조정)\n\n"
+            "**지원 브랜드:** MAN, MHI, KBB, ABB, Napier\n"
+            "**실적:** 연간 약 1,990건 오버홀 수행\n"
+            "**보증:** 1년 보증 제공\n"
+            "**대응:** 48시간 내 전세계 엔지니어 파견\n\n"
+            "더 자세한 안내를 원하시면:\n"
+            "- \"오버홀 절차\" → 작업 단계별 안내\n"
+            "- \"오버홀 종류\" → 서비스 유형별 안내\n\n"
+            f"견적 요청: 📧 yjt@yjturbo.com / 📞 +82-51-271-7823{order_section}"
         )
 
-    # ── 7. 주문/서비스 상태 ──
-    if any(kw in msg for kw in ["주문", "order", "상태", "status", "서비스"]):
-        order_context = get_order_context(db, message)
-        if order_context:
-            return f"[주문 DB 조회 결과]\n\n{order_context}\n\n상세 문의: 📧 yjt@yjturbo.com"
 
-        total = db.query(ServiceOrder).count()
-        pending = db.query(ServiceOrder).filter(ServiceOrder.status == "Pending").count()
-        in_prog = db.query(ServiceOrder).filter(ServiceOrder.status == "In Progress").count()
-        done = db.query(ServiceOrder).filter(ServiceOrder.status == "Completed").count()
-        return (
-            "📋 **서비스 주문 현황**\n\n"
-            f"- 전체: {total}건\n"
-            f"- ⏳ 대기중: {pending}건\n"
-            f"- 🔄 진행중: {in_prog}건\n"
-            f"- ✅ 완료: {done}건\n\n"
-            "특정 주문 조회는 선박명이나 모델명으로 검색해주세요.\n"
-            "예: \"Maersk 주문 상태\", \"NR29/S 서비스\""
-        )
+# ── 4. 회사 정보 ──
+def _fallback_company(message: str, msg: str, intents: Intents, db: Session) -> str:
+    return (
+        "🏢 **용진터보 (YONGJIN TURBO CO., LTD.)** 소개\n\n"
+        "대한민국 부산 소재 **터보차저 전문 기업**입니다.\n\n"
+        "**📊 주요 실적:**\n"
+        "- 연간 약 1,990건 오버홀 수행\n"
+        "- $17,000,000 규모 부품 재고 보유\n"
+        "- 세계 최대 MAN NR Type 부품 재고\n\n"
+        "**🌍 글로벌 네트워크:**\n"
+        "- 31개국+ 서비스 (아시아 15, 유럽 8, 아메리카 5, 오세아니아 2, 아프리카 1)\n"
+        "- 48시간 내 전세계 엔지니어 파견\n"
+        "- 24시간 7일 상담 가능\n\n"
+        "**🔧 지원 브랜드:** MAN, MHI, KBB, ABB, Napier\n\n"
+        "**📍 위치:** 부산시 사하구 신산로 78번지\n"
+        "**📧 이메일:** yjt@yjturbo.com\n"
+        "**📞 전화:** +82-51-271-7823"
+    )
+
+
+# ── 5. 연락처 ──
+def _fallback_contact(message: str, msg: str, intents: Intents, db: Session) -> str:
+    return (
+        "📞 **용진터보 연락처**\n\n"
+        "📧 **이메일:** yjt@yjturbo.com\n"
+        "📞 **전화:** +82-51-271-7823\n"
+        "📍 **주소:** 부산시 사하구 신산로 78번지 (우: 49434)\n\n"
+        "⏰ **운영:** 24시간 7일 상담 가능\n"
+        "🌍 **글로벌 서비스:** 48시간 내 전세계 엔지니어 파견"
+    )
+
 
-    # ── 8. 도움말 / 기본 응답 ──
+# ── 6. 브랜드 정보 ──
+def _fallback_brand_info(message: str, msg: str, intents: Intents, db: Session) -> str:
+    # 브랜드별 부품 수 (부품 변경 시에만 재집계)
+    stats_text = context_cache.get_or_build("brand_part_counts", None, ("parts",), lambda: _build_brand_stats(db))
+    return (
+        "🏭 **지원 터보차저 브랜드**\n\n"
+        "**MAN** (HD Hyundai Marine Engine)\n"
+        "  모델: NR12/R, NR15/R, NR20/R, NR24/R, NR26/R, NR29/S, NR34/S, NA40/S, TCA series\n\n"
+        "**MHI** (Mitsubishi Heavy Industries)\n"
+        "  모델: MET18, MET26, MET33, MET42, MET53, MET66, MET83, MET90\n\n"
+        "**KBB**\n"
+        "  모델: HPR3000, HPR4000, HPR5000, ST18, ST23, ST27\n\n"
+        "**ABB**\n"
+        "  모델: VTR series, A100, A200, TPL series\n\n"
+        "**Napier**\n"
+        "  모델: NA series\n\n"
+        f"📦 **현재 보유 부품:**\n{stats_text}\n\n"
+        "특정 모델의 부품을 조회하시려면 모델명을 입력해주세요.\n"
+        "예: \"NR29/S 부품\", \"MET42 재고\""
+    )
+
+
+# ── 7. 주문/서비스 상태 ──
+def _fallback_order(message: str, msg: str, intents: Intents, db: Session) -> str:
+    order_context = get_order_context(db, message)
+    if order_context:
+        return f"[주문 DB 조회 결과]\n\n{order_context}\n\n상세 문의: 📧 yjt@yjturbo.com"
+
+    # 상태별 건수 (주문 변경 시에만 재집계)
+    counts = context_cache.get_or_build(
+        "order_status_counts", None, ("service_orders",), lambda: _count_orders_by_status(db),
+    )
+    total = sum(counts.values())
+    pending = counts.get("Pending", 0)
+    in_prog = counts.get("In Progress", 0)
+    done = counts.get("Completed", 0)
+    return (
+        "📋 **서비스 주문 현황**\n\n"
+        f"- 전체: {total}건\n"
+        f"- ⏳ 대기중: {pending}건\n"
+        f"- 🔄 진행중: {in_prog}건\n"
+        f"- ✅ 완료: {done}건\n\n"
+        "특정 주문 조회는 선박명이나 모델명으로 검색해주세요.\n"
+        "예: \"Maersk 주문 상태\", \"NR29/S 서비스\""
+    )
+
+
+# ── 8. 도움말 / 기본 응답 ──
+def _fallback_help() -> str:
     return (
         "안녕하세요! 용진터보 AI 어시스턴트입니다. 🚢\n\n"
         "아래 키워드로 질문해주세요:\n\n"
@@ -552,3 +684,24 @@ def _smart_fallback(message: str, db: Session) -> str:
         "📋 **주문 현황**: \"주문 상태\"\n\n"
         "자세한 기술 문의는 📧 yjt@yjturbo.com으로 연락해주세요."
     )
+
+
+def _build_brand_stats(db: Session) -> str:
+    brand_stats = db.query(Part.brand, func.count(Part.id)).group_by(Part.brand).all()
+    return "\n".join([f"  - {b}: {c}종" for b, c in brand_stats])
+
+
+def _count_orders_by_status(db: Session) -> dict[str, int]:
+    return dict(db.query(ServiceOrder.status, func.count(ServiceOrder.id)).group_by(ServiceOrder.status).all())
+
+
+# 의도 → 응답 함수 (None을 반환하면 다음 순위 의도로)
+_FALLBACK_HANDLERS = {
+    "greeting": _fallback_greeting,
+    "inventory": _fallback_inventory,
+    "overhaul": _fallback_overhaul,
+    "company": _fallback_company,
+    "contact": _fallback_contact,
+    "brand_info": _fallback_brand_info,
+    "order": _fallback_order,
+}
@@ -0,0 +1,109 @@
+"""챗봇 대화 세션 - 서버 측 히스토리 저장
+
+- 클라이언트는 conversation_id + 새 메시지만 전송, 이전 턴은 서버가 보관
+- 대화는 소유자 키(user:<id> / ip:<주소>)가 같을 때만 이어짐 (다르면 새 대화 시작)
+- 최근 chat_conversation_max_messages개만 저장, 마지막 메시지 후 chat_conversation_ttl_hours 지나면 만료
+- 만료된 대화는 주기적으로 삭제 (purge_expired_conversations)
+"""
+import json
+import uuid
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.chat_conversation import ChatConversation
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _expired_before() -> datetime:
+    return datetime.utcnow() - timedelta(hours=settings.chat_conversation_ttl_hours)
+
+
+def _get_active(db: Session, conversation_id: str | None, owner_key: str) -> ChatConversation | None:
+    if not conversation_id:
+        return None
+    conv = db.get(ChatConversation, conversation_id)
+    if conv is None or conv.owner_key != owner_key or conv.updated_at < _expired_before():
+        return None
+    return conv
+
+
+def load_history(db: Session, conversation_id: str | None, owner_key: str) -> tuple[str, list[dict]]:
+    """(사용할 대화 ID, 저장된 히스토리) - 없거나 만료/타인 소유면 새 ID와 빈 히스토리"""
+    conv = _get_active(db, conversation_id, owner_key)
+    if conv is None:
+        return str(uuid.uuid4()), []
+    try:
+        history = json.loads(conv.messages or "[]")
+    except ValueError:
+        history = []
+    return conv.id, history
+
+
+def append_turn(
+    db: Session, conversation_id: str, owner_key: str, language: str, user_message: str, reply: str,
+) -> None:
+    """질문/응답 한 쌍 저장 (최근 메시지만 유지)"""
+    conv = _get_active(db, conversation_id, owner_key)
+    if conv is None:
+        # 만료됐거나 처음인 대화 - 같은 ID 행이 남아 있으면 재사용
+        conv = db.get(ChatConversation, conversation_id)
+        if conv is None or conv.owner_key != owner_key:
+            if conv is not None:
+                conversation_id = str(uuid.uuid4())
+            conv = ChatConversation(id=conversation_id, owner_key=owner_key, message_count=0, created_at=datetime.utcnow())
+            db.add(conv)
+        history = []
+    else:
+        try:
+            history = json.loads(conv.messages or "[]")
+        except ValueError:
+            history = []
+
+    history.append({"role": "user", "content": user_message})
+    history.append({"role": "assistant", "content": reply})
+    conv.messages = json.dumps(history[-settings.chat_conversation_max_messages:], ensure_ascii=False)
+    conv.message_count = (conv.message_count or 0) + 2
+    conv.language = language
+    conv.updated_at = datetime.utcnow()
+    db.commit()
+
+
+def load_history_standalone(conversation_id: str | None, owner_key: str) -> tuple[str, list[dict]]:
+    """스레드에서 독립 세션으로 load_history 실행 (스트리밍 엔드포인트용)"""
+    db = SessionLocal()
+    try:
+        return load_history(db, conversation_id, owner_key)
+    finally:
+        db.close()
+
+
+def append_turn_standalone(conversation_id: str, owner_key: str, language: str, user_message: str, reply: str) -> None:
+    db = SessionLocal()
+    try:
+        append_turn(db, conversation_id, owner_key, language, user_message, reply)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"[CHAT] Conversation save failed ({conversation_id}): {e}")
+    finally:
+        db.close()
+
+
+def purge_expired_conversations() -> int:
+    """만료된 대화 삭제 - 삭제 건수 반환"""
+    db = SessionLocal()
+    try:
+        deleted = (
+            db.query(ChatConversation)
+            .filter(ChatConversation.updated_at < _expired_before())
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        if deleted:
+            logger.info(f"[CHAT] Purged {deleted} expired conversations")
+        return deleted
+    finally:
+        db.close()
@@ -0,0 +1,198 @@
+"""대량 발송(캠페인) - 수신자 조건/목록 + 템플릿으로 발송 큐에 일괄 등록
+
+- 제목/본문의 {{name}}, {{company}}, {{email}}은 수신자별 값으로 채움 (템플릿은 한 번만 컴파일)
+  본문에는 HTML 이스케이프한 값, 제목에는 줄바꿈(CR/LF)을 뺀 값 (고객 DB 값이 메일 구조를 바꾸지 못하도록)
+- 발신자 서명/공통 레이아웃은 발신자별로 한 번 조립 (layout_for_signature)
+- 발송은 mail_queue 워커가 유지 중인 SMTP 연결로 email_campaign_rate_per_minute 속도에 맞춰 진행
+- 수신자별 상태는 outbound_emails(campaign_id) 행의 상태 그대로 (queued/sending/sent/dead/cancelled)
+"""
+import re
+import html
+import json
+import uuid
+import logging
+from datetime import datetime
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.customer import Customer
+from app.models.service_order import ServiceOrder
+from app.models.user import User
+from app.models.outbound_email import OutboundEmail, EmailCampaign
+from app.services.email_service import build_namecard_html, layout_for_signature
+from app.services.email_template_service import CompiledTemplate
+from app.services.mail_queue_service import mail_queue, sender_address
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+TEMPLATE_FIELDS = ("name", "company", "email")
+AUDIENCE_SOURCES = ("customers", "vessel_users", "order_customers")
+_INSERT_CHUNK = 1000
+_EMAIL = TypeAdapter(EmailStr)
+_LINE_BREAKS = re.compile(r"[\r\n]+")
+
+
+class CampaignError(ValueError):
+    """요청 내용 오류 (라우터에서 400으로 변환)"""
+
+
+def check_template(subject: str, body: str):
+    for tpl in (CompiledTemplate.compile(subject), CompiledTemplate.compile(body)):
+        unknown = set(tpl.slots) - set(TEMPLATE_FIELDS)
+        if unknown:
+            raise CampaignError(f"Unknown template field(s): {', '.join(sorted(unknown))}. Allowed: {', '.join(TEMPLATE_FIELDS)}")
+
+
+def resolve_audience(db: Session, audience: dict) -> list[dict]:
+    """수신자 조건 → [{email, name, company}]"""
+    source = audience.get("source")
+    if source == "customers":
+        query = db.query(Customer.email, Customer.contact_name, Customer.company_name)
+        if audience.get("country"):
+            query = query.filter(Customer.country == audience["country"])
+    elif source == "order_customers":
+        query = (
+            db.query(Customer.email, Customer.contact_name, Customer.company_name)
+            .join(ServiceOrder, ServiceOrder.customer_id == Customer.id)
+            .distinct()
+        )
+        if audience.get("order_status"):
+            query = query.filter(ServiceOrder.status == audience["order_status"])
+    elif source == "vessel_users":
+        query = db.query(User.email, User.full_name, User.company).filter(User.is_active.is_(True), User.vessel_id.isnot(None))
+        if audience.get("vessel_id"):
+            query = query.filter(User.vessel_id == audience["vessel_id"])
+    else:
+        raise CampaignError(f"Unknown audience source: {source}. Allowed: {', '.join(AUDIENCE_SOURCES)}")
+    return [{"email": email, "name": name or "", "company": company or ""} for email, name, company in query]
+
+
+def _single_line(value: str) -> str:
+    return _LINE_BREAKS.sub(" ", value)
+
+
+def _dedupe(recipients: list[dict]) -> list[dict]:
+    """유효한 주소만 (목록/조건 모두 EmailStr 검증), 대소문자 무시 중복 제거"""
+    seen, out = set(), []
+    for r in recipients:
+        try:
+            email = _EMAIL.validate_python((r.get("email") or "").strip())
+        except ValidationError:
+            continue
+        key = email.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append({"email": email, "name": r.get("name") or "", "company": r.get("company") or ""})
+    return out
+
+
+def create_campaign(
+    db: Session, sender: User, subject: str, body: str,
+    recipients: list[dict] | None = None, audience: dict | None = None,
+) -> EmailCampaign:
+    """캠페인 생성 + 수신자별 메일을 발송 큐에 일괄 등록"""
+    check_template(subject, body)
+    targets = list(recipients or [])
+    if audience:
+        targets += resolve_audience(db, audience)
+    targets = _dedupe(targets)
+    if not targets:
+        raise CampaignError("No recipients")
+    if len(targets) > settings.email_campaign_max_recipients:
+        raise CampaignError(f"Too many recipients ({len(targets)} > {settings.email_campaign_max_recipients})")
+
+    subject_tpl = CompiledTemplate.compile(_single_line(subject))
+    body_tpl = CompiledTemplate.compile(f'<div style="font-size:14px; color:#1e293b; white-space:pre-wrap;">{body}</div>')
+    layout = layout_for_signature(build_namecard_html(sender))
+    from_header = f"{sender.full_name} <{sender_address()}>"
+
+    campaign = EmailCampaign(
+        subject=subject, body=body, total=len(targets), created_by=sender.id,
+        audience=json.dumps(audience or {"source": "list"}, ensure_ascii=False),
+    )
+    db.add(campaign)
+    db.flush()
+    now = datetime.utcnow()
+    try:
+        for i in range(0, len(targets), _INSERT_CHUNK):
+            rows = []
+            for r in targets[i:i + _INSERT_CHUNK]:
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "to_email": r["email"],
+                    "subject": subject_tpl.render(**{k: _single_line(v) for k, v in r.items()}),
+                    "html": layout.render(body=body_tpl.render(**{k: html.escape(v) for k, v in r.items()})),
+                    "from_header": from_header,
+                    "reply_to": sender.email,
+                    "status": "queued",
+                    "attempts": 0,
+                    "campaign_id": campaign.id,
+                    "next_attempt_at": now,
+                    "created_at": now,
+                })
+            db.execute(insert(OutboundEmail), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    mail_queue.wake()
+    logger.info(f"[CAMPAIGN] {campaign.id}: queued {campaign.total} email(s)")
+    return campaign
+
+
+def campaign_summary(db: Session, campaign: EmailCampaign) -> dict:
+    counts = dict(
+        db.query(OutboundEmail.status, func.count())
+        .filter(OutboundEmail.campaign_id == campaign.id)
+        .group_by(OutboundEmail.status)
+        .all()
+    )
+    pending = counts.get("queued", 0) + counts.get("sending", 0)
+    if campaign.cancelled_at and not pending:
+        status = "cancelled"
+    else:
+        status = "sending" if pending else "completed"
+    return {
+        "id": campaign.id,
+        "status": status,
+        "subject": campaign.subject,
+        "audience": json.loads(campaign.audience or "{}"),
+        "total": campaign.total,
+        "counts": counts,  # 발송 완료 후 email_sent_retention_days가 지나면 sent 행은 삭제됨
+        "created_by": campaign.created_by,
+        "created_at": campaign.created_at.isoformat() if campaign.created_at else None,
+        "cancelled_at": campaign.cancelled_at.isoformat() if campaign.cancelled_at else None,
+    }
+
+
+def campaign_recipients(db: Session, campaign_id: str, status: str | None, limit: int, offset: int) -> list[dict]:
+    query = db.query(OutboundEmail).filter(OutboundEmail.campaign_id == campaign_id)
+    if status:
+        query = query.filter(OutboundEmail.status == status)
+    rows = query.order_by(OutboundEmail.to_email).offset(offset).limit(limit).all()
+    return [
+        {
+            "email_id": r.id,
+            "to_email": r.to_email,
+            "status": r.status,
+            "attempts": r.attempts,
+            "last_error": r.last_error,
+            "sent_at": r.sent_at.isoformat() if r.sent_at else None,
+        }
+        for r in rows
+    ]
+
+
+def cancel_campaign(db: Session, campaign: EmailCampaign) -> int:
+    """아직 발송하지 않은 메일 취소 - 취소 건수 반환 (발송 중인 묶음은 그대로 진행)"""
+    cancelled = (
+        db.query(OutboundEmail)
+        .filter(OutboundEmail.campaign_id == campaign.id, OutboundEmail.status == "queued")
+        .update({"status": "cancelled"}, synchronize_session=False)
+    )
+    campaign.cancelled_at = datetime.utcnow()
+    db.commit()
+    return cancelled
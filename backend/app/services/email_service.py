@@ -1,22 +1,37 @@
 """
 이메일 발송 서비스
-- SMTP를 통한 HTML 이메일 발송
-- 네임카드 서명 자동 삽입
+- HTML 이메일 구성 후 발송 큐에 등록 (SMTP 발송은 mail_queue_service 워커)
+- 네임카드 서명 자동 삽입 (네임카드 값별 캐시)
+- 본문/레이아웃은 email_template_service로 언어별 한 번 컴파일 후 재사용
 - 문의 답변 이메일 발송
 """
 import logging
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from functools import lru_cache
+from types import SimpleNamespace
 from app.config import get_settings
 from app.models.user import User
+from app.services.email_template_service import templates, CompiledTemplate
+from app.services.mail_queue_service import mail_queue, sender_address, smtp_configured
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+_NAMECARD_FIELDS = (
+    "full_name", "company", "email", "phone",
+    "namecard_title", "namecard_department", "namecard_mobile", "namecard_fax",
+    "namecard_address", "namecard_website", "namecard_custom_html",
+)
+
+
 def build_namecard_html(user: User) -> str:
-    """사용자 네임카드 정보로 HTML 이메일 서명 생성"""
+    """사용자 네임카드 정보로 HTML 이메일 서명 생성 (같은 네임카드 값이면 캐시된 HTML 재사용)"""
+    return _namecard_html(tuple(getattr(user, f) for f in _NAMECARD_FIELDS))
+
+
+@lru_cache(maxsize=512)
+def _namecard_html(fields: tuple) -> str:
+    user = SimpleNamespace(**dict(zip(_NAMECARD_FIELDS, fields)))
     # 커스텀 HTML이 있으면 우선 사용
     if user.namecard_custom_html and user.namecard_custom_html.strip():
         return user.namecard_custom_html
@@ -76,6 +91,48 @@ def build_namecard_html(user: User) -> str:
     """
 
 
+templates.register("layout", """
+        <html>
+        <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; color: #1e293b; line-height: 1.6; max-width: 600px; margin: 0 auto;">
+            <div style="padding: 20px 0;">
+                {{body}}
+            </div>
+            {{signature}}
+            <div style="margin-top:20px; padding-top:12px; border-top:1px solid #e2e8f0;">
+                <p style="margin:0; color:#94a3b8; font-size:10px;">
+                    Sent via YJT Smart Maintenance Platform | YONGJIN TURBO CO., LTD.
+                </p>
+            </div>
+        </body>
+        </html>
+        """)
+
+
+@lru_cache(maxsize=256)
+def layout_for_signature(signature_html: str) -> CompiledTemplate:
+    """서명까지 채운 공통 레이아웃 - {{body}}만 남음 (같은 발신자의 메일은 재사용)"""
+    return templates.get("layout").partial(signature=signature_html)
+
+
+def compose_email(
+    to_email: str,
+    subject: str,
+    body_html: str,
+    sender_user: User | None = None,
+    reply_to: str | None = None,
+) -> dict:
+    """큐에 넣을 메일 필드 구성 (네임카드 서명 + 공통 레이아웃 + 보내는 사람)"""
+    signature_html = build_namecard_html(sender_user) if sender_user else ""
+    from_display = f"{sender_user.full_name if sender_user else settings.smtp_from_name} <{sender_address()}>"
+    return {
+        "to_email": to_email,
+        "subject": subject,
+        "html": layout_for_signature(signature_html).render(body=body_html),
+        "from_header": from_display,
+        "reply_to": reply_to or (sender_user.email if sender_user else None),
+    }
+
+
 def send_email(
     to_email: str,
     subject: str,
@@ -84,68 +141,82 @@ def send_email(
     reply_to: str | None = None,
 ) -> dict:
     """
-    HTML 이메일 발송
+    HTML 이메일 발송 요청 - 발송 큐에 넣고 바로 반환 (실제 발송은 mail_queue 워커)
     - sender_user가 있으면 네임카드 서명 자동 삽입
     - SMTP 설정이 없으면 로그만 남기고 성공 반환 (개발 환경)
     """
-    if not settings.smtp_user or not settings.smtp_password:
+    if not smtp_configured():
         logger.warning(f"[EMAIL-DEV] SMTP 미설정. To: {to_email}, Subject: {subject}")
         logger.info(f"[EMAIL-DEV] Body preview: {body_html[:200]}...")
         return {"success": True, "message": "Email logged (SMTP not configured)"}
 
     try:
-        # 네임카드 서명 삽입
-        signature_html = ""
-        if sender_user:
-            signature_html = build_namecard_html(sender_user)
-
-        # 전체 HTML 이메일 구성
-        full_html = f"""
-        <html>
-        <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; color: #1e293b; line-height: 1.6; max-width: 600px; margin: 0 auto;">
-            <div style="padding: 20px 0;">
-                {body_html}
-            </div>
-            {signature_html}
-            <div style="margin-top:20px; padding-top:12px; border-top:1px solid #e2e8f0;">
-                <p style="margin:0; color:#94a3b8; font-size:10px;">
-                    Sent via YJT Smart Maintenance Platform | YONGJIN TURBO CO., LTD.
-                </p>
-            </div>
-        </body>
-        </html>
-        """
-
-        # MIME 메시지 생성
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        from_display = f"{sender_user.full_name} <{settings.smtp_user}>" if sender_user else f"{settings.smtp_from_name} <{settings.smtp_user}>"
-        msg["From"] = from_display
-        msg["To"] = to_email
-        if reply_to:
-            msg["Reply-To"] = reply_to
-        elif sender_user:
-            msg["Reply-To"] = sender_user.email
-
-        msg.attach(MIMEText(full_html, "html", "utf-8"))
-
-        # SMTP 발송
-        with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-            server.starttls()
-            server.login(settings.smtp_user, settings.smtp_password)
-            server.send_message(msg)
-
-        logger.info(f"[EMAIL] Sent to {to_email}: {subject}")
-        return {"success": True, "message": f"Email sent to {to_email}"}
-
-    except smtplib.SMTPAuthenticationError:
-        logger.error("[EMAIL] SMTP authentication failed - check smtp_user/smtp_password")
-        return {"success": False, "message": "SMTP authentication failed. Check email credentials."}
+        message = compose_email(to_email, subject, body_html, sender_user=sender_user, reply_to=reply_to)
+        [email_id] = mail_queue.enqueue([message])
+        logger.info(f"[EMAIL] Queued for {to_email}: {subject}")
+        return {"success": True, "message": f"Email queued for {to_email}", "email_id": email_id}
     except Exception as e:
-        logger.error(f"[EMAIL] Failed to send: {e}")
+        logger.error(f"[EMAIL] Failed to queue: {e}")
         return {"success": False, "message": str(e)}
 
 
+# ── 언어별 라벨 / 템플릿 (모듈 로드 시 등록, 언어별로 처음 쓸 때 한 번 컴파일) ──
+
+_INQUIRY_LABELS = {
+    "ko": {"greeting": "안녕하세요", "original": "원본 문의", "response": "답변", "footer": "추가 문의사항이 있으시면 언제든 연락해 주세요."},
+    "en": {"greeting": "Hello", "original": "Original Inquiry", "response": "Response", "footer": "If you have any further questions, please don't hesitate to contact us."},
+    "zh": {"greeting": "您好", "original": "原始咨询", "response": "回复", "footer": "如有任何其他问题，请随时与我们联系。"},
+    "ja": {"greeting": "お世話になっております", "original": "お問い合わせ内容", "response": "回答", "footer": "ご不明な点がございましたら、お気軽にお問い合わせください。"},
+    "ar": {"greeting": "مرحبًا", "original": "الاستفسار الأصلي", "response": "الرد", "footer": "إذا كان لديك أي أسئلة إضافية، لا تتردد في الاتصال بنا."},
+    "es": {"greeting": "Hola", "original": "Consulta original", "response": "Respuesta", "footer": "Si tiene alguna pregunta adicional, no dude en contactarnos."},
+    "hi": {"greeting": "नमस्ते", "original": "मूल पूछताछ", "response": "उत्तर", "footer": "यदि आपके कोई और प्रश्न हैं, तो कृपया संपर्क करने में संकोच न करें।"},
+    "fr": {"greeting": "Bonjour", "original": "Demande originale", "response": "Réponse", "footer": "Si vous avez d'autres questions, n'hésitez pas à nous contacter."},
+}
+
+
+templates.register("inquiry_response", """
+    <p style="margin:0 0 16px; font-size:14px;">[[greeting]],</p>
+
+    <div style="background:#eff6ff; border-left:4px solid #2563eb; padding:12px 16px; border-radius:0 8px 8px 0; margin-bottom:16px;">
+        <p style="margin:0 0 4px; font-size:11px; color:#2563eb; font-weight:600; text-transform:uppercase;">[[response]]</p>
+        <p style="margin:0; font-size:14px; color:#1e293b; white-space:pre-wrap;">{{response_text}}</p>
+    </div>
+
+    <div style="background:#f8fafc; padding:12px 16px; border-radius:8px; margin-bottom:16px;">
+        <p style="margin:0 0 4px; font-size:11px; color:#94a3b8; font-weight:600; text-transform:uppercase;">[[original]]: {{subject}}</p>
+        <p style="margin:0; font-size:13px; color:#64748b; white-space:pre-wrap;">{{original_message}}</p>
+    </div>
+
+    <p style="margin:0; font-size:13px; color:#64748b;">[[footer]]</p>
+    """, _INQUIRY_LABELS)
+
+
+_RESET_LABELS = {
+    "ko": {"subject": "비밀번호 재설정 인증 코드", "greeting": "안녕하세요,", "message": "비밀번호 재설정을 위한 인증 코드입니다.", "code_label": "인증 코드", "expiry": "이 코드는 10분 후에 만료됩니다.", "ignore": "비밀번호 재설정을 요청하지 않으셨다면 이 이메일을 무시하세요."},
+    "en": {"subject": "Password Reset Verification Code", "greeting": "Hello,", "message": "Here is your verification code to reset your password.", "code_label": "Verification Code", "expiry": "This code will expire in 10 minutes.", "ignore": "If you did not request a password reset, please ignore this email."},
+    "zh": {"subject": "密码重置验证码", "greeting": "您好，", "message": "以下是您重置密码的验证码。", "code_label": "验证码", "expiry": "此验证码将在10分钟后过期。", "ignore": "如果您没有请求重置密码，请忽略此邮件。"},
+    "ja": {"subject": "パスワードリセット認証コード", "greeting": "こんにちは、", "message": "パスワードリセットの認証コードです。", "code_label": "認証コード", "expiry": "このコードは10分後に期限切れになります。", "ignore": "パスワードリセットを要求していない場合は、このメールを無視してください。"},
+    "ar": {"subject": "رمز التحقق لإعادة تعيين كلمة المرور", "greeting": "مرحبًا،", "message": "إليك رمز التحقق لإعادة تعيين كلمة المرور.", "code_label": "رمز التحقق", "expiry": "سينتهي هذا الرمز خلال 10 دقائق.", "ignore": "إذا لم تطلب إعادة تعيين كلمة المرور، يرجى تجاهل هذا البريد."},
+    "es": {"subject": "Código de verificación para restablecer contraseña", "greeting": "Hola,", "message": "Aquí está su código de verificación para restablecer su contraseña.", "code_label": "Código de verificación", "expiry": "Este código expirará en 10 minutos.", "ignore": "Si no solicitó restablecer su contraseña, ignore este correo."},
+    "hi": {"subject": "पासवर्ड रीसेट सत्यापन कोड", "greeting": "नमस्ते,", "message": "पासवर्ड रीसेट के लिए आपका सत्यापन कोड यहाँ है।", "code_label": "सत्यापन कोड", "expiry": "यह कोड 10 मिनट में समाप्त हो जाएगा।", "ignore": "यदि आपने पासवर्ड रीसेट का अनुरोध नहीं किया है, तो कृपया इस ईमेल को अनदेखा करें।"},
+    "fr": {"subject": "Code de vérification pour la réinitialisation du mot de passe", "greeting": "Bonjour,", "message": "Voici votre code de vérification pour réinitialiser votre mot de passe.", "code_label": "Code de vérification", "expiry": "Ce code expirera dans 10 minutes.", "ignore": "Si vous n'avez pas demandé la réinitialisation de votre mot de passe, veuillez ignorer cet e-mail."},
+}
+
+
+templates.register("password_reset", """
+    <p style="margin:0 0 16px; font-size:14px;">[[greeting]]</p>
+    <p style="margin:0 0 20px; font-size:14px; color:#475569;">[[message]]</p>
+
+    <div style="background:#eff6ff; border:2px solid #2563eb; border-radius:12px; padding:24px; text-align:center; margin-bottom:20px;">
+        <p style="margin:0 0 8px; font-size:12px; color:#2563eb; font-weight:600; text-transform:uppercase; letter-spacing:1px;">[[code_label]]</p>
+        <p style="margin:0; font-size:36px; font-weight:700; color:#1e40af; letter-spacing:8px; font-family:monospace;">{{code}}</p>
+    </div>
+
+    <p style="margin:0 0 8px; font-size:13px; color:#64748b;">⏰ [[expiry]]</p>
+    <p style="margin:0; font-size:12px; color:#94a3b8;">[[ignore]]</p>
+    """, _RESET_LABELS)
+
+
 def send_inquiry_response_email(
     to_email: str,
     subject: str,
@@ -155,34 +226,10 @@ def send_inquiry_response_email(
     language: str = "en",
 ) -> dict:
     """문의 답변 이메일 발송 (원본 메시지 포함)"""
-    # 언어별 레이블
-    labels = {
-        "ko": {"greeting": "안녕하세요", "original": "원본 문의", "response": "답변", "footer": "추가 문의사항이 있으시면 언제든 연락해 주세요."},
-        "en": {"greeting": "Hello", "original": "Original Inquiry", "response": "Response", "footer": "If you have any further questions, please don't hesitate to contact us."},
-        "zh": {"greeting": "您好", "original": "原始咨询", "response": "回复", "footer": "如有任何其他问题，请随时与我们联系。"},
-        "ja": {"greeting": "お世話になっております", "original": "お問い合わせ内容", "response": "回答", "footer": "ご不明な点がございましたら、お気軽にお問い合わせください。"},
-        "ar": {"greeting": "مرحبًا", "original": "الاستفسار الأصلي", "response": "الرد", "footer": "إذا كان لديك أي أسئلة إضافية، لا تتردد في الاتصال بنا."},
-        "es": {"greeting": "Hola", "original": "Consulta original", "response": "Respuesta", "footer": "Si tiene alguna pregunta adicional, no dude en contactarnos."},
-        "hi": {"greeting": "नमस्ते", "original": "मूल पूछताछ", "response": "उत्तर", "footer": "यदि आपके कोई और प्रश्न हैं, तो कृपया संपर्क करने में संकोच न करें।"},
-        "fr": {"greeting": "Bonjour", "original": "Demande originale", "response": "Réponse", "footer": "Si vous avez d'autres questions, n'hésitez pas à nous contacter."},
-    }
-    l = labels.get(language, labels["en"])
-
-    body_html = f"""
-    <p style="margin:0 0 16px; font-size:14px;">{l['greeting']},</p>
-
-    <div style="background:#eff6ff; border-left:4px solid #2563eb; padding:12px 16px; border-radius:0 8px 8px 0; margin-bottom:16px;">
-        <p style="margin:0 0 4px; font-size:11px; color:#2563eb; font-weight:600; text-transform:uppercase;">{l['response']}</p>
-        <p style="margin:0; font-size:14px; color:#1e293b; white-space:pre-wrap;">{response_text}</p>
-    </div>
-
-    <div style="background:#f8fafc; padding:12px 16px; border-radius:8px; margin-bottom:16px;">
-        <p style="margin:0 0 4px; font-size:11px; color:#94a3b8; font-weight:600; text-transform:uppercase;">{l['original']}: {subject}</p>
-        <p style="margin:0; font-size:13px; color:#64748b; white-space:pre-wrap;">{original_message}</p>
-    </div>
-
-    <p style="margin:0; font-size:13px; color:#64748b;">{l['footer']}</p>
-    """
+    body_html = templates.render(
+        "inquiry_response", language,
+        subject=subject, response_text=response_text, original_message=original_message,
+    )
 
     return send_email(
         to_email=to_email,
@@ -194,30 +241,8 @@ def send_inquiry_response_email(
 
 def send_password_reset_email(to_email: str, code: str, language: str = "en") -> dict:
     """비밀번호 리셋 인증 코드 이메일 발송"""
-    labels = {
-        "ko": {"subject": "비밀번호 재설정 인증 코드", "greeting": "안녕하세요,", "message": "비밀번호 재설정을 위한 인증 코드입니다.", "code_label": "인증 코드", "expiry": "이 코드는 10분 후에 만료됩니다.", "ignore": "비밀번호 재설정을 요청하지 않으셨다면 이 이메일을 무시하세요."},
-        "en": {"subject": "Password Reset Verification Code", "greeting": "Hello,", "message": "Here is your verification code to reset your password.", "code_label": "Verification Code", "expiry": "This code will expire in 10 minutes.", "ignore": "If you did not request a password reset, please ignore this email."},
-        "zh": {"subject": "密码重置验证码", "greeting": "您好，", "message": "以下是您重置密码的验证码。", "code_label": "验证码", "expiry": "此验证码将在10分钟后过期。", "ignore": "如果您没有请求重置密码，请忽略此邮件。"},
-        "ja": {"subject": "パスワードリセット認証コード", "greeting": "こんにちは、", "message": "パスワードリセットの認証コードです。", "code_label": "認証コード", "expiry": "このコードは10分後に期限切れになります。", "ignore": "パスワードリセットを要求していない場合は、このメールを無視してください。"},
-        "ar": {"subject": "رمز التحقق لإعادة تعيين كلمة المرور", "greeting": "مرحبًا،", "message": "إليك رمز التحقق لإعادة تعيين كلمة المرور.", "code_label": "رمز التحقق", "expiry": "سينتهي هذا الرمز خلال 10 دقائق.", "ignore": "إذا لم تطلب إعادة تعيين كلمة المرور، يرجى تجاهل هذا البريد."},
-        "es": {"subject": "Código de verificación para restablecer contraseña", "greeting": "Hola,", "message": "Aquí está su código de verificación para restablecer su contraseña.", "code_label": "Código de verificación", "expiry": "Este código expirará en 10 minutos.", "ignore": "Si no solicitó restablecer su contraseña, ignore este correo."},
-        "hi": {"subject": "पासवर्ड रीसेट सत्यापन कोड", "greeting": "नमस्ते,", "message": "पासवर्ड रीसेट के लिए आपका सत्यापन कोड यहाँ है।", "code_label": "सत्यापन कोड", "expiry": "यह कोड 10 मिनट में समाप्त हो जाएगा।", "ignore": "यदि आपने पासवर्ड रीसेट का अनुरोध नहीं किया है, तो कृपया इस ईमेल को अनदेखा करें।"},
-        "fr": {"subject": "Code de vérification pour la réinitialisation du mot de passe", "greeting": "Bonjour,", "message": "Voici votre code de vérification pour réinitialiser votre mot de passe.", "code_label": "Code de vérification", "expiry": "Ce code expirera dans 10 minutes.", "ignore": "Si vous n'avez pas demandé la réinitialisation de votre mot de passe, veuillez ignorer cet e-mail."},
-    }
-    l = labels.get(language, labels["en"])
-
-    body_html = f"""
-    <p style="margin:0 0 16px; font-size:14px;">{l['greeting']}</p>
-    <p style="margin:0 0 20px; font-size:14px; color:#475569;">{l['message']}</p>
-
-    <div style="background:#eff6ff; border:2px solid #2563eb; border-radius:12px; padding:24px; text-align:center; margin-bottom:20px;">
-        <p style="margin:0 0 8px; font-size:12px; color:#2563eb; font-weight:600; text-transform:uppercase; letter-spacing:1px;">{l['code_label']}</p>
-        <p style="margin:0; font-size:36px; font-weight:700; color:#1e40af; letter-spacing:8px; font-family:monospace;">{code}</p>
-    </div>
-
-    <p style="margin:0 0 8px; font-size:13px; color:#64748b;">⏰ {l['expiry']}</p>
-    <p style="margin:0; font-size:12px; color:#94a3b8;">{l['ignore']}</p>
-    """
+    body_html = templates.render("password_reset", language, code=code)
+    l = templates.labels("password_reset", language)
 
     return send_email(
         to_email=to_email,
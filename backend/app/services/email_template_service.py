@@ -0,0 +1,91 @@
+"""이메일 템플릿 - 언어별로 한 번 컴파일해 두고 렌더링은 문자열 join 한 번
+
+- 템플릿 원본: [[라벨]]은 컴파일 시 언어별 번역으로 치환, {{슬롯}}은 렌더링 시 값으로 채움
+- 컴파일 결과(정적 조각 + 슬롯 이름 목록)는 (템플릿, 언어)별로 캐시
+- partial()로 일부 슬롯(발신자 서명 등)을 미리 채운 템플릿을 만들어 대량 발송 시 재사용
+- 값은 HTML 이스케이프 없이 그대로 삽입 (기존 f-string 조립과 동일한 출력)
+"""
+import re
+import threading
+
+_SLOT = re.compile(r"\{\{(\w+)\}\}")
+_LABEL = re.compile(r"\[\[(\w+)\]\]")
+
+
+class CompiledTemplate:
+    """정적 조각 사이에 슬롯이 들어가는 컴파일된 템플릿 (static[0] slot[0] static[1] ... static[n])"""
+    __slots__ = ("_static", "_slots", "_pairs")
+
+    def __init__(self, static: list[str], slots: list[str]):
+        self._static = static
+        self._slots = slots
+        self._pairs = tuple(zip(slots, static[1:]))
+
+    @classmethod
+    def compile(cls, source: str) -> "CompiledTemplate":
+        pieces = _SLOT.split(source)
+        return cls(pieces[0::2], pieces[1::2])
+
+    @property
+    def slots(self) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(self._slots))
+
+    def render(self, **values) -> str:
+        out = [self._static[0]]
+        for slot, tail in self._pairs:
+            value = values[slot]
+            out.append(value if value.__class__ is str else str(value))
+            out.append(tail)
+        return "".join(out)
+
+    def partial(self, **values) -> "CompiledTemplate":
+        """주어진 슬롯을 채워 정적 조각에 합친 새 템플릿"""
+        static, slots = [self._static[0]], []
+        for slot, tail in zip(self._slots, self._static[1:]):
+            if slot in values:
+                static[-1] += str(values[slot]) + tail
+            else:
+                slots.append(slot)
+                static.append(tail)
+        return CompiledTemplate(static, slots)
+
+
+class TemplateRegistry:
+    """이름 → 원본/언어별 라벨, (이름, 언어) → 컴파일된 템플릿 캐시"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sources: dict[str, tuple[str, dict[str, dict[str, str]] | None]] = {}
+        self._compiled: dict[tuple[str, str], CompiledTemplate] = {}
+
+    def register(self, name: str, source: str, labels: dict[str, dict[str, str]] | None = None):
+        with self._lock:
+            self._sources[name] = (source, labels)
+            for key in [k for k in self._compiled if k[0] == name]:
+                del self._compiled[key]
+
+    def resolve_language(self, name: str, language: str) -> str:
+        """라벨이 없는 언어는 en으로 (캐시 키가 임의 입력으로 늘어나지 않도록)"""
+        labels = self._sources[name][1]
+        return language if not labels or language in labels else "en"
+
+    def labels(self, name: str, language: str) -> dict[str, str]:
+        labels = self._sources[name][1] or {}
+        return labels.get(self.resolve_language(name, language), {})
+
+    def get(self, name: str, language: str = "en") -> CompiledTemplate:
+        key = (name, self.resolve_language(name, language))
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            source, _ = self._sources[name]
+            l = self.labels(name, key[1])
+            compiled = CompiledTemplate.compile(_LABEL.sub(lambda m: l[m.group(1)], source))
+            with self._lock:
+                self._compiled[key] = compiled
+        return compiled
+
+    def render(self, name: str, language: str = "en", **values) -> str:
+        return self.get(name, language).render(**values)
+
+
+templates = TemplateRegistry()
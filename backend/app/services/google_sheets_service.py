@@ -1,7 +1,29 @@
-"""Google Sheets 동기화 서비스 - DB 데이터를 Google Sheets로 내보내기"""
+"""Google Sheets 동기화 서비스 - DB 데이터를 Google Sheets로 내보내기 (증분)
+
+- 시트별로 행 키(엔티티 ID) → 시트 행 번호 / 내용 해시를 sheet_row_index 테이블에 보관
+- 동기화 시 해시가 바뀐 행 / 새 행 / 삭제된 행만 values_batch_update 범위로 전송
+- 삭제로 생긴 빈 행은 마지막 행들을 옮겨 채워 데이터 영역을 연속으로 유지
+- 인덱스가 없거나 full=True면 시트를 비우고 전체를 다시 씀 (시트를 수동 편집/정렬한 경우)
+- 인덱스 해시 방식(ROW_HASH_VERSION)이 바뀐 뒤 첫 동기화도 전체 재작성 (예전 해시는 새 해시와 비교 불가)
+- 행 수 제한 없음 (필요하면 시트 행을 늘림), 스프레드시트 객체만 있으면 되므로 가짜 클라이언트로 검증 가능
+- 클라이언트/스프레드시트/워크시트 핸들은 프로세스 내에서 재사용, 헤더는 바뀐 경우에만 다시 씀
+- 여러 시트는 스레드 풀에서 동시에 반영, API 호출은 공용 토큰 버킷(분당 할당량)을 거치고 429/5xx는 백오프 후 재시도
+"""
+import os
+import json
+import time
+import random
+import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
+from typing import Callable, Iterable
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.sheet_sync import SheetRowIndex, SheetSyncState
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -14,143 +36,552 @@ except ImportError:
     GSPREAD_AVAILABLE = False
 
 
+_SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+
+
+class _ClientPool:
+    """프로세스 단위 gspread 클라이언트 / 스프레드시트 / 워크시트 캐시
+
+    - 클라이언트: 자격 증명 파일별로 한 번만 인증 (파일이 바뀌면 다시 인증).
+      AuthorizedSession이 만료된 액세스 토큰을 알아서 갱신하므로 동기화마다 새로 인증할 필요 없음
+    - 스프레드시트: open_by_key 메타데이터 조회를 한 번만
+    - 워크시트: 핸들 + 마지막으로 쓴 헤더 서명 - 헤더가 같으면 헤더 쓰기 생략
+    - API 오류가 난 워크시트는 캐시에서 빼서 다음 호출 때 다시 조회 (시트 삭제/행 수 변경 대비)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: dict[str, tuple[float, object]] = {}      # 파일 경로 → (수정 시각, 클라이언트)
+        self._spreadsheets: dict[tuple[str, str], object] = {}   # (파일 경로, 스프레드시트 ID) → 핸들
+        self._worksheets: dict[tuple[str, str], tuple[object, str]] = {}  # (스프레드시트 ID, 제목) → (핸들, 헤더 서명)
+
+    def client(self, credentials_file: str):
+        if not GSPREAD_AVAILABLE:
+            raise RuntimeError("gspread 라이브러리가 설치되지 않았습니다. pip install gspread google-auth")
+        mtime = os.path.getmtime(credentials_file)
+        with self._lock:
+            cached = self._clients.get(credentials_file)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        creds = Credentials.from_service_account_file(credentials_file, scopes=_SCOPES)
+        client = gspread.authorize(creds)
+        with self._lock:
+            self._clients[credentials_file] = (mtime, client)
+            # 자격 증명이 바뀌었으면 이전 클라이언트로 연 핸들도 버림
+            for key in [k for k in self._spreadsheets if k[0] == credentials_file]:
+                del self._spreadsheets[key]
+        return client
+
+    def spreadsheet(self, credentials_file: str, spreadsheet_id: str):
+        client = self.client(credentials_file)
+        key = (credentials_file, spreadsheet_id)
+        with self._lock:
+            cached = self._spreadsheets.get(key)
+        if cached is not None:
+            return cached
+        spreadsheet = _call(client.open_by_key, spreadsheet_id)
+        with self._lock:
+            self._spreadsheets[key] = spreadsheet
+        return spreadsheet
+
+    def worksheet(self, spreadsheet, title: str, headers: list[str], force_headers: bool = False):
+        key = (_spreadsheet_key(spreadsheet), title)
+        signature = hashlib.md5(json.dumps(headers).encode()).hexdigest()
+        with self._lock:
+            cached = self._worksheets.get(key)
+        if cached is None:
+            try:
+                ws = _call(spreadsheet.worksheet, title)
+            except gspread.exceptions.WorksheetNotFound:
+                ws = _call(spreadsheet.add_worksheet, title=title, rows=1000, cols=len(headers))
+            cached_signature = None
+        else:
+            ws, cached_signature = cached
+        if force_headers or cached_signature != signature:
+            _call(ws.update, range_name="A1", values=[headers])
+        with self._lock:
+            self._worksheets[key] = (ws, signature)
+        return ws
+
+    def invalidate_worksheet(self, spreadsheet, title: str):
+        with self._lock:
+            self._worksheets.pop((_spreadsheet_key(spreadsheet), title), None)
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+            self._spreadsheets.clear()
+            self._worksheets.clear()
+
+
+def _spreadsheet_key(spreadsheet) -> str:
+    return getattr(spreadsheet, "id", None) or str(id(spreadsheet))
+
+
+_pool = _ClientPool()
+
+
 def _get_client(credentials_file: str):
-    """Google Sheets API 클라이언트 생성"""
-    if not GSPREAD_AVAILABLE:
-        raise RuntimeError("gspread 라이브러리가 설치되지 않았습니다. pip install gspread google-auth")
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = Credentials.from_service_account_file(credentials_file, scopes=scopes)
-    return gspread.authorize(creds)
-
-
-def _ensure_worksheet(spreadsheet, title: str, headers: list[str]):
-    """워크시트가 없으면 생성, 있으면 가져오기"""
-    try:
-        ws = spreadsheet.worksheet(title)
-    except gspread.exceptions.WorksheetNotFound:
-        ws = spreadsheet.add_worksheet(title=title, rows=1000, cols=len(headers))
-    # 헤더 설정
-    ws.update(range_name="A1", values=[headers])
-    return ws
+    """Google Sheets API 클라이언트 (프로세스 내 재사용)"""
+    return _pool.client(credentials_file)
+
+
+def _open_spreadsheet(credentials_file: str, spreadsheet_id: str):
+    """스프레드시트 핸들 (프로세스 내 재사용)"""
+    return _pool.spreadsheet(credentials_file, spreadsheet_id)
+
+
+def _ensure_worksheet(spreadsheet, title: str, headers: list[str], force_headers: bool = False):
+    """워크시트가 없으면 생성, 있으면 가져오기 - 캐시된 헤더와 같으면 헤더 쓰기 생략"""
+    return _pool.worksheet(spreadsheet, title, headers, force_headers=force_headers)
+
+
+# ── 시트 정의: 제목 / 헤더 / (행 키, 값) 생성기 ──
 
+@dataclass
+class SheetSpec:
+    title: str
+    headers: list[str]  # 마지막 열은 행 키(ID)
+    rows: Callable[[Session], Iterable[tuple[str, list]]]
 
-def sync_parts_to_sheet(db: Session, spreadsheet):
-    """Parts + Inventory 데이터를 시트에 동기화"""
+
+_YIELD_PER = 1000  # 행 생성기가 DB에서 한 번에 가져오는 행 수
+
+
+def _stream(db: Session, stmt):
+    """컬럼 튜플을 yield_per 단위로 스트리밍 (ORM 객체/식별 맵 없이 일정 메모리)"""
+    return db.execute(stmt.execution_options(yield_per=_YIELD_PER))
+
+
+def _date(value) -> str:
+    return value.strftime("%Y-%m-%d") if value else ""
+
+
+def _part_rows(db: Session):
+    """Parts + Inventory (LEFT JOIN 1회)"""
     from app.models.part import Part
     from app.models.inventory import Inventory
 
-    headers = ["Part Number", "Name", "Brand", "Turbo Model", "Category", "Unit Price (USD)", "Quantity", "Min Qty", "Warehouse", "Low Stock"]
-    ws = _ensure_worksheet(spreadsheet, "Parts & Inventory", headers)
-
-    parts = db.query(Part).all()
-    rows = []
-    for p in parts:
-        inv = db.query(Inventory).filter(Inventory.part_id == p.id).first()
-        qty = inv.quantity if inv else 0
-        min_qty = inv.min_quantity if inv else 0
-        warehouse = inv.warehouse if inv else ""
-        low = "YES" if inv and inv.quantity <= inv.min_quantity else "NO"
-        rows.append([
-            p.part_number, p.name, p.brand, p.turbo_model, p.category,
-            p.unit_price, qty, min_qty, warehouse, low,
-        ])
-
-    # 기존 데이터 지우고 새로 쓰기 (헤더 제외)
-    ws.batch_clear(["A2:Z10000"])
-    if rows:
-        ws.update(range_name=f"A2:J{len(rows)+1}", values=rows)
-    return len(rows)
-
-
-def sync_orders_to_sheet(db: Session, spreadsheet):
-    """Service Orders 데이터를 시트에 동기화"""
+    stmt = select(
+        Part.id, Part.part_number, Part.name, Part.brand, Part.turbo_model, Part.category, Part.unit_price,
+        Inventory.id, Inventory.quantity, Inventory.min_quantity, Inventory.warehouse,
+    ).outerjoin(Inventory, Inventory.part_id == Part.id)
+    for part_id, number, name, brand, model, category, price, inv_id, qty, min_qty, warehouse in _stream(db, stmt):
+        has_inv = inv_id is not None
+        yield part_id, [
+            number, name, brand, model, category, price,
+            qty if has_inv else 0, min_qty if has_inv else 0, warehouse if has_inv else "",
+            "YES" if has_inv and qty <= min_qty else "NO", part_id,
+        ]
+
+
+def _order_rows(db: Session):
+    """Service Orders + Customer (LEFT JOIN 1회)"""
     from app.models.service_order import ServiceOrder
     from app.models.customer import Customer
 
-    headers = ["Company", "Contact", "Order Type", "Turbo Brand", "Turbo Model", "Vessel", "Status", "Description", "Created"]
-    ws = _ensure_worksheet(spreadsheet, "Service Orders", headers)
-
-    orders = db.query(ServiceOrder).all()
-    rows = []
-    for o in orders:
-        cust = db.query(Customer).filter(Customer.id == o.customer_id).first()
-        company = cust.company_name if cust else "Unknown"
-        contact = cust.contact_name if cust else ""
-        created = o.created_at.strftime("%Y-%m-%d") if o.created_at else ""
-        rows.append([
-            company, contact, o.order_type, o.turbo_brand, o.turbo_model,
-            o.vessel_name or "", o.status, o.description or "", created,
-        ])
-
-    ws.batch_clear(["A2:Z10000"])
-    if rows:
-        ws.update(range_name=f"A2:I{len(rows)+1}", values=rows)
-    return len(rows)
-
-
-def sync_customers_to_sheet(db: Session, spreadsheet):
-    """Customers 데이터를 시트에 동기화"""
-    from app.models.customer import Customer
+    stmt = select(
+        ServiceOrder.id, Customer.id, Customer.company_name, Customer.contact_name,
+        ServiceOrder.order_type, ServiceOrder.turbo_brand, ServiceOrder.turbo_model,
+        ServiceOrder.vessel_name, ServiceOrder.status, ServiceOrder.description, ServiceOrder.created_at,
+    ).outerjoin(Customer, Customer.id == ServiceOrder.customer_id)
+    for order_id, cust_id, company, contact, order_type, brand, model, vessel, status, desc, created in _stream(db, stmt):
+        yield order_id, [
+            company if cust_id else "Unknown", contact if cust_id else "", order_type, brand, model,
+            vessel or "", status, desc or "", _date(created), order_id,
+        ]
 
-    headers = ["Company", "Contact Name", "Email", "Phone", "Country", "Vessel Type", "Registered"]
-    ws = _ensure_worksheet(spreadsheet, "Customers", headers)
 
-    customers = db.query(Customer).all()
-    rows = []
-    for c in customers:
-        created = c.created_at.strftime("%Y-%m-%d") if c.created_at else ""
-        rows.append([
-            c.company_name, c.contact_name, c.email, c.phone or "",
-            c.country, c.vessel_type or "", created,
-        ])
+def _customer_rows(db: Session):
+    """Customers"""
+    from app.models.customer import Customer
 
-    ws.batch_clear(["A2:Z10000"])
-    if rows:
-        ws.update(range_name=f"A2:G{len(rows)+1}", values=rows)
-    return len(rows)
+    stmt = select(
+        Customer.id, Customer.company_name, Customer.contact_name, Customer.email, Customer.phone,
+        Customer.country, Customer.vessel_type, Customer.created_at,
+    )
+    for cust_id, company, contact, email, phone, country, vessel_type, created in _stream(db, stmt):
+        yield cust_id, [company, contact, email, phone or "", country, vessel_type or "", _date(created), cust_id]
 
 
-def sync_inquiries_to_sheet(db: Session, spreadsheet):
-    """Inquiries 데이터를 시트에 동기화"""
+def _inquiry_rows(db: Session):
+    """Inquiries + Customer (LEFT JOIN 1회)"""
     from app.models.inquiry import Inquiry
     from app.models.customer import Customer
 
-    headers = ["Company", "Subject", "Message", "Contact Email", "Resolved", "Response", "Created"]
-    ws = _ensure_worksheet(spreadsheet, "Inquiries", headers)
+    stmt = select(
+        Inquiry.id, Customer.id, Customer.company_name, Inquiry.subject, Inquiry.message,
+        Inquiry.contact_email, Inquiry.is_resolved, Inquiry.response, Inquiry.created_at,
+    ).outerjoin(Customer, Customer.id == Inquiry.customer_id)
+    for inq_id, cust_id, company, subject, message, email, resolved, response, created in _stream(db, stmt):
+        yield inq_id, [
+            company if cust_id else "N/A", subject, message[:200], email,
+            "YES" if resolved else "NO", (response or "")[:200], _date(created), inq_id,
+        ]
+
+
+SHEETS: dict[str, SheetSpec] = {
+    "parts": SheetSpec(
+        "Parts & Inventory",
+        ["Part Number", "Name", "Brand", "Turbo Model", "Category", "Unit Price (USD)", "Quantity", "Min Qty", "Warehouse", "Low Stock", "ID"],
+        _part_rows,
+    ),
+    "orders": SheetSpec(
+        "Service Orders",
+        ["Company", "Contact", "Order Type", "Turbo Brand", "Turbo Model", "Vessel", "Status", "Description", "Created", "ID"],
+        _order_rows,
+    ),
+    "customers": SheetSpec(
+        "Customers",
+        ["Company", "Contact Name", "Email", "Phone", "Country", "Vessel Type", "Registered", "ID"],
+        _customer_rows,
+    ),
+    "inquiries": SheetSpec(
+        "Inquiries",
+        ["Company", "Subject", "Message", "Contact Email", "Resolved", "Response", "Created", "ID"],
+        _inquiry_rows,
+    ),
+}
+
+
+# ── API 호출: 토큰 버킷 + 재시도 ──
+
+class _TokenBucket:
+    """프로세스 공용 Sheets API 호출 제한 (분당 google_sheets_requests_per_minute, 순간 최대 burst)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens: float | None = None
+        self._updated = time.monotonic()
+
+    def acquire(self):
+        settings = get_settings()
+        rate = settings.google_sheets_requests_per_minute / 60
+        if rate <= 0:
+            return
+        burst = max(1, settings.google_sheets_burst)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self._tokens is None:
+                    self._tokens = float(burst)
+                self._tokens = min(burst, self._tokens + (now - self._updated) * rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / rate
+            time.sleep(wait)
+
+
+_limiter = _TokenBucket()
+
+
+def _is_retryable(e: Exception) -> bool:
+    """429 / 5xx (gspread APIError.code) 또는 연결 오류/타임아웃"""
+    code = getattr(e, "code", None)
+    if isinstance(code, int):
+        return code == 429 or code >= 500
+    return isinstance(e, OSError)  # requests 연결/타임아웃 오류 포함
+
+
+def _call(fn, *args, **kwargs):
+    """호출 제한을 거쳐 API 호출, 재시도 가능한 오류는 지수 백오프(full jitter) 후 재시도"""
+    settings = get_settings()
+    attempt = 0
+    while True:
+        _limiter.acquire()
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt >= settings.google_sheets_max_retries or not _is_retryable(e):
+                raise
+            delay = random.uniform(0, settings.google_sheets_retry_base_delay_seconds * 2 ** attempt)
+            logger.warning(f"[SHEETS] {getattr(fn, '__name__', 'call')} failed ({e}), retry in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+# ── 증분 동기화 엔진: 계획(DB 읽기) → 적용(API) → 인덱스 커밋(DB 쓰기) ──
+
+@dataclass
+class SheetSyncResult:
+    mode: str = "delta"  # delta / full
+    rows: int = 0        # 동기화 후 데이터 행 수
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    moved: int = 0       # 빈 행을 채우려고 옮긴 행
+    ranges: list[str] = field(default_factory=list)  # 전송한 범위 (로그용)
+
+
+@dataclass
+class SheetPlan:
+    spec: SheetSpec
+    result: SheetSyncResult
+    writes: dict[int, list] = field(default_factory=dict)    # 행 번호 → 값
+    clear_rows: tuple[int, int] | None = None               # 비울 꼬리 행 구간
+    inserts: list[dict] = field(default_factory=list)        # 새 인덱스 항목
+    changes: list[dict] = field(default_factory=list)        # 해시/행 번호가 바뀐 인덱스 항목
+    removed_keys: list[str] = field(default_factory=list)
+
+
+def _col_letter(n: int) -> str:
+    letters = ""
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _a1(title: str, first_row: int, last_row: int, width: int) -> str:
+    quoted = title.replace("'", "''")
+    return f"'{quoted}'!A{first_row}:{_col_letter(width)}{last_row}"
+
+
+def _canonical(value):
+    """시트에서 다시 읽었을 때와 같아지도록 정규화 (빈 칸 = None, 숫자는 int/float 구분 없음)"""
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+# 행 해시 계산 방식 버전 - _canonical/_row_hash를 바꾸면 올림 (2: 숫자/빈 칸 정규화 도입)
+ROW_HASH_VERSION = 2
+
+
+def index_is_current(db: Session, title: str) -> bool:
+    """시트 행 인덱스가 현재 해시 방식으로 기록됐는지"""
+    state = db.get(SheetSyncState, title)
+    return state is not None and state.hash_version == ROW_HASH_VERSION
+
+
+def _row_hash(row: list) -> str:
+    canonical = [_canonical(v) for v in row]
+    return hashlib.md5(json.dumps(canonical, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+def _contiguous_ranges(writes: dict[int, list], title: str, width: int, max_rows: int) -> Iterable[list[dict]]:
+    """{행 번호: 값} → 연속 구간별 범위, max_rows행 단위 요청 묶음으로"""
+    batch: list[dict] = []
+    batch_rows = 0
+    start, block = None, []
+    for n in sorted(writes) + [None]:
+        if block and (n is None or n != start + len(block) or len(block) >= max_rows):
+            batch.append({"range": _a1(title, start, start + len(block) - 1, width), "values": block})
+            batch_rows += len(block)
+            block = []
+            if batch_rows >= max_rows:
+                yield batch
+                batch, batch_rows = [], 0
+        if n is not None:
+            if not block:
+                start = n
+            block.append(writes[n])
+    if batch:
+        yield batch
+
+
+def plan_sheet(db: Session, spec: SheetSpec, full: bool = False) -> SheetPlan:
+    """DB 행과 행 인덱스를 비교해 보낼 범위와 인덱스 변경분 계산 (DB 읽기만)"""
+    index = {
+        key: [number, digest]
+        for key, number, digest in db.execute(
+            select(SheetRowIndex.row_key, SheetRowIndex.row_number, SheetRowIndex.row_hash)
+            .where(SheetRowIndex.sheet == spec.title)
+        )
+    }
+    plan = SheetPlan(spec, SheetSyncResult())
+    if full or not index or not index_is_current(db, spec.title):
+        # 처음이거나 강제 재작성, 또는 예전 해시 방식의 인덱스: 기존 데이터 영역을 비우고 2행부터 다시 씀
+        plan.result.mode = "full"
+        index = {}
+
+    values: dict[str, list] = {}  # 빈 행 채우기용 (행 키 → 값)
+    new_rows: list[tuple[str, list, str]] = []
+    changed: set[str] = set()
+    seen: set[str] = set()
+    for key, row in spec.rows(db):
+        seen.add(key)
+        values[key] = row
+        digest = _row_hash(row)
+        entry = index.get(key)
+        if entry is None:
+            new_rows.append((key, row, digest))
+        elif entry[1] != digest:
+            plan.writes[entry[0]] = row
+            entry[1] = digest
+            changed.add(key)
+            plan.result.updated += 1
+
+    # 삭제된 키의 행은 새 행에 먼저 재사용
+    old_last_row = max((e[0] for e in index.values()), default=1)
+    plan.removed_keys = [key for key in index if key not in seen]
+    free = sorted(index.pop(key)[0] for key in plan.removed_keys)
+    plan.result.removed = len(plan.removed_keys)
+
+    next_row = old_last_row + 1
+    new_keys: set[str] = set()
+    for key, row, digest in new_rows:
+        if free:
+            number = free.pop(0)
+        else:
+            number, next_row = next_row, next_row + 1
+        plan.writes[number] = row
+        index[key] = [number, digest]
+        new_keys.add(key)
+    plan.result.added = len(new_rows)
+
+    # 남은 빈 행은 맨 뒤 행을 옮겨 채움 → 데이터 영역 2..len+1 연속 유지
+    last_row = len(index) + 1
+    tail = sorted((k for k, e in index.items() if e[0] > last_row), key=lambda k: -index[k][0])
+    for hole, key in zip((n for n in free if n <= last_row), tail):
+        plan.writes.pop(index[key][0], None)
+        index[key][0] = hole
+        plan.writes[hole] = values[key]
+        changed.add(key)
+        plan.result.moved += 1
+    plan.result.rows = len(index)
+
+    stale_end = max(old_last_row, next_row - 1)
+    if stale_end > last_row:
+        plan.clear_rows = (last_row + 1, stale_end)
+
+    now = datetime.utcnow()
+    for key in new_keys:
+        plan.inserts.append({"sheet": spec.title, "row_key": key, "row_number": index[key][0], "row_hash": index[key][1], "synced_at": now})
+    for key in changed - new_keys:
+        plan.changes.append({"sheet": spec.title, "row_key": key, "row_number": index[key][0], "row_hash": index[key][1], "synced_at": now})
+    return plan
+
+
+def apply_plan(spreadsheet, plan: SheetPlan):
+    """계획한 범위를 시트에 반영 (API만 사용 - 스레드에서 실행 가능)"""
+    settings = get_settings()
+    spec = plan.spec
+    width = len(spec.headers)
+    full = plan.result.mode == "full"
+    if full:
+        # 전체 재작성은 시트를 수동 편집한 경우 - 캐시된 핸들의 행 수(row_count)를 믿지 않고 다시 조회
+        _pool.invalidate_worksheet(spreadsheet, spec.title)
+    # 헤더도 항상 다시 씀
+    ws = _ensure_worksheet(spreadsheet, spec.title, spec.headers, force_headers=full)
+    try:
+        if full and ws.row_count > 1:
+            _call(ws.batch_clear, [f"A2:{_col_letter(width)}{ws.row_count}"])
+        needed = max(plan.writes, default=1)
+        if needed > ws.row_count:
+            _call(ws.add_rows, needed - ws.row_count)
+        for batch in _contiguous_ranges(plan.writes, spec.title, width, settings.google_sheets_batch_rows):
+            _call(spreadsheet.values_batch_update, body={"valueInputOption": "RAW", "data": batch})
+            plan.result.ranges.extend(r["range"] for r in batch)
+        if plan.clear_rows and not full:
+            first, last = plan.clear_rows
+            _call(ws.batch_clear, [f"A{first}:{_col_letter(width)}{last}"])
+    except Exception:
+        # 캐시된 핸들(행 수 등)이 실제 시트와 달라졌을 수 있으니 다음에는 새로 조회
+        _pool.invalidate_worksheet(spreadsheet, spec.title)
+        raise
+
+
+def commit_plan(db: Session, plan: SheetPlan):
+    """시트 반영이 끝난 계획의 행 인덱스 저장"""
+    title = plan.spec.title
+    try:
+        if plan.result.mode == "full":
+            db.query(SheetRowIndex).filter(SheetRowIndex.sheet == title).delete(synchronize_session=False)
+            db.merge(SheetSyncState(sheet=title, hash_version=ROW_HASH_VERSION))
+        for i in range(0, len(plan.removed_keys), 500):
+            db.query(SheetRowIndex).filter(
+                SheetRowIndex.sheet == title, SheetRowIndex.row_key.in_(plan.removed_keys[i:i + 500]),
+            ).delete(synchronize_session=False)
+        if plan.changes:
+            db.bulk_update_mappings(SheetRowIndex, plan.changes)
+        if plan.inserts:
+            db.bulk_insert_mappings(SheetRowIndex, plan.inserts)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def reset_sheet_index(db: Session, title: str):
+    """일부 범위만 반영됐을 수 있을 때 인덱스를 버려 다음 동기화를 전체 재작성으로"""
+    db.rollback()
+    db.query(SheetRowIndex).filter(SheetRowIndex.sheet == title).delete(synchronize_session=False)
+    db.commit()
+
+
+def sync_sheet(db: Session, spreadsheet, spec: SheetSpec, full: bool = False) -> SheetSyncResult:
+    """한 워크시트를 DB와 맞춤 - 바뀐 행만 전송하고 성공하면 행 인덱스 커밋"""
+    plan = plan_sheet(db, spec, full=full)
+    try:
+        apply_plan(spreadsheet, plan)
+    except Exception:
+        reset_sheet_index(db, spec.title)
+        raise
+    commit_plan(db, plan)
+    return plan.result
+
+
+def sync_spreadsheet(
+    db: Session, spreadsheet, full: bool = False, on_progress: Callable[[str, dict], None] | None = None,
+) -> dict:
+    """모든 시트 증분 동기화 → {이름: 행 수, "changes": {이름: 상세}}
+
+    DB 비교는 호출 스레드에서 순서대로, 시트 반영(API)은 google_sheets_max_workers 스레드에서 동시에 실행.
+    on_progress(시트 이름, 상태): 시트 시작/완료/실패 시 호출 (백그라운드 작업 진행률 기록용)
+    """
+    settings = get_settings()
+    plans: dict[str, SheetPlan] = {}
+    for name, spec in SHEETS.items():
+        plans[name] = plan_sheet(db, spec, full=full)
+        if on_progress:
+            on_progress(name, {"status": "running"})
 
-    inquiries = db.query(Inquiry).all()
-    rows = []
-    for inq in inquiries:
-        cust = db.query(Customer).filter(Customer.id == inq.customer_id).first() if inq.customer_id else None
-        company = cust.company_name if cust else "N/A"
-        created = inq.created_at.strftime("%Y-%m-%d") if inq.created_at else ""
-        rows.append([
-            company, inq.subject, inq.message[:200], inq.contact_email,
-            "YES" if inq.is_resolved else "NO", (inq.response or "")[:200], created,
-        ])
+    results, changes, errors = {}, {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, settings.google_sheets_max_workers), thread_name_prefix="sheets-sync") as pool:
+        futures = {pool.submit(apply_plan, spreadsheet, plan): name for name, plan in plans.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            plan = plans[name]
+            try:
+                future.result()
+                commit_plan(db, plan)
+            except Exception as e:
+                reset_sheet_index(db, plan.spec.title)
+                errors[name] = e
+                if on_progress:
+                    on_progress(name, {"status": "failed", "error": str(e)})
+                continue
+            results[name] = plan.result.rows
+            changes[name] = {k: v for k, v in asdict(plan.result).items() if k != "ranges"}
+            if on_progress:
+                on_progress(name, {"status": "done", **changes[name]})
 
-    ws.batch_clear(["A2:Z10000"])
-    if rows:
-        ws.update(range_name=f"A2:G{len(rows)+1}", values=rows)
-    return len(rows)
+    if errors:
+        detail = "; ".join(f"{name}: {e}" for name, e in errors.items())
+        raise RuntimeError(f"Google Sheets sync failed for {len(errors)} sheet(s) - {detail}")
+    return {**{name: results[name] for name in SHEETS}, "changes": {name: changes[name] for name in SHEETS}}
 
 
-def sync_all(db: Session, credentials_file: str, spreadsheet_id: str) -> dict:
+def sync_all(
+    db: Session, credentials_file: str, spreadsheet_id: str, full: bool = False,
+    on_progress: Callable[[str, dict], None] | None = None,
+) -> dict:
     """전체 데이터를 Google Sheets에 동기화"""
     if not credentials_file or not spreadsheet_id:
         raise ValueError("Google Sheets credentials file and spreadsheet ID are required. Set GOOGLE_SHEETS_CREDENTIALS_FILE and GOOGLE_SHEETS_SPREADSHEET_ID in .env")
 
-    client = _get_client(credentials_file)
-    spreadsheet = client.open_by_key(spreadsheet_id)
+    spreadsheet = _open_spreadsheet(credentials_file, spreadsheet_id)
 
     results = {
-        "parts": sync_parts_to_sheet(db, spreadsheet),
-        "orders": sync_orders_to_sheet(db, spreadsheet),
-        "customers": sync_customers_to_sheet(db, spreadsheet),
-        "inquiries": sync_inquiries_to_sheet(db, spreadsheet),
+        **sync_spreadsheet(db, spreadsheet, full=full, on_progress=on_progress),
         "synced_at": datetime.utcnow().isoformat(),
     }
 
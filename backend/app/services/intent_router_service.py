@@ -0,0 +1,78 @@
+"""폴백 챗봇 의도 분류 - 키워드 목록을 임포트 시 정규식 1개로 컴파일
+
+메시지를 한 번 훑어 일치한 키워드 → 의도 집합을 구하고, 우선순위 순으로 정렬해 반환한다.
+기존 `any(kw in msg for kw in [...])` 체인과 같은 부분 문자열 의미를 유지한다:
+각 위치에서 가장 긴 키워드 하나만 잡히므로, 키워드마다 그 안에 포함된 다른 키워드의
+의도까지 미리 합쳐 둔다 (예: "cartridge" → 부품 + 오버홀 종류).
+"""
+import re
+from dataclasses import dataclass
+
+# 응답 의도 (우선순위 순) - 앞쪽 의도의 응답이 먼저 선택됨
+INTENT_KEYWORDS: dict[str, list[str]] = {
+    "greeting": ["안녕", "hello", "hi", "헬로", "처음", "시작"],
+    "inventory": [
+        "재고", "stock", "inventory", "부품", "part", "가격", "price", "견적", "quote", "얼마",
+        "man", "mhi", "kbb", "abb", "napier",
+        "nozzle", "노즐", "bearing", "베어링", "blade", "블레이드", "seal", "씰",
+        "gasket", "가스켓", "shaft", "샤프트", "cartridge", "카트리지", "casing", "케이싱",
+        "compressor", "컴프레서", "filter", "필터", "wheel", "휠",
+    ],
+    "overhaul": ["오버홀", "overhaul", "정비", "수리", "maintenance"],
+    "company": ["회사", "소개", "about", "company", "용진", "yjt", "yongjin"],
+    "contact": ["연락", "contact", "문의", "전화", "이메일", "email", "phone", "위치", "주소", "address", "location"],
+    "brand_info": ["브랜드", "brand", "지원", "취급"],
+    "order": ["주문", "order", "상태", "status", "서비스"],
+}
+
+# 응답 세부 분기용 보조 의도 (순위 없음)
+MODIFIER_KEYWORDS: dict[str, list[str]] = {
+    "price": ["가격", "price", "견적", "quote", "얼마", "cost"],
+    "overhaul_process": ["절차", "과정", "순서", "flow", "process", "어떻게"],
+    "overhaul_types": ["종류", "타입", "type", "카트리지", "cartridge"],
+}
+
+_PRIORITY = {intent: i for i, intent in enumerate(INTENT_KEYWORDS)}
+
+# 터보차저 모델명 패턴 (예: nr29/s, met42, hpr3000) - 있으면 재고 조회 의도
+_MODEL_RE = re.compile(r"[A-Za-z]{2,4}[\-]?\d{2,5}[/]?[A-Za-z]?")
+
+
+def _compile():
+    keyword_intents: dict[str, set[str]] = {}
+    for table in (INTENT_KEYWORDS, MODIFIER_KEYWORDS):
+        for intent, keywords in table.items():
+            for kw in keywords:
+                keyword_intents.setdefault(kw, set()).add(intent)
+
+    # 키워드 안에 포함된 더 짧은 키워드의 의도까지 합침
+    closure = {
+        kw: frozenset().union(*(intents for other, intents in keyword_intents.items() if other in kw))
+        for kw in keyword_intents
+    }
+    alternation = "|".join(re.escape(kw) for kw in sorted(keyword_intents, key=len, reverse=True))
+    # 전방 탐색으로 모든 위치에서 (겹치는 것 포함) 가장 긴 키워드를 잡음
+    return re.compile(f"(?=({alternation}))"), closure
+
+
+_KEYWORD_RE, _KEYWORD_INTENTS = _compile()
+
+
+@dataclass(frozen=True)
+class Intents:
+    ranked: list[str]       # 응답 의도 (우선순위 순)
+    matched: frozenset[str]  # 보조 의도 포함 전체
+
+    def __contains__(self, intent: str) -> bool:
+        return intent in self.matched
+
+
+def classify(message: str) -> Intents:
+    """소문자 메시지 → 일치한 의도 (모델명 패턴은 재고 조회로 취급)"""
+    matched: set[str] = set()
+    for m in _KEYWORD_RE.finditer(message):
+        matched |= _KEYWORD_INTENTS[m.group(1)]
+    if "inventory" not in matched and _MODEL_RE.search(message):
+        matched.add("inventory")
+    ranked = sorted((i for i in matched if i in _PRIORITY), key=_PRIORITY.__getitem__)
+    return Intents(ranked, frozenset(matched))
@@ -0,0 +1,119 @@
+"""LLM 응답 캐시 - 동일 프롬프트(모델/시스템/메시지/언어/데이터 버전) 응답 재사용
+
+- 메모리 LRU (llm_cache_size개) + 선택적 SQLite 파일 (llm_cache_sqlite_path, 재시작 후에도 유지)
+- llm_cache_ttl_seconds 지난 항목은 무시/정리
+- 적중/미적중 수는 LLM 게이트웨이 지표에 함께 노출
+"""
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def make_cache_key(model: str, system: str | list[dict], messages: list[dict], max_tokens: int, version=None) -> str:
+    """프롬프트 전체 + 호출 측 데이터 버전의 해시 (응답 언어는 프롬프트에 포함됨)"""
+    raw = json.dumps([model, system, messages, max_tokens, version], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        self._db_path: str | None = None
+        self._puts = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _disk(self) -> sqlite3.Connection | None:
+        path = settings.llm_cache_sqlite_path
+        if not path:
+            return None
+        if self._db is None or self._db_path != path:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                self._db.commit()
+                self._db_path = path
+            except sqlite3.Error as e:
+                logger.warning(f"[LLM-CACHE] SQLite cache unavailable ({path}): {e}")
+                self._db = None
+        return self._db
+
+    def get(self, key: str) -> str | None:
+        if not settings.llm_cache_enabled:
+            return None
+        now = time.time()
+        ttl = settings.llm_cache_ttl_seconds
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            db = self._disk()
+            if db is not None:
+                try:
+                    row = db.execute(
+                        "SELECT value, created_at FROM llm_cache WHERE key = ? AND created_at > ?", (key, now - ttl)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"[LLM-CACHE] SQLite read failed: {e}")
+                    row = None
+                if row:
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str):
+        if not settings.llm_cache_enabled or not value:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            db = self._disk()
+            if db is None:
+                return
+            try:
+                db.execute("INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)", (key, value, now))
+                self._puts += 1
+                if self._puts % 100 == 0:
+                    db.execute("DELETE FROM llm_cache WHERE created_at <= ?", (now - settings.llm_cache_ttl_seconds,))
+                db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[LLM-CACHE] SQLite write failed: {e}")
+
+    def _remember(self, key: str, value: str, created_at: float):
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.llm_cache_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+            "entries": len(self._entries),
+        }
+
+
+response_cache = LLMResponseCache()
@@ -0,0 +1,389 @@
+"""LLM 게이트웨이 - Anthropic API 호출 공통 관문 (동시성 제한 / 재시도 / 사용자별 속도 제한 / 서킷 브레이커 / 지표)
+
+- 프로세스 공유 클라이언트 (SDK 자체 재시도는 끄고 게이트웨이에서 지터 백오프로 재시도)
+- llm_max_concurrency 개 이상 동시 호출 금지, 대기 시간 초과 시 LLMGatewayError("busy")
+- 사용자(또는 IP)별 분당 호출 수 제한 → LLMRateLimitedError
+- 연속 실패가 llm_breaker_failure_threshold 회면 llm_breaker_reset_seconds 동안 즉시 실패
+  (호출 측은 LLMGatewayError를 받으면 규칙 기반 폴백으로 전환)
+- 동일 요청이 진행 중이면 결과를 공유 (비스트리밍 호출)
+- cache=True 호출은 응답 캐시(llm_cache_service) 적중 시 API를 호출하지 않음
+- anthropic_base_url로 로컬 스텁 서버를 가리켜 테스트 가능
+"""
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import AsyncIterator
+import anthropic
+from app.config import get_settings
+from app.services.llm_cache_service import response_cache, make_cache_key
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+DEFAULT_MODEL = "claude-sonnet-4-20250514"
+
+
+class LLMGatewayError(Exception):
+    """LLM 호출 불가 (reason: busy / circuit_open / upstream / timeout ...)"""
+
+    def __init__(self, reason: str, message: str = ""):
+        super().__init__(message or reason)
+        self.reason = reason
+
+
+class LLMAuthError(LLMGatewayError):
+    """API 키 오류 (재시도/서킷 집계 대상 아님)"""
+
+    def __init__(self, message: str = ""):
+        super().__init__("auth", message)
+
+
+class LLMRateLimitedError(LLMGatewayError):
+    """사용자별 호출 한도 초과"""
+
+    def __init__(self, message: str = ""):
+        super().__init__("user_rate_limited", message)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """일시적 오류 여부 (연결/타임아웃, 408/409/429, 5xx·529 overloaded)"""
+    if isinstance(error, anthropic.APIConnectionError):
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+
+class _CircuitBreaker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= settings.llm_breaker_reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True  # 시험 호출 1건만 통과
+                return True
+            return False
+
+    def release_trial(self):
+        """결과 없이 끝난 시험 호출 (대기 초과, 연결 끊김) → 다음 호출이 다시 시험"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= settings.llm_breaker_failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"[LLM] Circuit opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+
+
+class _UserRateLimiter:
+    """사용자 키별 토큰 버킷 (분당 llm_user_rate_per_minute회)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}  # {key: (tokens, updated monotonic)}
+
+    def acquire(self, key: str) -> bool:
+        rate = settings.llm_user_rate_per_minute
+        if rate <= 0:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(rate), now))
+            tokens = min(float(rate), tokens + (now - updated) * rate / 60.0)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return False
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > 10000:
+                # 오래된 버킷 정리 (가득 찬 버킷은 새로 만든 것과 같음)
+                self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < 60}
+            return True
+
+
+class _Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=500)
+        self.counters: dict[str, int] = {
+            "requests": 0, "success": 0, "failure": 0, "retries": 0, "coalesced": 0,
+            "input_tokens": 0, "output_tokens": 0,
+        }
+        self.errors: dict[str, int] = {}
+
+    def incr(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def error(self, reason: str):
+        with self._lock:
+            self.counters["failure"] += 1
+            self.errors[reason] = self.errors.get(reason, 0) + 1
+
+    def success(self, latency: float, usage):
+        with self._lock:
+            self.counters["success"] += 1
+            self._latencies.append(latency)
+            if usage is not None:
+                self.counters["input_tokens"] += getattr(usage, "input_tokens", 0) or 0
+                self.counters["output_tokens"] += getattr(usage, "output_tokens", 0) or 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lat = sorted(self._latencies)
+
+            def pct(p: float) -> float | None:
+                return round(lat[min(len(lat) - 1, int(p * len(lat)))] * 1000, 1) if lat else None
+
+            return {
+                **self.counters,
+                "errors": dict(self.errors),
+                "latency_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0), "samples": len(lat)},
+            }
+
+
+def _backoff(attempt: int, error: Exception | None = None) -> float:
+    """지수 백오프 + full jitter (서버가 retry-after를 주면 그 값 우선, 상한 적용)"""
+    cap = settings.llm_retry_max_delay_seconds
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(cap, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, settings.llm_retry_base_delay_seconds * 2 ** attempt))
+
+
+class LLMGateway:
+    def __init__(self):
+        self._client: anthropic.Anthropic | None = None
+        self._async_client: anthropic.AsyncAnthropic | None = None
+        self._semaphore = threading.BoundedSemaphore(settings.llm_max_concurrency)
+        self._breaker = _CircuitBreaker()
+        self._limiter = _UserRateLimiter()
+        self._metrics = _Metrics()
+        self._inflight_lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+
+    # ── 클라이언트 ──
+
+    def _client_kwargs(self) -> dict:
+        kwargs = {
+            "api_key": settings.anthropic_api_key,
+            "timeout": settings.llm_request_timeout_seconds,
+            "max_retries": 0,
+        }
+        if settings.anthropic_base_url:
+            kwargs["base_url"] = settings.anthropic_base_url
+        return kwargs
+
+    def _get_client(self) -> anthropic.Anthropic:
+        if self._client is None:
+            self._client = anthropic.Anthropic(**self._client_kwargs())
+        return self._client
+
+    def _get_async_client(self) -> anthropic.AsyncAnthropic:
+        if self._async_client is None:
+            self._async_client = anthropic.AsyncAnthropic(**self._client_kwargs())
+        return self._async_client
+
+    # ── 공통 관문 ──
+
+    def _admit(self, user_key: str | None):
+        self._metrics.incr("requests")
+        if not settings.anthropic_api_key:
+            self._metrics.error("no_api_key")
+            raise LLMGatewayError("no_api_key")
+        if user_key and not self._limiter.acquire(user_key):
+            self._metrics.error("user_rate_limited")
+            raise LLMRateLimitedError()
+        if not self._breaker.allow():
+            self._metrics.error("circuit_open")
+            raise LLMGatewayError("circuit_open")
+
+    def _fail(self, error: Exception) -> LLMGatewayError:
+        if isinstance(error, anthropic.AuthenticationError):
+            self._breaker.record_success()  # 설정 오류는 서킷 집계에서 제외
+            self._metrics.error("auth")
+            return LLMAuthError(str(error))
+        self._breaker.record_failure()
+        reason = "timeout" if isinstance(error, anthropic.APITimeoutError) else type(error).__name__
+        self._metrics.error(reason)
+        logger.error(f"[LLM] Call failed: {type(error).__name__}: {error}")
+        return LLMGatewayError(reason, str(error))
+
+    def create(
+        self,
+        *,
+        system: str | list[dict],
+        messages: list[dict],
+        max_tokens: int,
+        model: str = DEFAULT_MODEL,
+        user_key: str | None = None,
+        cache: bool = False,
+        cache_version=None,
+    ) -> str:
+        """동기 호출 → 응답 텍스트 (실패 시 LLMGatewayError)
+
+        cache=True면 동일 프롬프트 + cache_version(호출 측 데이터 버전) 응답을 재사용 (API 호출/한도 소모 없음).
+        """
+        key = make_cache_key(model, system, messages, max_tokens, cache_version)
+        if cache:
+            cached = response_cache.get(key)
+            if cached is not None:
+                return cached
+        self._admit(user_key)
+
+        # 동일 요청 진행 중이면 결과 공유
+        with self._inflight_lock:
+            leader = self._inflight.get(key)
+            if leader is None:
+                future = self._inflight[key] = Future()
+        if leader is not None:
+            self._metrics.incr("coalesced")
+            return leader.result()
+
+        try:
+            text = self._create(system, messages, max_tokens, model)
+            if cache:
+                response_cache.put(key, text)
+            future.set_result(text)
+            return text
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _create(self, system: str | list[dict], messages: list[dict], max_tokens: int, model: str) -> str:
+        if not self._semaphore.acquire(timeout=settings.llm_queue_timeout_seconds):
+            self._breaker.release_trial()
+            self._metrics.error("busy")
+            raise LLMGatewayError("busy")
+        try:
+            for attempt in range(settings.llm_max_retries + 1):
+                started = time.monotonic()
+                try:
+                    response = self._get_client().messages.create(
+                        model=model, max_tokens=max_tokens, system=system, messages=messages,
+                    )
+                except anthropic.APIError as e:
+                    if _is_retryable(e) and attempt < settings.llm_max_retries:
+                        self._metrics.incr("retries")
+                        time.sleep(_backoff(attempt, e))
+                        continue
+                    raise self._fail(e)
+                self._breaker.record_success()
+                self._metrics.success(time.monotonic() - started, response.usage)
+                return response.content[0].text
+        finally:
+            self._semaphore.release()
+            self._breaker.release_trial()
+
+    async def _acquire_slot(self) -> bool:
+        """동시 호출 슬롯을 스레드에서 대기 (동기 호출과 같은 세마포어 공유)
+
+        대기 중 요청이 취소되어도 스레드는 계속 기다리므로, 뒤늦게 얻은 슬롯은 즉시 반납한다.
+        """
+        waiter = asyncio.ensure_future(
+            asyncio.to_thread(self._semaphore.acquire, timeout=settings.llm_queue_timeout_seconds)
+        )
+        try:
+            return await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            self._breaker.release_trial()
+            waiter.add_done_callback(self._release_abandoned_slot)
+            raise
+
+    def _release_abandoned_slot(self, waiter: asyncio.Future):
+        if not waiter.cancelled() and waiter.exception() is None and waiter.result():
+            self._semaphore.release()
+
+    async def stream(
+        self,
+        *,
+        system: str | list[dict],
+        messages: list[dict],
+        max_tokens: int,
+        model: str = DEFAULT_MODEL,
+        user_key: str | None = None,
+        cache: bool = False,
+        cache_version=None,
+    ) -> AsyncIterator[str]:
+        """스트리밍 호출 → 텍스트 조각 (첫 조각 전 오류만 재시도, 실패 시 LLMGatewayError)
+
+        cache=True면 캐시 적중 시 전체 응답을 한 조각으로 반환, 미적중이면 완료된 응답을 저장.
+        """
+        key = make_cache_key(model, system, messages, max_tokens, cache_version)
+        if cache:
+            cached = response_cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        self._admit(user_key)
+        if not await self._acquire_slot():
+            self._breaker.release_trial()
+            self._metrics.error("busy")
+            raise LLMGatewayError("busy")
+        try:
+            for attempt in range(settings.llm_max_retries + 1):
+                started = time.monotonic()
+                sent_any = False
+                try:
+                    async with self._get_async_client().messages.stream(
+                        model=model, max_tokens=max_tokens, system=system, messages=messages,
+                    ) as stream:
+                        async for text in stream.text_stream:
+                            sent_any = True
+                            yield text
+                        final = await stream.get_final_message()
+                    if cache:
+                        response_cache.put(key, "".join(b.text for b in final.content if b.type == "text"))
+                except anthropic.APIError as e:
+                    if _is_retryable(e) and not sent_any and attempt < settings.llm_max_retries:
+                        self._metrics.incr("retries")
+                        await asyncio.sleep(_backoff(attempt, e))
+                        continue
+                    raise self._fail(e)
+                self._breaker.record_success()
+                self._metrics.success(time.monotonic() - started, final.usage)
+                return
+        finally:
+            self._semaphore.release()
+            self._breaker.release_trial()
+
+    def metrics(self) -> dict:
+        return {**self._metrics.snapshot(), "circuit": self._breaker.state, "cache": response_cache.stats()}
+
+
+gateway = LLMGateway()
@@ -0,0 +1,440 @@
+"""발송 메일 큐 - 요청 핸들러는 outbound_emails에 넣기만 하고 백그라운드 워커가 SMTP로 발송
+
+- 워커는 SMTP 연결을 유지하며 재사용 (끊기면 다시 연결, smtp_idle_close_seconds 동안 쓰지 않으면 닫음)
+- 한 번에 email_batch_size건을 가져와 같은 연결로 연속 발송
+- 대량 발송(campaign_id 있음) 메일은 개별 메일보다 뒤, email_campaign_rate_per_minute 속도로만 발송
+- 일시 오류(4xx/연결 끊김)는 지수 백오프로 재시도, 영구 오류(5xx)나 재시도 소진 시 email_dead_letters로 이동
+- 메일 단위 오류(수신자/발신자 거부, 헤더 오류 등)는 그 메일에만 반영하고 같은 연결로 다음 메일 계속,
+  연결 오류(연결/로그인 실패, 끊김, 소켓 오류)만 묶음을 중단 - 시도하지 않은 메일은 시도 횟수 그대로 큐로
+- 서버에 연결/로그인하지 못하면 메일을 넘기지 못한 것이므로 묶음 전체를 시도 횟수 없이 되돌리고,
+  워커는 연속 실패마다 두 배로(email_connect_backoff_max_seconds까지) 기다렸다가 다시 연결
+- 큐가 DB에 있으므로 재시작/다른 워커 프로세스와 안전 (claimed_by 토큰으로 행 선점)
+- 로컬 검증: aiosmtpd 등 테스트 서버로 SMTP_HOST/SMTP_PORT 지정, SMTP_STARTTLS=false, SMTP_AUTH=false
+"""
+import uuid
+import time
+import socket
+import hashlib
+import random
+import logging
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from sqlalchemy import func
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.outbound_email import OutboundEmail, EmailDeadLetter
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def sender_address() -> str:
+    return settings.smtp_from_email or settings.smtp_user
+
+
+def smtp_configured() -> bool:
+    """발송 가능한 SMTP 설정인지 (인증 없는 릴레이는 계정 없이도 가능)"""
+    return bool(
+        settings.smtp_host
+        and sender_address()
+        and (not settings.smtp_auth or (settings.smtp_user and settings.smtp_password))
+    )
+
+
+def _worker_prefix() -> str:
+    """워커 ID(기본 호스트 이름)의 짧은 해시 - 선점 토큰 앞부분 (claimed_by는 36자)"""
+    return hashlib.md5((settings.email_worker_id or socket.gethostname()).encode()).hexdigest()[:8]
+
+
+def build_message(email: OutboundEmail) -> MIMEMultipart:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = email.subject
+    msg["From"] = email.from_header
+    msg["To"] = email.to_email
+    if email.reply_to:
+        msg["Reply-To"] = email.reply_to
+    msg.attach(MIMEText(email.html, "html", "utf-8"))
+    return msg
+
+
+def _is_permanent(e: Exception) -> bool:
+    """수신자 거부 / 5xx 응답 / 서버가 지원하지 않는 메일 / 메시지 구성 오류 → 재시도해도 같은 결과"""
+    if isinstance(e, smtplib.SMTPNotSupportedError):
+        return True
+    if not isinstance(e, OSError):
+        return True  # 헤더 인코딩 등 메시지 자체 오류
+    if isinstance(e, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in e.recipients.values())
+    if isinstance(e, smtplib.SMTPAuthenticationError):
+        return False  # 설정 문제 - 고쳐지면 재시도로 발송
+    if isinstance(e, smtplib.SMTPResponseException):
+        return e.smtp_code >= 500
+    return False
+
+
+class SMTPUnavailable(Exception):
+    """SMTP 서버 연결/로그인 실패 - 메일 자체의 문제가 아니므로 묶음을 중단"""
+
+
+def _is_connection_error(e: Exception) -> bool:
+    """연결 단위 오류인지 (SMTPException도 OSError 하위 클래스라 따로 구분)"""
+    if isinstance(e, (SMTPUnavailable, smtplib.SMTPServerDisconnected)):
+        return True
+    return isinstance(e, OSError) and not isinstance(e, smtplib.SMTPException)
+
+
+class SMTPConnection:
+    """재사용 SMTP 연결 - 필요할 때 연결/로그인, 끊겼으면 한 번 다시 연결해 재전송"""
+
+    def __init__(self):
+        self._smtp: smtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    def _connect(self):
+        try:
+            smtp = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=settings.smtp_timeout_seconds)
+        except Exception as e:
+            raise SMTPUnavailable(f"connect failed: {e}") from e
+        try:
+            if settings.smtp_starttls:
+                smtp.starttls()
+            if settings.smtp_auth:
+                smtp.login(settings.smtp_user, settings.smtp_password)
+        except Exception as e:
+            smtp.close()
+            raise SMTPUnavailable(f"{'login' if isinstance(e, smtplib.SMTPAuthenticationError) else 'handshake'} failed: {e}") from e
+        self._smtp = smtp
+        logger.info(f"[MAIL-QUEUE] SMTP connected to {settings.smtp_host}:{settings.smtp_port}")
+
+    def send(self, msg):
+        if self._smtp is None:
+            self._connect()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # 서버가 유휴 연결을 끊은 경우 - 다시 연결해 한 번 더
+            self.close()
+            self._connect()
+            self._smtp.send_message(msg)
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self):
+        if self._smtp is not None and time.monotonic() - self._last_used > settings.smtp_idle_close_seconds:
+            self.close()
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                self._smtp.close()
+            self._smtp = None
+
+
+class _Throttle:
+    """대량 발송 속도 제한 토큰 버킷 (분당 email_campaign_rate_per_minute, 최대 한 묶음까지 적립)"""
+
+    def __init__(self):
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+
+    def _refill(self) -> float:
+        rate = settings.email_campaign_rate_per_minute / 60
+        now = time.monotonic()
+        self._tokens = min(float(settings.email_batch_size), self._tokens + (now - self._updated) * rate)
+        self._updated = now
+        return rate
+
+    def take(self, wanted: int) -> int:
+        if settings.email_campaign_rate_per_minute <= 0:
+            return wanted
+        self._refill()
+        granted = min(wanted, int(self._tokens))
+        self._tokens -= granted
+        return granted
+
+    def refund(self, count: int):
+        if settings.email_campaign_rate_per_minute > 0:
+            self._tokens += count
+
+    def seconds_until(self, count: int) -> float:
+        rate = self._refill()
+        if rate <= 0:
+            return 0.0
+        return max(0.2, (min(count, settings.email_batch_size) - self._tokens) / rate)
+
+
+class MailQueue:
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._prefix = _worker_prefix()
+        self._token = f"{self._prefix}-{uuid.uuid4().hex[:24]}"
+        self._conn = SMTPConnection()
+        self._campaign_throttle = _Throttle()
+        self._next_wait: float = settings.email_poll_seconds
+        self._connect_failures = 0  # 연속 SMTP 연결/로그인 실패 횟수
+        self._connect_retry_at = 0.0  # 이 시각(monotonic)까지 선점/발송 보류
+
+    # ── 등록 ──
+
+    def enqueue(self, messages: list[dict]) -> list[str]:
+        """메일 여러 건 등록 (to_email, subject, html, from_header, reply_to) → ID 목록"""
+        db = SessionLocal()
+        try:
+            rows = [OutboundEmail(**m) for m in messages]
+            db.add_all(rows)
+            db.commit()
+            ids = [r.id for r in rows]
+        finally:
+            db.close()
+        self._ensure_started()
+        self._wake.set()
+        return ids
+
+    def wake(self):
+        """다른 경로로 큐에 넣은 메일(대량 발송 등)을 바로 처리하도록 워커 깨우기"""
+        self._ensure_started()
+        self._wake.set()
+
+    def stats(self) -> dict:
+        db = SessionLocal()
+        try:
+            counts = dict(db.query(OutboundEmail.status, func.count()).group_by(OutboundEmail.status).all())
+            counts["dead_letters"] = db.query(func.count(EmailDeadLetter.id)).filter(EmailDeadLetter.requeued_at.is_(None)).scalar()
+            return counts
+        finally:
+            db.close()
+
+    def requeue_dead_letter(self, db, letter: EmailDeadLetter) -> str:
+        """보관된 메일을 큐로 되돌림 - 원래 큐 항목이 남아 있으면 그 행을 다시 대기 상태로
+        (campaign_id 유지 → 대량 발송 속도 제한/수신자별 집계에 그대로 반영, 같은 수신자가 두 번 집계되지 않음),
+        없으면 새 큐 항목으로 등록"""
+        row = db.get(OutboundEmail, letter.email_id)
+        if row is not None and row.status == "dead":
+            row.status = "queued"
+            row.attempts = 0
+            row.next_attempt_at = datetime.utcnow()
+            row.claimed_by = None
+            row.last_error = None
+        else:
+            row = OutboundEmail(
+                to_email=letter.to_email, subject=letter.subject, html=letter.html,
+                from_header=letter.from_header, reply_to=letter.reply_to,
+                campaign_id=row.campaign_id if row is not None else None,
+            )
+            db.add(row)
+        letter.requeued_at = datetime.utcnow()
+        db.commit()
+        self._ensure_started()
+        self._wake.set()
+        return row.id
+
+    # ── 워커 ──
+
+    def start(self):
+        """서버 시작 시: 중단된 발송 중 항목을 큐로 되돌리고 워커 시작 (남은 메일 발송)
+
+        재배포/재시작 직전에 이 워커(같은 워커 ID)가 잡아 둔 항목은 바로, 다른 워커 것은 선점 시간이 지난 것만.
+        """
+        self._release(previous=True)
+        self._release(stale_minutes=settings.email_claim_timeout_minutes)
+        self._ensure_started()
+
+    def _release(self, stale_minutes: int | None = None, previous: bool = False):
+        """발송 중으로 잡아 둔 항목을 큐로 되돌림 - 기본은 이 프로세스 것,
+        previous면 같은 워커 ID의 이전 프로세스 것, stale_minutes면 오래된 모든 항목"""
+        db = SessionLocal()
+        try:
+            query = db.query(OutboundEmail).filter(OutboundEmail.status == "sending")
+            if previous:
+                query = query.filter(
+                    OutboundEmail.claimed_by.like(f"{self._prefix}-%"), OutboundEmail.claimed_by != self._token,
+                )
+            elif stale_minutes is None:
+                query = query.filter(OutboundEmail.claimed_by == self._token)
+            else:
+                query = query.filter(OutboundEmail.claimed_at < datetime.utcnow() - timedelta(minutes=stale_minutes))
+            query.update({"status": "queued", "claimed_by": None}, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[MAIL-QUEUE] Failed to release claimed emails: {e}")
+        finally:
+            db.close()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="mail-queue", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        last_maintenance = last_release = time.monotonic()
+        while not self._stopping.is_set():
+            try:
+                sent = self.drain_once()
+            except Exception as e:
+                logger.error(f"[MAIL-QUEUE] Batch failed: {e}")
+                self._release()
+                sent = 0
+            if sent:
+                continue
+            self._conn.close_if_idle()
+            if time.monotonic() - last_release > 60:
+                last_release = time.monotonic()
+                self._release(stale_minutes=settings.email_claim_timeout_minutes)  # 중단된 다른 프로세스가 잡아 둔 항목
+            if time.monotonic() - last_maintenance > 3600:
+                last_maintenance = time.monotonic()
+                self._purge_sent()
+            self._wake.wait(self._next_wait)
+            self._wake.clear()
+        self._conn.close()
+
+    def _due_ids(self, db, now: datetime, campaign: bool, limit: int) -> list[str]:
+        query = db.query(OutboundEmail.id).filter(OutboundEmail.status == "queued", OutboundEmail.next_attempt_at <= now)
+        query = query.filter(OutboundEmail.campaign_id.isnot(None) if campaign else OutboundEmail.campaign_id.is_(None))
+        return [row[0] for row in query.order_by(OutboundEmail.next_attempt_at).limit(limit)]
+
+    def _claim(self, db) -> list[OutboundEmail]:
+        """개별 메일 우선, 남는 자리는 대량 발송 메일로 (email_campaign_rate_per_minute 이내)"""
+        now = datetime.utcnow()
+        self._next_wait = settings.email_poll_seconds
+        ids = self._due_ids(db, now, campaign=False, limit=settings.email_batch_size)
+        room = settings.email_batch_size - len(ids)
+        if room > 0:
+            granted = self._campaign_throttle.take(room)
+            if granted:
+                campaign_ids = self._due_ids(db, now, campaign=True, limit=granted)
+                self._campaign_throttle.refund(granted - len(campaign_ids))
+                ids += campaign_ids
+            if granted < room:
+                # 할당량이 차는 대로 다시 확인 (대기 중인 대량 메일이 없으면 빈 조회 한 번)
+                self._next_wait = min(self._next_wait, self._campaign_throttle.seconds_until(room))
+        if not ids:
+            return []
+        # 다른 프로세스가 먼저 가져간 행은 status 조건에서 빠짐
+        db.query(OutboundEmail).filter(OutboundEmail.id.in_(ids), OutboundEmail.status == "queued").update(
+            {"status": "sending", "claimed_by": self._token, "claimed_at": now}, synchronize_session=False,
+        )
+        db.commit()
+        return (
+            db.query(OutboundEmail)
+            .filter(OutboundEmail.id.in_(ids), OutboundEmail.claimed_by == self._token, OutboundEmail.status == "sending")
+            .all()
+        )
+
+    def drain_once(self) -> int:
+        """기한이 된 메일 한 묶음 발송 → 처리 건수"""
+        wait = self._connect_retry_at - time.monotonic()
+        if wait > 0:
+            # SMTP 서버 연결 불가로 대기 중 - 새 메일로 깨워져도 선점하지 않음
+            self._next_wait = wait
+            return 0
+        db = SessionLocal()
+        try:
+            batch = self._claim(db)
+            connection_error: Exception | None = None
+            for i, email in enumerate(batch):
+                try:
+                    self._conn.send(build_message(email))
+                    email.status = "sent"
+                    email.sent_at = datetime.utcnow()
+                    email.attempts += 1
+                    email.last_error = None
+                    self._connect_failures = 0
+                except Exception as e:
+                    if not _is_connection_error(e):
+                        # 이 메일만의 문제 (거부/헤더 오류 등) - smtplib이 RSET 해 두므로 연결은 계속 사용
+                        self._fail(db, email, e, permanent=_is_permanent(e))
+                        continue
+                    connection_error = e
+                    self._conn.close()
+                    if isinstance(e, SMTPUnavailable):
+                        # 서버에 넘기지 못함 - 이 메일까지 시도 횟수 그대로 큐로 되돌리고 워커는 대기
+                        self._unclaim(batch[i:])
+                        self._back_off_connect()
+                    else:
+                        # 전송 중 연결 문제 - 시도한 메일만 실패 처리, 나머지는 시도 횟수 그대로 큐로 되돌림
+                        self._fail(db, email, e)
+                        self._unclaim(batch[i + 1:])
+                    break
+            db.commit()
+            if batch:
+                logger.info(f"[MAIL-QUEUE] Processed {len(batch)} email(s)" + (f", connection error: {connection_error}" if connection_error else ""))
+            return len(batch) if connection_error is None else 0
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _back_off_connect(self):
+        """연속 연결 실패마다 대기 시간 두 배 (email_poll_seconds부터 email_connect_backoff_max_seconds까지)"""
+        self._connect_failures += 1
+        delay = min(
+            settings.email_connect_backoff_max_seconds,
+            settings.email_poll_seconds * 2 ** (self._connect_failures - 1),
+        )
+        self._connect_retry_at = time.monotonic() + delay
+        self._next_wait = delay
+        logger.warning(f"[MAIL-QUEUE] SMTP unavailable ({self._connect_failures} in a row), retry in {delay}s")
+
+    def _unclaim(self, emails: list[OutboundEmail]):
+        """시도하지 않은 메일을 그대로 큐로 (시도 횟수/다음 시도 시각 유지, 대량 발송 할당량 반환)"""
+        for email in emails:
+            email.status = "queued"
+            email.claimed_by = None
+        self._campaign_throttle.refund(sum(1 for email in emails if email.campaign_id))
+
+    def _fail(self, db, email: OutboundEmail, error: Exception, permanent: bool = False):
+        email.attempts += 1
+        email.last_error = str(error)[:2000]
+        email.claimed_by = None
+        if permanent or email.attempts >= settings.email_max_attempts:
+            email.status = "dead"
+            db.add(EmailDeadLetter(
+                email_id=email.id, to_email=email.to_email, subject=email.subject, html=email.html,
+                from_header=email.from_header, reply_to=email.reply_to, attempts=email.attempts, error=email.last_error,
+            ))
+            logger.error(f"[MAIL-QUEUE] Dead-lettered email to {email.to_email}: {error}")
+            return
+        delay = settings.email_retry_base_seconds * 2 ** (email.attempts - 1)
+        email.status = "queued"
+        email.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay + random.uniform(0, settings.email_retry_base_seconds))
+
+    def _purge_sent(self):
+        if settings.email_sent_retention_days <= 0:
+            return
+        db = SessionLocal()
+        try:
+            before = datetime.utcnow() - timedelta(days=settings.email_sent_retention_days)
+            deleted = (
+                db.query(OutboundEmail)
+                .filter(OutboundEmail.status == "sent", OutboundEmail.sent_at < before)
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            if deleted:
+                logger.info(f"[MAIL-QUEUE] Purged {deleted} sent emails")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[MAIL-QUEUE] Purge failed: {e}")
+        finally:
+            db.close()
+
+    def stop(self, timeout: float = 5.0):
+        """서버 종료 시 현재 묶음까지 보내고 워커 종료 (남은 메일은 다음 시작 때 발송)"""
+        if self._thread and self._thread.is_alive():
+            self._stopping.set()
+            self._wake.set()
+            self._thread.join(timeout)
+
+
+mail_queue = MailQueue()
@@ -0,0 +1,109 @@
+"""알림 팬아웃 서비스 - 관리자 전체 알림을 요청 경로 밖(백그라운드 스레드)에서 일괄 생성
+
+- 요청 핸들러는 작업을 큐에 넣기만 하므로 관리자 수와 무관하게 응답 시간 일정
+- 워커는 자체 DB 세션으로 관리자 전원에 대한 알림을 단일 bulk INSERT로 생성
+- 저재고 알림은 부품(재고)별로 low_stock_alert_window_minutes 내 중복 발송 방지
+"""
+import time
+import queue
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class NotificationFanout:
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._recent_keys: dict[str, float] = {}  # {dedupe_key: monotonic time of last enqueue} (오래된 순)
+
+    def submit(self, dedupe_key: str | None = None, **job):
+        """관리자 알림 작업 등록 (dedupe_key가 창 내 중복이면 무시)"""
+        if dedupe_key:
+            window = settings.low_stock_alert_window_minutes * 60
+            now = time.monotonic()
+            with self._lock:
+                last = self._recent_keys.get(dedupe_key)
+                if last is not None and now - last < window:
+                    return
+                # 삽입 순서 = 시간 순서로 유지 → 앞에서부터 창이 지난 키 제거 (키가 무한히 쌓이지 않도록)
+                self._recent_keys.pop(dedupe_key, None)
+                self._recent_keys[dedupe_key] = now
+                while self._recent_keys:
+                    oldest = next(iter(self._recent_keys))
+                    if now - self._recent_keys[oldest] < window:
+                        break
+                    del self._recent_keys[oldest]
+        job["dedupe_key"] = dedupe_key
+
+        if not settings.notification_fanout_async:
+            self._process(job)
+            return
+        self._ensure_started()
+        self._queue.put(job)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="notification-fanout", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            try:
+                self._process(job)
+            except Exception as e:
+                logger.error(f"[FANOUT] Failed to deliver admin notification: {e}")
+
+    def _process(self, job: dict):
+        from app.services.notification_service import notify_admins
+
+        db = SessionLocal()
+        try:
+            if job["dedupe_key"] and job.get("reference_id"):
+                # 다른 워커 프로세스에서 이미 보낸 동일 알림이 있으면 생략
+                since = datetime.now(timezone.utc) - timedelta(minutes=settings.low_stock_alert_window_minutes)
+                exists = (
+                    db.query(Notification.id)
+                    .filter(
+                        Notification.reference_id == job["reference_id"],
+                        Notification.reference_type == job.get("reference_type"),
+                        Notification.title == job["title"],
+                        Notification.created_at >= since,
+                    )
+                    .first()
+                )
+                if exists:
+                    return
+            notify_admins(
+                db,
+                title=job["title"],
+                message=job["message"],
+                type=job.get("type", "info"),
+                reference_id=job.get("reference_id"),
+                reference_type=job.get("reference_type"),
+            )
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def stop(self, timeout: float = 5.0):
+        """서버 종료 시 남은 작업 처리 후 워커 종료"""
+        if self._thread and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+
+fanout = NotificationFanout()
@@ -1,7 +1,108 @@
-"""알림 서비스 - 알림 생성 및 관리"""
+"""알림 서비스 - 알림 생성 및 관리 + 읽지 않은 알림 카운터"""
+import uuid
+from sqlalchemy import insert, update, select, case, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.models.notification import Notification
+from app.database import SessionLocal
+from app.models.notification import Notification, NotificationCounter
 from app.models.user import User
+from app.services.notification_stream_service import broker
+from app.services.notification_fanout_service import fanout
+
+
+# ── 읽지 않은 알림 카운터 ──
+
+_INSERT_IGNORE = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def get_unread_count(db: Session, user_id: str) -> int:
+    """읽지 않은 알림 수 (카운터 행 PK 조회, 최초 1회만 COUNT로 초기화)
+
+    초기화 INSERT는 호출자의 트랜잭션에 포함되며 커밋은 호출자 몫.
+    동시에 첫 조회가 들어와도 충돌 행은 무시하고 먼저 생긴 카운터를 다시 읽음.
+    """
+    counter = db.get(NotificationCounter, user_id)
+    if counter is not None:
+        return counter.unread_count
+    count = (
+        db.query(Notification)
+        .filter(Notification.user_id == user_id, Notification.is_read == False)
+        .count()
+    )
+    values = {"user_id": user_id, "unread_count": count}
+    dialect_insert = _INSERT_IGNORE.get(db.bind.dialect.name)
+    if dialect_insert is not None:
+        db.execute(dialect_insert(NotificationCounter).values(**values).on_conflict_do_nothing(index_elements=["user_id"]))
+    else:
+        try:
+            with db.begin_nested():
+                db.execute(insert(NotificationCounter).values(**values))
+        except IntegrityError:
+            pass
+    counter = db.get(NotificationCounter, user_id)
+    return counter.unread_count if counter is not None else count
+
+
+def _bump_unread(db: Session, user_ids: list[str], delta: int):
+    """카운터 증감, 0 미만으로 내려가지 않음 (카운터가 아직 없는 사용자는 첫 조회 시 COUNT로 초기화되므로 생략)"""
+    if not user_ids:
+        return
+    bumped = NotificationCounter.unread_count + delta
+    db.query(NotificationCounter).filter(NotificationCounter.user_id.in_(user_ids)).update(
+        {NotificationCounter.unread_count: case((bumped < 0, 0), else_=bumped)},
+        synchronize_session=False,
+    )
+
+
+def reconcile_unread_counts(db: Session) -> int:
+    """모든 카운터를 실제 읽지 않은 알림 수로 다시 맞춤 → 바로잡은 카운터 수
+
+    증감 방식은 동시 요청(초기화 COUNT가 아직 커밋 안 된 알림을 못 보는 경우 등)에서 어긋날 수 있으므로
+    주기적으로 실행 (notification_counter_reconcile_minutes).
+    """
+    actual = (
+        select(func.count(Notification.id))
+        .where(Notification.user_id == NotificationCounter.user_id, Notification.is_read == False)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.unread_count != actual)
+        .values(unread_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def run_unread_count_reconcile() -> int:
+    """주기 작업용 - 자체 세션으로 reconcile_unread_counts 실행"""
+    db = SessionLocal()
+    try:
+        return reconcile_unread_counts(db)
+    finally:
+        db.close()
+
+
+def _publish_new(db: Session, notif: Notification):
+    user_id, data = notif.user_id, {
+        "id": notif.id,
+        "title": notif.title,
+        "message": notif.message,
+        "type": notif.type,
+        "reference_id": notif.reference_id,
+        "reference_type": notif.reference_type,
+        "unread_count": get_unread_count(db, notif.user_id),
+    }
+    db.commit()  # 카운터가 방금 초기화됐다면 저장
+    broker.publish(user_id, {"event": "notification", "data": data})
+
+
+def _publish_unread(db: Session, user_id: str):
+    count = get_unread_count(db, user_id)
+    db.commit()  # 카운터가 방금 초기화됐다면 저장
+    broker.publish(user_id, {"event": "unread", "data": {"count": count}})
 
 
 def create_notification(
@@ -23,8 +124,10 @@ def create_notification(
         reference_type=reference_type,
     )
     db.add(notif)
+    _bump_unread(db, [user_id], 1)
     db.commit()
     db.refresh(notif)
+    _publish_new(db, notif)
     return notif
 
 
@@ -36,20 +139,105 @@ def notify_admins(
     reference_id: str = None,
     reference_type: str = None,
 ):
-    """모든 관리자에게 알림 전송"""
-    admins = db.query(User).filter(User.is_admin == True, User.is_active == True).all()
-    for admin in admins:
-        notif = Notification(
-            user_id=admin.id,
-            title=title,
-            message=message,
-            type=type,
-            reference_id=reference_id,
-            reference_type=reference_type,
-        )
-        db.add(notif)
+    """모든 관리자에게 알림 전송 (단일 bulk INSERT + 카운터 일괄 증가)
+
+    요청 핸들러에서는 enqueue_admin_notification()을 사용 (백그라운드 팬아웃).
+    """
+    admin_ids = [
+        row.id for row in
+        db.query(User.id).filter(User.is_admin == True, User.is_active == True).all()
+    ]
+    if not admin_ids:
+        return
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": admin_id,
+            "title": title,
+            "message": message,
+            "type": type,
+            "is_read": False,
+            "reference_id": reference_id,
+            "reference_type": reference_type,
+        }
+        for admin_id in admin_ids
+    ]
+    db.execute(insert(Notification), rows)
+    _bump_unread(db, admin_ids, 1)
     db.commit()
 
+    # SSE 구독자는 연결 시 카운터가 초기화되어 있으므로 카운터 행이 있는 사용자에게만 푸시
+    counts = dict(
+        db.query(NotificationCounter.user_id, NotificationCounter.unread_count)
+        .filter(NotificationCounter.user_id.in_(admin_ids))
+        .all()
+    )
+    for row in rows:
+        if row["user_id"] in counts:
+            broker.publish(row["user_id"], {
+                "event": "notification",
+                "data": {
+                    "id": row["id"],
+                    "title": title,
+                    "message": message,
+                    "type": type,
+                    "reference_id": reference_id,
+                    "reference_type": reference_type,
+                    "unread_count": counts[row["user_id"]],
+                },
+            })
+
+
+def enqueue_admin_notification(
+    title: str,
+    message: str,
+    type: str = "info",
+    reference_id: str = None,
+    reference_type: str = None,
+    dedupe_key: str = None,
+):
+    """관리자 알림을 백그라운드 팬아웃 큐에 등록 (요청 경로에서 즉시 반환)"""
+    fanout.submit(
+        dedupe_key=dedupe_key,
+        title=title,
+        message=message,
+        type=type,
+        reference_id=reference_id,
+        reference_type=reference_type,
+    )
+
+
+def mark_read(db: Session, user_id: str, notification_id: str) -> Notification | None:
+    """알림 1건 읽음 처리 (실제로 읽음으로 바뀐 경우에만 카운터 감소 - 동시 요청이 두 번 빼지 않도록 조건부 UPDATE)"""
+    changed = (
+        db.query(Notification)
+        .filter(Notification.id == notification_id, Notification.user_id == user_id, Notification.is_read == False)
+        .update({Notification.is_read: True}, synchronize_session=False)
+    )
+    if changed == 1:
+        _bump_unread(db, [user_id], -1)
+    db.commit()
+    notif = (
+        db.query(Notification)
+        .filter(Notification.id == notification_id, Notification.user_id == user_id)
+        .first()
+    )
+    if changed == 1:
+        _publish_unread(db, user_id)
+    return notif
+
+
+def mark_all_read(db: Session, user_id: str):
+    """모든 알림 읽음 처리 + 카운터 0으로 초기화"""
+    db.query(Notification).filter(
+        Notification.user_id == user_id, Notification.is_read == False
+    ).update({"is_read": True})
+    db.query(NotificationCounter).filter(NotificationCounter.user_id == user_id).update(
+        {NotificationCounter.unread_count: 0}
+    )
+    db.commit()
+    _publish_unread(db, user_id)
+
 
 def notify_customer_by_email(
     db: Session,
@@ -67,16 +255,15 @@ def notify_customer_by_email(
 
 
 def check_low_stock_notification(
-    db: Session,
     part_name: str,
     new_quantity: int,
     min_quantity: int,
     inventory_id: str,
 ):
-    """재고 부족 시 관리자에게 알림"""
+    """재고 부족 시 관리자에게 알림 (재고별 알림 창 내 중복 제외, 백그라운드 발송)"""
     if new_quantity <= min_quantity:
-        notify_admins(
-            db,
+        enqueue_admin_notification(
+            dedupe_key=f"low_stock:{inventory_id}",
             title="Low Stock Alert",
             message=f"{part_name}: {new_quantity} units remaining (min: {min_quantity})",
             type="warning",
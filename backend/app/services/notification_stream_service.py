@@ -0,0 +1,49 @@
+"""알림 스트림 서비스 - 사용자별 SSE 구독자에게 알림 이벤트 푸시 (프로세스 내 pub/sub)
+
+동기 라우터(스레드풀)에서 publish() 해도 구독자의 이벤트 루프로 안전하게 전달된다.
+워커가 여러 개면 같은 워커의 구독자에게만 즉시 전달되므로,
+스트림 엔드포인트는 주기적으로 카운터를 재조회하여 다른 워커의 변경도 반영한다.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+
+class NotificationBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        with self._lock:
+            self._subscribers[user_id].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        with self._lock:
+            subs = self._subscribers.get(user_id)
+            if not subs:
+                return
+            for entry in list(subs):
+                if entry[1] is queue:
+                    subs.discard(entry)
+            if not subs:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id: str, event: dict):
+        """사용자 구독 큐에 이벤트 전달 (어느 스레드에서든 호출 가능)"""
+        with self._lock:
+            subs = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subs:
+            loop.call_soon_threadsafe(_put_nowait, queue, event)
+
+
+def _put_nowait(queue: asyncio.Queue, event: dict):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        pass  # 느린 클라이언트: 다음 주기 카운터 재조회로 보정
+
+
+broker = NotificationBroker()
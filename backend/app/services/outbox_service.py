@@ -0,0 +1,146 @@
+"""트랜잭션 아웃박스 - 하류 소비자(시트 내보내기, 캐시 무효화, 웹훅 등)용 변경 피드
+
+- 세션 after_flush에서 추적 대상 ORM 변경을 outbox_events에 같은 커넥션/트랜잭션으로 INSERT
+  (커밋되면 변경과 이벤트가 함께 남고, 롤백되면 함께 사라짐)
+- 추적 대상: Part, Inventory, WorkOrder, RunningHours, ServiceOrder, Customer
+- 소비자는 seq 기준으로 페이지를 넘기며 순서대로 처리 (read_events)
+- 주의: query().update()/delete(), bulk_*_mappings 등 ORM 단위 작업을 거치지 않는 변경은 기록되지 않음
+- outbox_retention_days보다 오래된 이벤트는 주기적으로 삭제
+"""
+import enum
+import json
+import logging
+from datetime import date, datetime, timedelta
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.part import Part
+from app.models.inventory import Inventory
+from app.models.work_order import WorkOrder
+from app.models.running_hours import RunningHours
+from app.models.service_order import ServiceOrder
+from app.models.customer import Customer
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_TRACKED = {model: model.__tablename__ for model in (Part, Inventory, WorkOrder, RunningHours, ServiceOrder, Customer)}
+TRACKED_ENTITIES = tuple(_TRACKED.values())
+
+
+def _jsonable(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _snapshot(obj, keys) -> str:
+    return json.dumps({key: _jsonable(getattr(obj, key)) for key in keys}, ensure_ascii=False, default=str)
+
+
+def _column_keys(obj) -> list[str]:
+    return [attr.key for attr in inspect(obj).mapper.column_attrs]
+
+
+@event.listens_for(Session, "after_flush")
+def _write_outbox(session: Session, flush_context):
+    now = datetime.utcnow()
+    rows = []
+    for obj in session.new:
+        entity = _TRACKED.get(type(obj))
+        if entity:
+            rows.append({"entity": entity, "entity_id": obj.id, "op": "insert", "changed": None,
+                         "payload": _snapshot(obj, _column_keys(obj)), "created_at": now})
+    for obj in session.dirty:
+        entity = _TRACKED.get(type(obj))
+        if not entity:
+            continue
+        state = inspect(obj)
+        keys = _column_keys(obj)
+        changed = [key for key in keys if state.attrs[key].history.has_changes()]
+        if changed:  # 관계만 바뀐 경우 제외
+            rows.append({"entity": entity, "entity_id": obj.id, "op": "update", "changed": json.dumps(changed),
+                         "payload": _snapshot(obj, keys), "created_at": now})
+    for obj in session.deleted:
+        entity = _TRACKED.get(type(obj))
+        if entity:
+            # 삭제된 행은 다시 읽을 수 없으므로 로드된 값만 기록
+            loaded = inspect(obj).dict
+            keys = [key for key in _column_keys(obj) if key in loaded]
+            rows.append({"entity": entity, "entity_id": obj.id, "op": "delete", "changed": None,
+                         "payload": _snapshot(obj, keys), "created_at": now})
+    if rows:
+        session.connection().execute(insert(OutboxEvent), rows)
+
+
+def _event_to_dict(e: OutboxEvent) -> dict:
+    return {
+        "seq": e.seq,
+        "entity": e.entity,
+        "entity_id": e.entity_id,
+        "op": e.op,
+        "changed": json.loads(e.changed) if e.changed else None,
+        "payload": json.loads(e.payload),
+        "created_at": e.created_at.isoformat() if e.created_at else None,
+    }
+
+
+def read_events(db: Session, after: int = 0, limit: int = 100, entities: list[str] | None = None) -> dict:
+    """seq > after인 이벤트를 순서대로 → {events, next_after, has_more}
+
+    다음 호출에는 next_after를 그대로 넘기면 됨 (entities로 거른 페이지가 비어도 next_after는 전진).
+    PostgreSQL 시퀀스는 커밋 순서와 다를 수 있어, 번호가 빈 자리가 outbox_visibility_grace_seconds보다
+    최근이면 아직 커밋 중인 트랜잭션일 수 있으므로 그 앞에서 멈춤 (롤백으로 생긴 빈 번호는 유예 후 건너뜀).
+    """
+    rows = (
+        db.query(OutboxEvent)
+        .filter(OutboxEvent.seq > after)
+        .order_by(OutboxEvent.seq)
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    recent = datetime.utcnow() - timedelta(seconds=settings.outbox_visibility_grace_seconds)
+    visible, prev = [], after
+    for row in rows:
+        # 첫 페이지(after=0)도 1번부터 비어 있으면 확인 (보존 기간 삭제로 생긴 빈 자리는 오래된 행이라 통과)
+        if row.seq != prev + 1 and row.created_at > recent:
+            has_more = True
+            break
+        visible.append(row)
+        prev = row.seq
+
+    wanted = set(entities) if entities else None
+    return {
+        "events": [_event_to_dict(e) for e in visible if wanted is None or e.entity in wanted],
+        "next_after": prev,
+        "has_more": has_more,
+    }
+
+
+def latest_seq(db: Session) -> int:
+    """가장 최근 이벤트 번호 (새 소비자가 현재 시점부터 읽을 때)"""
+    row = db.query(OutboxEvent.seq).order_by(OutboxEvent.seq.desc()).first()
+    return row[0] if row else 0
+
+
+def purge_old_events() -> int:
+    """보존 기간이 지난 이벤트 삭제 - 삭제 건수 반환"""
+    db = SessionLocal()
+    try:
+        deleted = (
+            db.query(OutboxEvent)
+            .filter(OutboxEvent.created_at < datetime.utcnow() - timedelta(days=settings.outbox_retention_days))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        if deleted:
+            logger.info(f"[OUTBOX] Purged {deleted} old events")
+        return deleted
+    finally:
+        db.close()
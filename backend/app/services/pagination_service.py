@@ -0,0 +1,74 @@
+"""Keyset(커서) 페이지네이션 서비스 - offset 없이 정렬 키 기준으로 다음 페이지 조회
+
+커서는 마지막 행의 정렬 키 값 (예: (created_at, id))을 base64 JSON으로 인코딩한 불투명 문자열.
+정렬 키의 마지막 컬럼은 반드시 유일해야 한다 (보통 id).
+"""
+import json
+import base64
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, DateTime
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: list) -> str:
+    """정렬 키 값 목록 → 불투명 커서 문자열"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    """커서 문자열 → 정렬 키 값 목록 (잘못된 커서면 400)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor length mismatch")
+        decoded = []
+        for col, value in zip(columns, values):
+            if value is not None and isinstance(col.type, DateTime):
+                value = datetime.fromisoformat(value)
+            decoded.append(value)
+        return decoded
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(columns: list, values: list, descending: bool):
+    """(c1, c2, ...) 가 커서 값 이후인 행 조건 (row-value 비교를 OR/AND로 전개)"""
+    clauses = []
+    for i, col in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        step = col < values[i] if descending else col > values[i]
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def paginate(
+    query: Query,
+    columns: list,
+    limit: int,
+    cursor: str | None = None,
+    skip: int = 0,
+    descending: bool = True,
+) -> tuple[list, str | None]:
+    """정렬 + 커서 필터 + limit 적용 후 (rows, next_cursor) 반환
+
+    cursor가 없으면 기존 호환을 위해 skip(offset)을 사용한다.
+    """
+    order = [c.desc() for c in columns] if descending else [c.asc() for c in columns]
+    query = query.order_by(*order)
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns), descending))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns])
+    return rows, next_cursor
@@ -0,0 +1,144 @@
+"""부품 검색 인덱스 서비스 - 부품명/부품번호/모델/브랜드/분류 통합 랭킹 검색
+
+- PostgreSQL: pg_trgm GIN 표현식 인덱스 (parts 테이블 자체 인덱스라 쓰기 시 자동 동기화)
+- SQLite: FTS5 trigram 가상 테이블 parts_fts (parts INSERT/UPDATE/DELETE 트리거로 동기화)
+- 그 외 / 인덱스 생성 실패: 기존 ILIKE OR 검색으로 폴백 (랭킹 없음)
+"""
+import logging
+from sqlalchemy import text, or_, func, literal, literal_column, String
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models.part import Part
+
+logger = logging.getLogger(__name__)
+
+# 인덱스 생성 결과 ("pg_trgm" | "fts5" | None)
+_backend: str | None = None
+
+_SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS parts_fts USING fts5(
+        part_id UNINDEXED, name, part_number, turbo_model, brand, category,
+        tokenize = 'trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS parts_fts_ai AFTER INSERT ON parts BEGIN
+        INSERT INTO parts_fts (part_id, name, part_number, turbo_model, brand, category)
+        VALUES (new.id, new.name, new.part_number, new.turbo_model, new.brand, new.category);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS parts_fts_ad AFTER DELETE ON parts BEGIN
+        DELETE FROM parts_fts WHERE part_id = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS parts_fts_au AFTER UPDATE ON parts BEGIN
+        DELETE FROM parts_fts WHERE part_id = old.id;
+        INSERT INTO parts_fts (part_id, name, part_number, turbo_model, brand, category)
+        VALUES (new.id, new.name, new.part_number, new.turbo_model, new.brand, new.category);
+    END""",
+]
+
+# PostgreSQL 검색 대상 표현식 (인덱스 표현식과 쿼리 표현식이 동일해야 인덱스 사용)
+_PG_SEARCH_EXPR = "(name || ' ' || part_number || ' ' || turbo_model || ' ' || brand || ' ' || category)"
+
+
+def ensure_search_index(engine: Engine):
+    """앱 시작 시 검색 인덱스 생성 (이미 있으면 유지), 실패하면 ILIKE 폴백"""
+    global _backend
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                for ddl in _SQLITE_DDL:
+                    conn.execute(text(ddl))
+                # 기존 데이터 최초 적재 (인덱스 도입 전 DB)
+                indexed = conn.execute(text("SELECT count(*) FROM parts_fts")).scalar()
+                total = conn.execute(text("SELECT count(*) FROM parts")).scalar()
+                if indexed != total:
+                    conn.execute(text("DELETE FROM parts_fts"))
+                    conn.execute(text(
+                        "INSERT INTO parts_fts (part_id, name, part_number, turbo_model, brand, category) "
+                        "SELECT id, name, part_number, turbo_model, brand, category FROM parts"
+                    ))
+                _backend = "fts5"
+            elif dialect == "postgresql":
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_parts_search_trgm ON parts USING gin ({_PG_SEARCH_EXPR} gin_trgm_ops)"
+                ))
+                _backend = "pg_trgm"
+        logger.info(f"✅ Parts search index ready ({_backend})")
+    except Exception as e:
+        _backend = None
+        logger.warning(f"⚠️ Parts search index unavailable, using ILIKE fallback: {e}")
+
+
+def search_part_ids(
+    db: Session,
+    terms: list[str],
+    limit: int = 15,
+    brand: str | None = None,
+    category: str | None = None,
+) -> list[str]:
+    """검색어 목록과 일치하는 부품 ID를 관련도 순으로 반환 (검색어 간 OR)"""
+    terms = [t.strip() for t in terms if t and t.strip()]
+    if not terms:
+        return []
+
+    if _backend == "fts5":
+        # trigram 토크나이저는 3자 이상만 인덱스 검색 가능, MATCH는 다른 조건과 OR로 묶을 수 없으므로
+        # 짧은 검색어("NR 29"의 "NR")가 하나라도 있으면 모든 검색어를 존중하는 ILIKE로
+        if all(len(t) >= 3 for t in terms):
+            return _search_fts5(db, terms, limit, brand, category)
+    elif _backend == "pg_trgm":
+        return _search_pg_trgm(db, terms, limit, brand, category)
+
+    return _search_ilike(db, terms, limit, brand, category)
+
+
+def _search_fts5(db: Session, terms: list[str], limit: int, brand: str | None, category: str | None) -> list[str]:
+    match = " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+    sql = (
+        "SELECT parts_fts.part_id FROM parts_fts JOIN parts ON parts.id = parts_fts.part_id "
+        "WHERE parts_fts MATCH :match"
+    )
+    params: dict = {"match": match, "limit": limit}
+    if brand:
+        sql += " AND parts.brand = :brand"
+        params["brand"] = brand
+    if category:
+        sql += " AND parts.category = :category"
+        params["category"] = category
+    # 컬럼 가중치: part_id(미색인), name, part_number, turbo_model, brand, category
+    sql += " ORDER BY bm25(parts_fts, 0, 2.0, 3.0, 3.0, 1.0, 1.0) LIMIT :limit"
+    return [row[0] for row in db.execute(text(sql), params)]
+
+
+def _pg_trgm_query(db: Session, terms: list[str], limit: int, brand: str | None, category: str | None):
+    # text()는 연산자(ilike 등)를 지원하지 않으므로 타입이 있는 literal_column으로 표현식 구성
+    expr = literal_column(_PG_SEARCH_EXPR, type_=String)
+    score = sum((func.word_similarity(t, expr) for t in terms), literal(0.0))
+    query = db.query(Part.id).filter(or_(*[expr.ilike(f"%{t}%") for t in terms]))
+    if brand:
+        query = query.filter(Part.brand == brand)
+    if category:
+        query = query.filter(Part.category == category)
+    return query.order_by(score.desc()).limit(limit)
+
+
+def _search_pg_trgm(db: Session, terms: list[str], limit: int, brand: str | None, category: str | None) -> list[str]:
+    return [row.id for row in _pg_trgm_query(db, terms, limit, brand, category).all()]
+
+
+def _search_ilike(db: Session, terms: list[str], limit: int, brand: str | None, category: str | None) -> list[str]:
+    filters = []
+    for t in terms:
+        filters.extend([
+            Part.name.ilike(f"%{t}%"),
+            Part.part_number.ilike(f"%{t}%"),
+            Part.turbo_model.ilike(f"%{t}%"),
+            Part.brand.ilike(f"%{t}%"),
+            Part.category.ilike(f"%{t}%"),
+        ])
+    query = db.query(Part.id).filter(or_(*filters))
+    if brand:
+        query = query.filter(Part.brand == brand)
+    if category:
+        query = query.filter(Part.category == category)
+    return [row.id for row in query.limit(limit).all()]
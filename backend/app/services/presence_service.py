@@ -0,0 +1,93 @@
+"""Presence 서비스 - 온라인 사용자 추적 (로그인/로그아웃/토큰 사용 하트비트)
+
+activity_logs 전체를 집계하지 않고 user_presence 테이블(사용자당 1행)만 갱신/조회한다.
+- 로그인: is_online=True, last_login_at/last_seen_at 갱신
+- 로그아웃: is_online=False
+- 토큰 사용: last_seen_at 갱신 (워커별 인메모리 스로틀로 쓰기 횟수 제한)
+- 만료: last_seen_at 이 presence_timeout_seconds 보다 오래되면 오프라인으로 간주
+"""
+import time
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.user import User
+from app.models.user_presence import UserPresence
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# ── 하트비트 스로틀 (인메모리) ──
+_last_heartbeat: dict[str, float] = {}  # {user_id: monotonic time of last DB write}
+
+
+def _get_or_create(db: Session, user: User) -> UserPresence:
+    presence = db.get(UserPresence, user.id)
+    if presence is None:
+        # 기존 토큰으로 처음 접근한 사용자 → 온라인으로 간주
+        presence = UserPresence(user_id=user.id, user_email=user.email, user_name=user.full_name, is_online=True)
+        db.add(presence)
+    else:
+        presence.user_email = user.email
+        presence.user_name = user.full_name
+    return presence
+
+
+def mark_login(db: Session, user: User):
+    """로그인 시 온라인 상태로 전환"""
+    now = datetime.utcnow()
+    presence = _get_or_create(db, user)
+    presence.is_online = True
+    presence.last_login_at = now
+    presence.last_seen_at = now
+    db.commit()
+    _last_heartbeat[user.id] = time.monotonic()
+
+
+def mark_logout(db: Session, user: User):
+    """로그아웃 시 오프라인 상태로 전환"""
+    presence = _get_or_create(db, user)
+    presence.is_online = False
+    presence.last_logout_at = datetime.utcnow()
+    db.commit()
+    _last_heartbeat.pop(user.id, None)
+
+
+def heartbeat(db: Session, user: User):
+    """토큰 사용 시 last_seen 갱신 (heartbeat_interval 내 중복 쓰기 생략)
+    명시적으로 로그아웃한 사용자는 다시 로그인할 때까지 오프라인 유지
+    """
+    now_mono = time.monotonic()
+    last = _last_heartbeat.get(user.id)
+    if last is not None and now_mono - last < settings.presence_heartbeat_interval_seconds:
+        return
+
+    _last_heartbeat[user.id] = now_mono
+    try:
+        presence = _get_or_create(db, user)
+        presence.last_seen_at = datetime.utcnow()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"[PRESENCE] heartbeat failed for {user.id}: {e}")
+
+
+def get_online_users(db: Session) -> list[dict]:
+    """현재 온라인 사용자 (하트비트 만료 전 + 로그아웃하지 않은 사용자)"""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.presence_timeout_seconds)
+    rows = (
+        db.query(UserPresence)
+        .filter(UserPresence.is_online == True, UserPresence.last_seen_at >= cutoff)
+        .order_by(UserPresence.last_seen_at.desc())
+        .all()
+    )
+    return [
+        {
+            "user_id": p.user_id,
+            "user_email": p.user_email,
+            "user_name": p.user_name,
+            "last_login": p.last_login_at.isoformat() if p.last_login_at else None,
+            "last_seen": p.last_seen_at.isoformat() if p.last_seen_at else None,
+        }
+        for p in rows
+    ]
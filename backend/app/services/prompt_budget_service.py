@@ -0,0 +1,189 @@
+"""프롬프트 크기 관리 - 토큰 예산 안에서 대화 히스토리와 RAG 컨텍스트 블록 구성
+
+- 토큰 수는 로컬 근사치로 추정 (ASCII ~3.5자/토큰, 한글·CJK 등 ~1자/토큰)
+- 컨텍스트 블록은 질문과의 관련도(토큰 겹침) 순으로 채우고, 넘치면 줄 단위로 잘라냄
+- 히스토리는 최근 턴부터 원문 유지, 예산을 넘는 이전 턴은 한 줄 요약으로 축약
+- 요청별 크기는 로그로, 누적 분포는 LLM 지표(/api/chat/metrics)로 노출
+"""
+import re
+import math
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_WORD_RE = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return math.ceil(ascii_chars / 3.5 + (len(text) - ascii_chars))
+
+
+@dataclass
+class PromptStats:
+    budget: int = 0
+    system_tokens: int = 0
+    history_tokens: int = 0
+    context_tokens: int = 0
+    message_tokens: int = 0
+    turns_kept: int = 0
+    turns_summarized: int = 0
+    blocks_truncated: list[str] = field(default_factory=list)
+    blocks_dropped: list[str] = field(default_factory=list)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.system_tokens + self.history_tokens + self.context_tokens + self.message_tokens
+
+
+@dataclass
+class BudgetedPrompt:
+    history: list[dict]
+    history_summary: str
+    blocks: list[str]
+    stats: PromptStats
+
+
+def _relevance(query_words: set[str], text: str) -> float:
+    if not query_words:
+        return 0.0
+    return len(query_words & set(_WORD_RE.findall(text.lower()))) / len(query_words)
+
+
+def _truncate_block(text: str, budget: int) -> str:
+    """첫 줄(제목)은 유지하고 예산 안에 들어가는 줄까지만 남김"""
+    lines = text.split("\n")
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    if len(kept) <= 1:
+        return ""
+    return "\n".join(kept + ["- … (이하 생략)"])
+
+
+def _summarize_turn(turn: dict, length: int = 80) -> str:
+    who = "사용자" if turn.get("role") == "user" else "어시스턴트"
+    text = " ".join(str(turn.get("content", "")).split())
+    return f"- {who}: {text[:length]}{'…' if len(text) > length else ''}"
+
+
+def budget_prompt(
+    message: str,
+    history: list[dict],
+    blocks: list[tuple[str, str]],
+    system: str = "",
+    fixed_text: str = "",
+) -> BudgetedPrompt:
+    """(메시지, 히스토리, [(블록 이름, 텍스트)]) → 예산 안에 맞춘 히스토리/요약/블록
+
+    fixed_text: 규칙 리마인더 등 항상 포함되는 부분 (예산에서 먼저 차감)
+    """
+    budget = settings.chat_prompt_budget_tokens
+    stats = PromptStats(
+        budget=budget,
+        system_tokens=estimate_tokens(system),
+        message_tokens=estimate_tokens(message) + estimate_tokens(fixed_text),
+    )
+    remaining = max(0, budget - stats.message_tokens)
+
+    # 1) 히스토리: 최근 턴부터 히스토리 몫 안에서 원문 유지
+    history_budget = int(remaining * settings.chat_history_budget_ratio)
+    turns = [
+        {"role": h["role"], "content": h["content"]}
+        for h in history[-settings.chat_max_history_turns:]
+        if h.get("role") in ("user", "assistant") and h.get("content")
+    ]
+    kept: list[dict] = []
+    used = 0
+    for turn in reversed(turns):
+        cost = estimate_tokens(turn["content"])
+        if used + cost > history_budget:
+            break
+        kept.insert(0, turn)
+        used += cost
+    # 메시지 목록은 user 턴으로 시작해야 하고, 새 user 메시지가 뒤에 붙으므로 assistant 턴으로 끝나야 함
+    start = len(turns) - len(kept)
+    while kept and kept[0]["role"] != "user":
+        kept.pop(0)
+        start += 1
+    while kept and kept[-1]["role"] != "assistant":
+        kept.pop()  # 응답 없이 끝난 이전 질문
+    used = sum(estimate_tokens(t["content"]) for t in kept)
+    older = turns[:start]
+    summary = ""
+    if older:
+        summary = "[이전 대화 요약]\n" + "\n".join(_summarize_turn(t) for t in older[-6:])
+    stats.turns_kept = len(kept)
+    stats.turns_summarized = len(older)
+    stats.history_tokens = used + estimate_tokens(summary)
+    remaining = max(0, remaining - stats.history_tokens)
+
+    # 2) 컨텍스트 블록: 관련도 순으로 채우고 넘치면 잘라냄 (출력은 원래 순서 유지)
+    query_words = set(_WORD_RE.findall(message.lower()))
+    order = sorted(
+        (i for i, (_, text) in enumerate(blocks) if text),
+        key=lambda i: -_relevance(query_words, blocks[i][1]),
+    )
+    chosen: dict[int, str] = {}
+    for i in order:
+        name, text = blocks[i]
+        cost = estimate_tokens(text)
+        if cost <= remaining:
+            chosen[i] = text
+        else:
+            truncated = _truncate_block(text, remaining)
+            if truncated:
+                chosen[i] = truncated
+                stats.blocks_truncated.append(name)
+                cost = estimate_tokens(truncated)
+            else:
+                stats.blocks_dropped.append(name)
+                continue
+        remaining -= cost
+        stats.context_tokens += cost
+
+    prompt_metrics.record(stats)
+    return BudgetedPrompt(kept, summary, [chosen[i] for i in sorted(chosen)], stats)
+
+
+class _PromptMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: deque[int] = deque(maxlen=500)
+        self.requests = 0
+        self.trimmed = 0
+
+    def record(self, stats: PromptStats):
+        with self._lock:
+            self.requests += 1
+            self._totals.append(stats.total_tokens)
+            if stats.turns_summarized or stats.blocks_truncated or stats.blocks_dropped:
+                self.trimmed += 1
+        logger.info(f"[PROMPT] {asdict(stats) | {'total_tokens': stats.total_tokens}}")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            totals = sorted(self._totals)
+
+            def pct(p: float) -> int | None:
+                return totals[min(len(totals) - 1, int(p * len(totals)))] if totals else None
+
+            return {
+                "requests": self.requests,
+                "trimmed": self.trimmed,
+                "estimated_tokens": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)},
+            }
+
+
+prompt_metrics = _PromptMetrics()
@@ -0,0 +1,93 @@
+"""챗봇 RAG 컨텍스트 캐시 - 정규화된 키 + 테이블별 데이터 버전으로 조립된 컨텍스트 블록 재사용
+
+- 이 프로세스에서 커밋된 ORM 변경은 해당 테이블 버전을 올려 관련 블록을 즉시 무효화
+- 다른 워커의 변경 / 시간에 따라 바뀌는 값(초과 작업 등)은 rag_context_cache_seconds TTL로 반영
+"""
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class DataVersions:
+    """테이블명 → 변경 카운터 (커밋 시 증가)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: dict[str, int] = {}
+
+    def get(self, tables: tuple[str, ...]) -> tuple[int, ...]:
+        return tuple(self._versions.get(t, 0) for t in tables)
+
+    def bump(self, tables: set[str]):
+        with self._lock:
+            for t in tables:
+                self._versions[t] = self._versions.get(t, 0) + 1
+
+
+class ContextCache:
+    """(블록 이름, 정규화 키, 관련 테이블 버전) → 조립된 텍스트 LRU 캐시"""
+
+    def __init__(self, versions: DataVersions):
+        self._versions = versions
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+
+    def get_or_build(self, name: str, key, tables: tuple[str, ...], builder: Callable[[], str]) -> str:
+        cache_key = (name, key, self._versions.get(tables))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry and now - entry[0] < settings.rag_context_cache_seconds:
+                self._entries.move_to_end(cache_key)
+                return entry[1]
+
+        value = builder()
+        with self._lock:
+            self._entries[cache_key] = (now, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > settings.rag_context_cache_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def normalize_query(text: str) -> str:
+    """대소문자/구두점/공백 차이를 없앤 캐시 키용 문자열"""
+    return " ".join(re.sub(r"[^\w/\-]", " ", text.lower()).split())
+
+
+data_versions = DataVersions()
+context_cache = ContextCache(data_versions)
+
+
+# ── 커밋된 ORM 변경 → 테이블 버전 증가 ──
+
+@event.listens_for(Session, "after_flush")
+def _track_changed_tables(session: Session, flush_context):
+    changed = session.info.setdefault("changed_tables", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            changed.add(table)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session: Session):
+    changed = session.info.pop("changed_tables", None)
+    if changed:
+        data_versions.bump(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session):
+    session.info.pop("changed_tables", None)
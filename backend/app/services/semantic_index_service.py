@@ -0,0 +1,403 @@
+"""챗봇 의미 검색 인덱스 - 부품 / 정비계획 / 작업지시서 / 서비스 주문 BM25 벡터 검색
+
+부분 문자열 검색으로는 "bearing wear on our Mitsubishi turbo" 같은 질문이 MHI MET 베어링을
+찾지 못하므로, 토큰화(브랜드 동의어 + 한글 분류 별칭 정규화) 후 BM25 가중치를 미리 계산한
+역색인을 NumPy 배열로 보관하고 top-k를 점수 합산으로 조회한다.
+
+- 저장: semantic_index_dir 아래 .npy (mmap 로드) + meta.json
+  오프라인 빌드: python -m app.services.semantic_index_service
+- 증분 갱신: 이 프로세스에서 커밋된 변경은 즉시, 다른 워커의 변경은
+  semantic_index_refresh_seconds 주기로 updated_at 기준 조회하여 델타 세그먼트에 반영
+- 델타가 semantic_index_delta_max를 넘거나 행 삭제가 감지되면 전체 재빌드
+"""
+import os
+import re
+import json
+import math
+import time
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.part import Part
+from app.models.maintenance_plan import MaintenancePlan
+from app.models.work_order import WorkOrder
+from app.models.service_order import ServiceOrder
+from app.services.catalogue_matcher_service import CATEGORY_ALIASES
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# NumPy (선택적 의존성)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+INDEX_VERSION = 1
+_K1 = 1.2
+_B = 0.75
+
+# ── 토큰화 ──
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[가-힣]+")
+_SPLIT_RE = re.compile(r"[a-z]+|\d+")
+_STOPWORDS = {
+    "a", "an", "the", "of", "on", "in", "to", "for", "and", "or", "is", "are", "our", "my", "with", "we", "do", "you",
+}
+# 제조사 별칭 → 브랜드 토큰
+_SYNONYMS = {
+    "mitsubishi": "mhi", "미쓰비시": "mhi", "미츠비시": "mhi",
+    "kompressorenbau": "kbb", "bannewitz": "kbb",
+    "에이비비": "abb", "네이피어": "napier",
+}
+_KO_CATEGORY_ALIASES = {
+    alias: category.lower().split() for alias, category in CATEGORY_ALIASES.items() if not alias.isascii()
+}
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for tok in _TOKEN_RE.findall(text.lower()):
+        if tok in _STOPWORDS:
+            continue
+        tokens.append(tok)
+        if tok in _SYNONYMS:
+            tokens.append(_SYNONYMS[tok])
+        if tok.isascii():
+            # "met42" → "met", "42" / "nr29s" → "nr", "29", "s"
+            parts = _SPLIT_RE.findall(tok)
+            if len(parts) > 1:
+                tokens.extend(p for p in parts if len(p) > 1)
+        else:
+            # 한글 분류 별칭은 조사가 붙어도 인식 ("베어링이" → bearing)
+            for alias, words in _KO_CATEGORY_ALIASES.items():
+                if tok.startswith(alias):
+                    tokens.extend(words)
+                    break
+    return tokens
+
+
+# ── 색인 대상 문서 ──
+
+def _snippet(text: str | None, length: int = 120) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= length else text[:length] + "…"
+
+
+def _part_doc(p: Part) -> tuple[str, str]:
+    title = f"[부품] {p.name} ({p.part_number}) | {p.brand} {p.turbo_model} | {p.category}"
+    return title, " ".join(filter(None, [p.name, p.part_number, p.brand, p.turbo_model, p.category, p.description]))
+
+
+def _plan_doc(m: MaintenancePlan) -> tuple[str, str]:
+    title = f"[정비계획] {m.title}" + (f" - {_snippet(m.description)}" if m.description else "")
+    return title, " ".join(filter(None, [m.title, m.description, m.spare_parts]))
+
+
+def _work_order_doc(w: WorkOrder) -> tuple[str, str]:
+    title = f"[작업지시서] [{w.status}] {w.title}" + (f" - 비고: {_snippet(w.remarks)}" if w.remarks else "")
+    return title, " ".join(filter(None, [w.title, w.description, w.remarks]))
+
+
+def _service_order_doc(o: ServiceOrder) -> tuple[str, str]:
+    title = (
+        f"[서비스주문] [{o.status}] {o.order_type} | {o.turbo_brand} {o.turbo_model}"
+        f"{' | 선박: ' + o.vessel_name if o.vessel_name else ''}"
+        + (f" - {_snippet(o.description)}" if o.description else "")
+    )
+    return title, " ".join(filter(None, [o.order_type, o.turbo_brand, o.turbo_model, o.vessel_name, o.description]))
+
+
+_SOURCES = {
+    "parts": (Part, _part_doc),
+    "maintenance_plans": (MaintenancePlan, _plan_doc),
+    "work_orders": (WorkOrder, _work_order_doc),
+    "service_orders": (ServiceOrder, _service_order_doc),
+}
+
+
+class _Segment:
+    """불변 기본 세그먼트: 단어별 (문서 인덱스, BM25 가중치) 역색인"""
+
+    def __init__(self, keys, titles, vocab, df, indptr, docs, weights, avgdl, built_at):
+        self.keys: list[str] = keys
+        self.titles: list[str] = titles
+        self.key_pos = {k: i for i, k in enumerate(keys)}
+        self.vocab: dict[str, int] = vocab
+        self.df = df
+        self.indptr = indptr
+        self.docs = docs
+        self.weights = weights
+        self.avgdl: float = avgdl
+        self.built_at: datetime = built_at
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.keys)
+
+    def idf(self, term: str) -> float:
+        tid = self.vocab.get(term)
+        df = int(self.df[tid]) if tid is not None else 0
+        return math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def scores(self, terms: set[str]):
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for term in terms:
+            tid = self.vocab.get(term)
+            if tid is None:
+                continue
+            start, end = self.indptr[tid], self.indptr[tid + 1]
+            scores[self.docs[start:end]] += self.weights[start:end]
+        return scores
+
+    @classmethod
+    def build(cls, docs: list[tuple[str, str, Counter]], built_at: datetime) -> "_Segment":
+        keys = [d[0] for d in docs]
+        titles = [d[1] for d in docs]
+        lengths = [sum(d[2].values()) for d in docs]
+        avgdl = (sum(lengths) / len(lengths)) if lengths else 1.0
+
+        postings: dict[str, list[tuple[int, float]]] = {}
+        for i, (_, _, tf) in enumerate(docs):
+            norm = _K1 * (1 - _B + _B * lengths[i] / avgdl)
+            for term, count in tf.items():
+                postings.setdefault(term, []).append((i, count * (_K1 + 1) / (count + norm)))
+
+        n = len(docs)
+        vocab = {term: tid for tid, term in enumerate(postings)}
+        df = np.array([len(postings[t]) for t in vocab], dtype=np.int32)
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        doc_idx, weights = [], []
+        for tid, term in enumerate(vocab):
+            idf = math.log(1 + (n - df[tid] + 0.5) / (df[tid] + 0.5))
+            for i, w in postings[term]:
+                doc_idx.append(i)
+                weights.append(idf * w)
+            indptr[tid + 1] = len(doc_idx)
+        return cls(
+            keys, titles, vocab, df, indptr,
+            np.array(doc_idx, dtype=np.int32), np.array(weights, dtype=np.float32),
+            avgdl, built_at,
+        )
+
+    def save(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {"df": self.df, "indptr": self.indptr, "docs": self.docs, "weights": self.weights}
+        for name, arr in arrays.items():
+            tmp = directory / f"{name}.tmp.npy"
+            np.save(tmp, arr)
+            os.replace(tmp, directory / f"{name}.npy")
+        meta = {
+            "version": INDEX_VERSION,
+            "built_at": self.built_at.isoformat(),
+            "avgdl": self.avgdl,
+            "keys": self.keys,
+            "titles": self.titles,
+            "vocab": list(self.vocab),
+        }
+        tmp = directory / "meta.tmp.json"
+        tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, directory / "meta.json")
+
+    @classmethod
+    def load(cls, directory: Path) -> "_Segment | None":
+        meta_file = directory / "meta.json"
+        if not meta_file.exists():
+            return None
+        meta = json.loads(meta_file.read_text(encoding="utf-8"))
+        if meta.get("version") != INDEX_VERSION:
+            return None
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in ("df", "indptr", "docs", "weights")}
+        return cls(
+            meta["keys"], meta["titles"], {t: i for i, t in enumerate(meta["vocab"])},
+            arrays["df"], arrays["indptr"], arrays["docs"], arrays["weights"],
+            meta["avgdl"], datetime.fromisoformat(meta["built_at"]),
+        )
+
+
+class SemanticIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._segment: _Segment | None = None
+        self._delta: dict[str, tuple[str, Counter]] = {}  # 기본 세그먼트 이후 추가/수정된 문서
+        self._deleted: set[str] = set()
+        self._pending: set[tuple[str, str]] = set()        # 이 프로세스에서 커밋된 (table, id)
+        self._synced_at: datetime | None = None              # 다른 워커 변경 조회 기준 시각
+        self._checked_at = 0.0
+
+    def add_pending(self, keys: set[tuple[str, str]]):
+        with self._lock:
+            self._pending |= keys
+
+    def search(self, db: Session, query: str, top_k: int = 5) -> list[tuple[str, str, float]]:
+        """질문과 관련된 문서 top-k: [(key, title, score)]"""
+        if not NUMPY_AVAILABLE:
+            return []
+        self._ensure_fresh(db)
+        terms = set(tokenize(query))
+        with self._lock:
+            # 갱신 중인 스레드와 경합하지 않도록 잠금 하에 스냅샷
+            segment, delta, deleted = self._segment, dict(self._delta), set(self._deleted)
+        if not terms or segment is None:
+            return []
+
+        results: list[tuple[str, str, float]] = []
+        scores = segment.scores(terms)
+        masked = [segment.key_pos[k] for k in (*delta, *deleted) if k in segment.key_pos]
+        if masked:
+            scores[masked] = 0
+        if segment.n_docs:
+            k = min(top_k, segment.n_docs)
+            top = np.argpartition(-scores, k - 1)[:k]
+            results.extend((segment.keys[i], segment.titles[i], float(scores[i])) for i in top if scores[i] > 0)
+
+        # 델타 문서는 기본 세그먼트 통계(idf, 평균 길이)로 채점
+        for key, (title, tf) in delta.items():
+            dl = sum(tf.values())
+            norm = _K1 * (1 - _B + _B * dl / segment.avgdl)
+            score = sum(segment.idf(t) * tf[t] * (_K1 + 1) / (tf[t] + norm) for t in terms if t in tf)
+            if score > 0:
+                results.append((key, title, score))
+
+        results.sort(key=lambda r: -r[2])
+        return results[:top_k]
+
+    # ── 갱신 ──
+
+    def _ensure_fresh(self, db: Session):
+        now = time.monotonic()
+        if self._segment is not None and not self._pending and \
+                now - self._checked_at < settings.semantic_index_refresh_seconds:
+            return
+        with self._lock:
+            if self._segment is None:
+                self._segment = _Segment.load(Path(settings.semantic_index_dir))
+                if self._segment is None:
+                    self._rebuild(db)
+                    return
+                # 디스크 인덱스 빌드 이후 변경분은 아래 주기 동기화로 반영
+                self._synced_at = self._segment.built_at
+                self._checked_at = 0.0
+
+            pending, self._pending = self._pending, set()
+            for table, row_id in pending:
+                self._apply(db, table, row_id)
+
+            if now - self._checked_at >= settings.semantic_index_refresh_seconds:
+                if not self._sync_other_workers(db):
+                    self._rebuild(db)
+                    return
+                self._checked_at = now
+
+            if len(self._delta) + len(self._deleted) > settings.semantic_index_delta_max:
+                self._rebuild(db)
+
+    def _apply(self, db: Session, table: str, row_id: str):
+        model, to_doc = _SOURCES[table]
+        key = f"{table}:{row_id}"
+        row = db.get(model, row_id)
+        if row is None:
+            self._delta.pop(key, None)
+            self._deleted.add(key)
+            return
+        title, text = to_doc(row)
+        self._delta[key] = (title, Counter(tokenize(text)))
+        self._deleted.discard(key)
+
+    def _sync_other_workers(self, db: Session) -> bool:
+        """updated_at 기준 변경분을 델타에 반영, 행 수가 맞지 않으면(삭제) False"""
+        synced_at = datetime.utcnow()
+        since = (self._synced_at or synced_at) - timedelta(seconds=1)
+        live = {k for k in self._segment.keys if k not in self._deleted} | set(self._delta)
+        for table, (model, _) in _SOURCES.items():
+            for (row_id,) in db.query(model.id).filter(model.updated_at >= since).all():
+                self._apply(db, table, row_id)
+                live.add(f"{table}:{row_id}")
+            expected = sum(1 for k in live if k.startswith(f"{table}:"))
+            if db.query(func.count(model.id)).scalar() != expected:
+                return False
+        self._synced_at = synced_at
+        return True
+
+    def _rebuild(self, db: Session):
+        built_at = datetime.utcnow()
+        segment = _Segment.build(_load_documents(db), built_at)
+        try:
+            segment.save(Path(settings.semantic_index_dir))
+        except OSError as e:
+            logger.warning(f"[SEMANTIC] Index save failed (memory only): {e}")
+        self._segment = segment
+        self._delta.clear()
+        self._deleted.clear()
+        self._synced_at = built_at
+        self._checked_at = time.monotonic()
+        logger.info(f"[SEMANTIC] Index built: {segment.n_docs} docs, {len(segment.vocab)} terms")
+
+
+def _load_documents(db: Session) -> list[tuple[str, str, Counter]]:
+    docs = []
+    for table, (model, to_doc) in _SOURCES.items():
+        for row in db.query(model).yield_per(500):
+            title, text = to_doc(row)
+            docs.append((f"{table}:{row.id}", title, Counter(tokenize(text))))
+    return docs
+
+
+semantic_index = SemanticIndex()
+
+
+def get_semantic_context(db: Session, query: str, top_k: int = 5) -> str:
+    """의미 검색 결과 컨텍스트 블록 (정확 일치 조회를 보완)"""
+    try:
+        hits = semantic_index.search(db, query, top_k=top_k)
+    except Exception as e:
+        logger.error(f"[SEMANTIC] Search failed: {e}")
+        return ""
+    if not hits:
+        return ""
+    lines = ["## 🔎 유사 기록 (의미 검색 결과)"]
+    lines.extend(f"- {title}" for _, title, _ in hits)
+    return "\n".join(lines)
+
+
+# ── 이 프로세스에서 커밋된 색인 대상 변경 → 다음 검색 시 델타 반영 ──
+
+_TRACKED = {model: table for table, (model, _) in _SOURCES.items()}
+
+
+@event.listens_for(Session, "after_flush")
+def _track_indexed_changes(session: Session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = _TRACKED.get(type(obj))
+        if table:
+            session.info.setdefault("semantic_changes", set()).add((table, obj.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_on_commit(session: Session):
+    changes = session.info.pop("semantic_changes", None)
+    if changes:
+        semantic_index.add_pending(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session):
+    session.info.pop("semantic_changes", None)
+
+
+if __name__ == "__main__":
+    # 오프라인 빌드: 현재 DB 전체로 인덱스 파일 생성
+    from app.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    _db = SessionLocal()
+    try:
+        with semantic_index._lock:
+            semantic_index._rebuild(_db)
+    finally:
+        _db.close()
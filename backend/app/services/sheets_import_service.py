@@ -0,0 +1,206 @@
+"""Google Sheets → DB 가져오기 - 본사/육상 사무소가 시트에서 고친 재고·단가를 DB에 반영
+
+- "Parts & Inventory" 시트를 범위 1회 조회(UNFORMATTED_VALUE)로 읽음
+- 행 내용 해시를 마지막 내보내기 해시(sheet_row_index)와 비교해 시트에서 바뀐 행만 골라냄
+- 같은 행의 DB 값도 마지막 내보내기 이후 바뀌었으면 충돌:
+  google_sheets_import_conflict_policy = flag(충돌 기록, 적용 안 함) / sheet(시트 우선) / db(DB 우선)
+  (시트에는 행별 수정 시각이 없어 시간 기준 last-writer-wins 대신 정책으로 결정)
+- 편집 가능 열: Unit Price, Quantity, Min Qty, Warehouse - 나머지 열 편집은 다음 내보내기에서 DB 값으로 복원
+- 적용은 500행 단위 IN 조회 + 한 번의 flush (부품/재고 ORM 이벤트·저재고 알림 그대로 동작)
+- 인덱스가 예전 해시 방식이면 시트/DB 어느 쪽이 바뀌었는지 알 수 없으므로 가져오지 않음 (다음 내보내기가 전체 재작성)
+"""
+import json
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Callable
+from sqlalchemy.orm import Session, joinedload
+from app.config import get_settings
+from app.models.part import Part
+from app.models.inventory import Inventory
+from app.models.sheet_sync import SheetRowIndex, SheetSyncConflict
+from app.services.google_sheets_service import SHEETS, _call, _col_letter, _row_hash, _open_spreadsheet, index_is_current
+from app.services.notification_service import check_low_stock_notification
+
+logger = logging.getLogger("uvicorn.error")
+
+PARTS_SPEC = SHEETS["parts"]
+_COLUMNS = {
+    "unit_price": PARTS_SPEC.headers.index("Unit Price (USD)"),
+    "quantity": PARTS_SPEC.headers.index("Quantity"),
+    "min_quantity": PARTS_SPEC.headers.index("Min Qty"),
+    "warehouse": PARTS_SPEC.headers.index("Warehouse"),
+}
+_CHUNK = 500
+
+
+def _number(value, cast):
+    # 빈 칸은 잘못된 값 (단가도 NOT NULL - None을 반영하면 가져오기 전체가 롤백됨)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        raise ValueError("blank")
+    number = cast(float(str(value).replace(",", "")))
+    if number < 0:
+        raise ValueError("negative")
+    return number
+
+
+def _editable_values(row: list) -> dict:
+    """시트/내보내기 행 → 편집 가능 필드 (형식이 잘못되면 ValueError)"""
+    return {
+        "unit_price": _number(row[_COLUMNS["unit_price"]], float),
+        "quantity": _number(row[_COLUMNS["quantity"]], int),
+        "min_quantity": _number(row[_COLUMNS["min_quantity"]], int),
+        "warehouse": str(row[_COLUMNS["warehouse"]] or "").strip(),
+    }
+
+
+def _apply_values(db: Session, values_by_id: dict[str, dict]) -> list[Inventory]:
+    """부품 ID → 편집 필드 일괄 반영 (재고 행이 없으면 생성), 저재고가 된 재고 목록 반환"""
+    low_stock: list[Inventory] = []
+    ids = list(values_by_id)
+    for i in range(0, len(ids), _CHUNK):
+        parts = (
+            db.query(Part)
+            .options(joinedload(Part.inventory))
+            .filter(Part.id.in_(ids[i:i + _CHUNK]))
+            .all()
+        )
+        for part in parts:
+            values = values_by_id[part.id]
+            if part.unit_price != values["unit_price"]:
+                part.unit_price = values["unit_price"]
+            inv = part.inventory
+            if inv is None:
+                inv = Inventory(part_id=part.id)
+                db.add(inv)
+                part.inventory = inv
+            old_qty = inv.quantity
+            inv.quantity = values["quantity"]
+            inv.min_quantity = values["min_quantity"]
+            if values["warehouse"]:
+                inv.warehouse = values["warehouse"]
+            if inv.quantity <= inv.min_quantity and inv.quantity != old_qty:
+                low_stock.append(inv)
+    return low_stock
+
+
+def import_parts_sheet(db: Session, spreadsheet, policy: str | None = None) -> dict:
+    """시트에서 바뀐 행을 DB에 반영 → 건수 통계"""
+    policy = policy or get_settings().google_sheets_import_conflict_policy
+    title, width = PARTS_SPEC.title, len(PARTS_SPEC.headers)
+    if not index_is_current(db, title):
+        # 예전 해시와는 모든 행이 달라 보여 거짓 충돌/오래된 시트 값 덮어쓰기가 생김
+        logger.warning("Google Sheets import skipped: row index predates the current hash format, run a full export first")
+        return {"read": 0, "index_outdated": 1}
+    quoted = title.replace("'", "''")
+    response = _call(
+        spreadsheet.values_batch_get,
+        [f"'{quoted}'!A2:{_col_letter(width)}"],
+        params={"valueRenderOption": "UNFORMATTED_VALUE"},
+    )
+    raw_rows = (response.get("valueRanges") or [{}])[0].get("values", [])
+
+    index = {
+        key: digest
+        for key, digest in db.query(SheetRowIndex.row_key, SheetRowIndex.row_hash).filter(SheetRowIndex.sheet == title)
+    }
+    stats = Counter(read=len(raw_rows))
+    edited: dict[str, tuple[str, dict]] = {}  # 행 키 → (시트 행 해시, 편집 필드)
+    for raw in raw_rows:
+        row = (list(raw) + [""] * width)[:width]
+        key = str(row[-1]).strip()
+        if not key or key not in index:
+            stats["skipped"] += 1  # 시트에서 직접 추가한 행 / 아직 내보내지 않은 행
+            continue
+        sheet_hash = _row_hash(row)
+        if sheet_hash == index[key]:
+            stats["unchanged"] += 1
+            continue
+        try:
+            edited[key] = (sheet_hash, _editable_values(row))
+        except (TypeError, ValueError):
+            stats["invalid"] += 1
+
+    if not edited:
+        return dict(stats)
+
+    current = {key: row for key, row in PARTS_SPEC.rows(db) if key in edited}
+    to_apply: dict[str, dict] = {}
+    index_updates: list[dict] = []
+    open_conflicts = {
+        c.row_key: c
+        for c in db.query(SheetSyncConflict).filter(
+            SheetSyncConflict.sheet == title, SheetSyncConflict.status == "open",
+        )
+    }
+    for key, (sheet_hash, values) in edited.items():
+        db_row = current.get(key)
+        if db_row is None:
+            stats["skipped"] += 1  # DB에서 삭제된 부품
+            continue
+        db_values = _editable_values(db_row)
+        db_changed = _row_hash(db_row) != index[key]
+        if values == db_values:
+            stats["unchanged"] += 1
+        elif db_changed and policy == "db":
+            stats["conflicts_db_wins"] += 1
+            continue  # 다음 내보내기에서 DB 값으로 덮어씀
+        elif db_changed and policy != "sheet":
+            conflict = open_conflicts.get(key) or SheetSyncConflict(sheet=title, row_key=key)
+            conflict.sheet_values = json.dumps(values)
+            conflict.db_values = json.dumps(db_values)
+            conflict.detected_at = datetime.utcnow()
+            db.add(conflict)
+            stats["conflicts"] += 1
+            continue
+        else:
+            to_apply[key] = values
+            stats["applied"] += 1
+            if db_changed:
+                stats["conflicts_sheet_wins"] += 1
+        # 시트 해시로 기록해 두면 다음 내보내기에서 DB 값(재계산된 Low Stock 등)으로 행을 다시 씀
+        index_updates.append({"sheet": title, "row_key": key, "row_hash": sheet_hash})
+
+    try:
+        low_stock = _apply_values(db, to_apply)
+        if index_updates:
+            db.bulk_update_mappings(SheetRowIndex, index_updates)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for inv in low_stock:
+        check_low_stock_notification(inv.part.name, inv.quantity, inv.min_quantity, inv.id)
+    logger.info(f"Google Sheets import completed: {dict(stats)}")
+    return dict(stats)
+
+
+def resolve_conflict(db: Session, conflict: SheetSyncConflict, use: str):
+    """충돌 해결 - sheet: 시트 값을 DB에 반영(다음 내보내기로 시트도 정리) / db: DB 값 유지"""
+    if use == "sheet":
+        low_stock = _apply_values(db, {conflict.row_key: json.loads(conflict.sheet_values)})
+    else:
+        low_stock = []
+    conflict.status = f"resolved_{use}"
+    conflict.resolved_at = datetime.utcnow()
+    db.commit()
+    for inv in low_stock:
+        check_low_stock_notification(inv.part.name, inv.quantity, inv.min_quantity, inv.id)
+
+
+def import_all(
+    db: Session, credentials_file: str, spreadsheet_id: str,
+    on_progress: Callable[[str, dict], None] | None = None,
+) -> dict:
+    """시트 편집 가져오기 (백그라운드 작업용)"""
+    if not credentials_file or not spreadsheet_id:
+        raise ValueError("Google Sheets credentials file and spreadsheet ID are required. Set GOOGLE_SHEETS_CREDENTIALS_FILE and GOOGLE_SHEETS_SPREADSHEET_ID in .env")
+
+    spreadsheet = _open_spreadsheet(credentials_file, spreadsheet_id)
+    if on_progress:
+        on_progress("parts", {"status": "running"})
+    stats = import_parts_sheet(db, spreadsheet)
+    if on_progress:
+        on_progress("parts", {"status": "done", **stats})
+    return {"parts": stats, "synced_at": datetime.utcnow().isoformat()}
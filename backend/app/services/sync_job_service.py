@@ -0,0 +1,193 @@
+"""Google Sheets 동기화 백그라운드 작업 - 요청은 작업 ID만 받고 즉시 반환
+
+- 작업 종류: sheets_sync (DB → 시트 내보내기), sheets_import (시트 편집 → DB 가져오기)
+- 작업은 sync_jobs 테이블에 기록 (대기/실행/성공/실패, 시트별 진행률, 오류)
+- 프로세스 내 큐 + 워커 스레드 1개가 순서대로 실행
+- 같은 종류의 대기/실행 중인 작업이 있으면 새 작업을 만들지 않고 그 작업을 반환 (다른 워커 프로세스 포함, DB 기준)
+- 하트비트가 google_sheets_job_stale_minutes보다 오래된 작업은 중단된 것으로 보고 실패 처리
+- google_sheets_sync_interval_minutes > 0이면 lifespan 루프가 주기적으로 작업 등록
+"""
+import json
+import queue
+import logging
+import threading
+from datetime import datetime, timedelta
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.sync_job import SyncJob
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def job_to_dict(job: SyncJob) -> dict:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "trigger": job.trigger,
+        "full": job.full,
+        "requested_by": job.requested_by,
+        "progress": json.loads(job.progress or "{}"),
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def _stale_before() -> datetime:
+    return datetime.utcnow() - timedelta(minutes=settings.google_sheets_job_stale_minutes)
+
+
+class SheetsSyncJobs:
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self, full: bool = False, trigger: str = "manual", requested_by: str | None = None, kind: str = "sheets_sync",
+    ) -> tuple[dict, bool]:
+        """작업 등록 → (작업, 기존 작업 재사용 여부)"""
+        with self._lock:
+            db = SessionLocal()
+            try:
+                self._fail_stale(db)
+                active = (
+                    db.query(SyncJob)
+                    .filter(SyncJob.kind == kind, SyncJob.status.in_(ACTIVE_STATUSES))
+                    .order_by(SyncJob.created_at)
+                    .first()
+                )
+                if active:
+                    # 아직 시작 전이면 전체 재작성 요청을 합침 (실행 중이면 그대로 반환)
+                    if full and not active.full and active.status == "queued":
+                        active.full = True
+                        db.commit()
+                    return job_to_dict(active), True
+
+                job = SyncJob(kind=kind, trigger=trigger, full=full, requested_by=requested_by)
+                db.add(job)
+                db.commit()
+                data = job_to_dict(job)
+            finally:
+                db.close()
+
+        self._ensure_started()
+        self._queue.put(data["id"])
+        return data, False
+
+    def get(self, job_id: str) -> dict | None:
+        db = SessionLocal()
+        try:
+            job = db.get(SyncJob, job_id)
+            return job_to_dict(job) if job else None
+        finally:
+            db.close()
+
+    def recent(self, limit: int = 20) -> list[dict]:
+        db = SessionLocal()
+        try:
+            jobs = db.query(SyncJob).order_by(SyncJob.created_at.desc()).limit(limit).all()
+            return [job_to_dict(j) for j in jobs]
+        finally:
+            db.close()
+
+    def _fail_stale(self, db):
+        stale = (
+            db.query(SyncJob)
+            .filter(SyncJob.status.in_(ACTIVE_STATUSES), SyncJob.heartbeat_at < _stale_before())
+            .all()
+        )
+        for job in stale:
+            job.status = "failed"
+            job.error = "Interrupted (no heartbeat)"
+            job.finished_at = datetime.utcnow()
+        if stale:
+            db.commit()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sheets-sync-jobs", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                break
+            try:
+                self._process(job_id)
+            except Exception as e:
+                logger.error(f"[SYNC-JOB] Job {job_id} crashed: {e}")
+
+    def _process(self, job_id: str):
+        from app.services.google_sheets_service import sync_all
+        from app.services.sheets_import_service import import_all
+
+        job_db = SessionLocal()  # 작업 기록용 (동기화 세션의 롤백과 분리)
+        db = SessionLocal()
+        try:
+            job = job_db.get(SyncJob, job_id)
+            if job is None or job.status != "queued":
+                return
+            job.status = "running"
+            job.started_at = job.heartbeat_at = datetime.utcnow()
+            job_db.commit()
+            progress: dict[str, dict] = {}
+
+            def on_progress(sheet: str, info: dict):
+                progress[sheet] = info
+                job.progress = json.dumps(progress)
+                job.heartbeat_at = datetime.utcnow()
+                job_db.commit()
+
+            try:
+                if job.kind == "sheets_import":
+                    result = import_all(
+                        db=db,
+                        credentials_file=settings.google_sheets_credentials_file,
+                        spreadsheet_id=settings.google_sheets_spreadsheet_id,
+                        on_progress=on_progress,
+                    )
+                else:
+                    result = sync_all(
+                        db=db,
+                        credentials_file=settings.google_sheets_credentials_file,
+                        spreadsheet_id=settings.google_sheets_spreadsheet_id,
+                        full=job.full,
+                        on_progress=on_progress,
+                    )
+                job.status = "succeeded"
+                progress["synced_at"] = result["synced_at"]
+                job.progress = json.dumps(progress)
+            except Exception as e:
+                logger.error(f"[SYNC-JOB] Google Sheets {job.kind} failed: {e}")
+                job.status = "failed"
+                job.error = str(e)
+            job.finished_at = job.heartbeat_at = datetime.utcnow()
+            job_db.commit()
+        finally:
+            db.close()
+            job_db.close()
+
+    def recover(self):
+        """서버 시작 시 하트비트가 끊긴 작업 정리"""
+        db = SessionLocal()
+        try:
+            self._fail_stale(db)
+        finally:
+            db.close()
+
+    def stop(self, timeout: float = 5.0):
+        """서버 종료 시 워커 종료 (실행 중인 동기화는 최대 timeout초 대기)"""
+        if self._thread and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+
+sheets_sync_jobs = SheetsSyncJobs()
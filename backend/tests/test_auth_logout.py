@@ -0,0 +1,17 @@
+"""로그아웃 - 접속 상태(presence) 기록 실패가 로그아웃을 막지 않아야 함"""
+from types import SimpleNamespace
+from app.models.user import User
+from app.routers import auth as auth_router
+
+
+def test_logout_survives_presence_failure(db, monkeypatch):
+    user = User(id="u1", email="u1@x.com", hashed_password="x", full_name="U1")
+    db.add(user)
+    db.commit()
+
+    def broken_mark_logout(db, user):
+        raise RuntimeError("presence insert race")
+
+    monkeypatch.setattr(auth_router, "mark_logout", broken_mark_logout)
+    request = SimpleNamespace(client=SimpleNamespace(host="127.0.0.1"), headers={"user-agent": "pytest"})
+    assert auth_router.logout(request, user=user, db=db) == {"message": "Logged out successfully"}
@@ -0,0 +1,27 @@
+"""부품 카탈로그 매처 - 별칭/부품번호 인식과 인덱스 교체"""
+from app.models.part import Part
+from app.services.catalogue_matcher_service import CatalogueMatcher
+
+
+def _seed(db):
+    db.add_all([
+        Part(id="p-seal", part_number="SL-100", name="Seal kit", brand="MAN", turbo_model="NR29/S", category="Seal"),
+        Part(id="p-brg", part_number="BR-200", name="Bearing", brand="ABB", turbo_model="TPL65", category="Bearing"),
+    ])
+    db.commit()
+
+
+def test_single_character_korean_alias_matches(db):
+    _seed(db)
+    matcher = CatalogueMatcher()
+    assert matcher.match(db, "씰 재고 있나요?") == ["p-seal"]
+    assert matcher.match(db, "TPL65 베어링") == ["p-brg"]
+
+
+def test_index_published_as_single_pair(db):
+    _seed(db)
+    matcher = CatalogueMatcher()
+    matcher.match(db, "sl-100")
+    automaton, targets = matcher._index
+    assert len(automaton.patterns) == len(targets)
+    assert isinstance(targets, tuple)
@@ -0,0 +1,28 @@
+"""챗봇 요청 제한 키 - 신뢰 프록시 뒤에서는 X-Forwarded-For의 실제 클라이언트 IP를 사용"""
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+from app.routers.chatbot import _user_key
+
+
+def _client(trusted: str) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/key")
+    def key(request: Request):
+        return {"key": _user_key(request)}
+
+    return TestClient(ProxyHeadersMiddleware(app, trusted_hosts=trusted))
+
+
+def test_forwarded_client_ip_from_trusted_proxy():
+    client = _client("testclient")
+    # 클라이언트가 위조한 주소(왼쪽)가 아니라 신뢰 프록시가 덧붙인 주소를 사용
+    headers = {"X-Forwarded-For": "1.1.1.1, 203.0.113.7"}
+    assert client.get("/key", headers=headers).json() == {"key": "ip:203.0.113.7"}
+
+
+def test_forwarded_header_ignored_from_untrusted_peer():
+    client = _client("10.0.0.0/8")
+    headers = {"X-Forwarded-For": "203.0.113.7"}
+    assert client.get("/key", headers=headers).json() == {"key": "ip:testclient"}
@@ -0,0 +1,28 @@
+"""대량 발송 - 수신자별 값은 본문에서 HTML 이스케이프, 제목에서 줄바꿈 제거, 주소는 EmailStr 검증"""
+from app.models.outbound_email import OutboundEmail
+from app.models.user import User
+from app.services import email_campaign_service
+from app.services.email_campaign_service import create_campaign
+
+
+def test_recipient_values_are_sanitized(db, monkeypatch):
+    monkeypatch.setattr(email_campaign_service.mail_queue, "wake", lambda: None)
+    sender = User(id="admin", email="admin@x.com", hashed_password="x", full_name="Admin")
+    db.add(sender)
+    db.commit()
+
+    campaign = create_campaign(
+        db, sender, "Offer for {{company}}", "Dear {{name}}",
+        recipients=[
+            {"email": "a@example.com", "name": "<script>alert(1)</script>", "company": "ACME\r\nBcc: evil@example.com"},
+            {"email": "A@example.com", "name": "dup"},
+            {"email": "not-an-email@", "name": "bad"},
+            {"email": "missing-at.example.com"},
+        ],
+    )
+
+    [email] = db.query(OutboundEmail).filter(OutboundEmail.campaign_id == campaign.id).all()
+    assert campaign.total == 1
+    assert email.subject == "Offer for ACME Bcc: evil@example.com"
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in email.html
+    assert "<script>" not in email.html
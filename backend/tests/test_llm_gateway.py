@@ -0,0 +1,212 @@
+"""LLM 게이트웨이 - 재시도 / 서킷 브레이커 / 사용자별 제한 / 동일 요청 공유 / 취소 시 슬롯 반납 (로컬 스텁 서버)"""
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.services import llm_gateway_service
+from app.services.llm_gateway_service import LLMGateway, LLMGatewayError, LLMRateLimitedError
+
+
+def _message(text: str) -> tuple[int, dict]:
+    return 200, {
+        "id": "msg_1", "type": "message", "role": "assistant", "model": "stub",
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn", "stop_sequence": None,
+        "usage": {"input_tokens": 3, "output_tokens": 1},
+    }
+
+
+def _error(status: int) -> tuple[int, dict]:
+    return status, {"type": "error", "error": {"type": "api_error", "message": f"stub {status}"}}
+
+
+def _sse(text: str) -> bytes:
+    events = [
+        ("message_start", {"type": "message_start", "message": {
+            "id": "msg_1", "type": "message", "role": "assistant", "model": "stub", "content": [],
+            "stop_reason": None, "stop_sequence": None, "usage": {"input_tokens": 3, "output_tokens": 0},
+        }}),
+        ("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}),
+        ("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}}),
+        ("content_block_stop", {"type": "content_block_stop", "index": 0}),
+        ("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None}, "usage": {"output_tokens": 1}}),
+        ("message_stop", {"type": "message_stop"}),
+    ]
+    return "".join(f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events).encode()
+
+
+class _Stub:
+    """/v1/messages 요청마다 responses 앞에서 하나씩 꺼내 응답 (비면 정상 응답, 스트림 요청은 SSE)"""
+
+    def __init__(self):
+        self.responses: list = []
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request: dict) -> tuple[int, str, bytes]:
+        with self._lock:
+            self.calls += 1
+            response = self.responses.pop(0) if self.responses else _message("ok")
+        if request.get("stream"):
+            return 200, "text/event-stream", _sse("streamed")
+        status, payload = response() if callable(response) else response
+        return status, "application/json", json.dumps(payload).encode()
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    stub = _Stub()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            status, content_type, body = stub.handle(request)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    for key, value in {
+        "anthropic_api_key": "test-key",
+        "anthropic_base_url": f"http://127.0.0.1:{server.server_port}",
+        "llm_max_concurrency": 1,
+        "llm_max_retries": 2,
+        "llm_retry_base_delay_seconds": 0.0,
+        "llm_queue_timeout_seconds": 5.0,
+        "llm_user_rate_per_minute": 0,
+        "llm_breaker_failure_threshold": 2,
+        "llm_breaker_reset_seconds": 30,
+    }.items():
+        monkeypatch.setattr(llm_gateway_service.settings, key, value)
+    yield stub
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def gateway(stub):
+    return LLMGateway()
+
+
+def _create(gw: LLMGateway, content: str = "hello", user_key: str | None = None) -> str:
+    return gw.create(system="sys", messages=[{"role": "user", "content": content}], max_tokens=16, user_key=user_key)
+
+
+def test_retries_429_and_5xx_then_succeeds(gateway, stub):
+    stub.responses = [_error(429), _error(529)]
+
+    assert _create(gateway) == "ok"
+    assert stub.calls == 3
+    assert gateway.metrics()["retries"] == 2
+    assert gateway.metrics()["circuit"] == "closed"
+
+
+def test_non_retryable_error_is_not_retried(gateway, stub):
+    stub.responses = [_error(400)]
+
+    with pytest.raises(LLMGatewayError):
+        _create(gateway)
+    assert stub.calls == 1
+
+
+def test_circuit_opens_then_half_open_trial_closes_it(gateway, stub, monkeypatch):
+    monkeypatch.setattr(llm_gateway_service.settings, "llm_max_retries", 0)
+    stub.responses = [_error(500), _error(500)]
+    for _ in range(2):
+        with pytest.raises(LLMGatewayError):
+            _create(gateway)
+
+    # 오픈 상태: API 호출 없이 즉시 실패
+    with pytest.raises(LLMGatewayError) as exc:
+        _create(gateway)
+    assert exc.value.reason == "circuit_open"
+    assert stub.calls == 2
+
+    # 리셋 시간 경과 → half-open: 시험 호출은 1건만 통과
+    gateway._breaker._opened_at -= 30
+    assert gateway.metrics()["circuit"] == "half_open"
+    assert gateway._breaker.allow() and not gateway._breaker.allow()
+    gateway._breaker.release_trial()
+
+    # 시험 호출 실패 → 다시 오픈
+    stub.responses = [_error(503)]
+    with pytest.raises(LLMGatewayError):
+        _create(gateway)
+    assert gateway.metrics()["circuit"] == "open"
+
+    # 시험 호출 성공 → 닫힘
+    gateway._breaker._opened_at -= 30
+    assert _create(gateway) == "ok"
+    assert gateway.metrics()["circuit"] == "closed"
+
+
+def test_per_user_rate_limit(gateway, stub, monkeypatch):
+    monkeypatch.setattr(llm_gateway_service.settings, "llm_user_rate_per_minute", 2)
+
+    assert _create(gateway, user_key="user:a") == "ok"
+    assert _create(gateway, user_key="user:a") == "ok"
+    with pytest.raises(LLMRateLimitedError):
+        _create(gateway, user_key="user:a")
+    assert _create(gateway, user_key="user:b") == "ok"  # 다른 사용자는 별도 한도
+    assert stub.calls == 3
+
+
+def test_identical_requests_share_one_call(gateway, stub):
+    entered, release = threading.Event(), threading.Event()
+
+    def slow():
+        entered.set()
+        release.wait(5)
+        return _message("shared")
+
+    stub.responses = [slow]
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(_create(gateway))) for _ in range(2)]
+    threads[0].start()
+    assert entered.wait(5)
+    threads[1].start()
+    deadline = time.monotonic() + 5
+    while gateway.metrics()["coalesced"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert results == ["shared", "shared"]
+    assert stub.calls == 1
+    assert gateway.metrics()["coalesced"] == 1
+
+
+def test_cancelled_stream_waiter_releases_slot(gateway, stub):
+    async def consume() -> str:
+        return "".join([text async for text in gateway.stream(
+            system="sys", messages=[{"role": "user", "content": "hi"}], max_tokens=16,
+        )])
+
+    async def scenario():
+        assert gateway._semaphore.acquire(timeout=1)  # 슬롯 점유 → 스트림 요청은 대기
+        waiting = asyncio.create_task(consume())
+        await asyncio.sleep(0.1)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        # 취소 후 대기 스레드가 슬롯을 얻으면 즉시 반납해야 함
+        gateway._semaphore.release()
+        await asyncio.sleep(0.2)
+        return await asyncio.wait_for(consume(), 5)
+
+    assert asyncio.run(scenario()) == "streamed"
+    assert stub.calls == 1
+    assert gateway._semaphore.acquire(blocking=False)  # 슬롯 누수 없음
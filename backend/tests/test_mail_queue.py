@@ -0,0 +1,143 @@
+"""발송 메일 큐 - 메일 단위 오류는 그 메일에만, 연결 오류는 시도하지 않은 메일을 그대로 큐로 (연결 불가면 묶음 전체 + 백오프)"""
+import smtplib
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.models.outbound_email import OutboundEmail, EmailDeadLetter
+from app.services import mail_queue_service
+from app.services.mail_queue_service import MailQueue
+
+
+class _FakeConnection:
+    def __init__(self, outcomes: dict):
+        self.outcomes = outcomes  # 수신자 → 발생시킬 예외
+        self.sent: list[str] = []
+        self.closed = 0
+
+    def send(self, msg):
+        error = self.outcomes.get(msg["To"])
+        if error:
+            raise error
+        self.sent.append(msg["To"])
+
+    def close(self):
+        self.closed += 1
+
+
+@pytest.fixture
+def queue(db, monkeypatch):
+    monkeypatch.setattr(mail_queue_service, "SessionLocal", sessionmaker(bind=db.get_bind(), autoflush=False))
+    q = MailQueue()
+    for i in range(4):
+        db.add(OutboundEmail(id=f"m{i}", to_email=f"r{i}@x.com", subject="s", html="<p>h</p>", from_header="a@x.com"))
+    db.commit()
+    return q
+
+
+def _rows(db) -> dict[str, OutboundEmail]:
+    db.expire_all()
+    return {e.to_email: e for e in db.query(OutboundEmail)}
+
+
+def test_per_message_errors_do_not_abort_batch(db, queue):
+    queue._conn = _FakeConnection({
+        "r1@x.com": smtplib.SMTPSenderRefused(451, b"try later", "a@x.com"),
+        "r2@x.com": smtplib.SMTPNotSupportedError("SMTPUTF8 not supported"),
+    })
+    assert queue.drain_once() == 4
+    rows = _rows(db)
+    assert queue._conn.sent == ["r0@x.com", "r3@x.com"]
+    assert queue._conn.closed == 0
+    assert (rows["r1@x.com"].status, rows["r1@x.com"].attempts) == ("queued", 1)
+    assert rows["r2@x.com"].status == "dead"
+    assert db.query(EmailDeadLetter).count() == 1
+
+
+def test_connection_error_requeues_untried_without_attempt(db, queue):
+    queue._conn = _FakeConnection({"r1@x.com": ConnectionResetError("reset by peer")})
+    assert queue.drain_once() == 0
+    rows = _rows(db)
+    assert rows["r0@x.com"].status == "sent"
+    assert (rows["r1@x.com"].status, rows["r1@x.com"].attempts) == ("queued", 1)
+    for untried in ("r2@x.com", "r3@x.com"):
+        assert (rows[untried].status, rows[untried].attempts, rows[untried].claimed_by) == ("queued", 0, None)
+    assert queue._conn.closed == 1
+
+
+def test_smtp_unavailable_requeues_whole_batch_and_backs_off(db, queue, monkeypatch):
+    monkeypatch.setattr(mail_queue_service.settings, "email_poll_seconds", 5)
+    monkeypatch.setattr(mail_queue_service.settings, "email_connect_backoff_max_seconds", 12)
+    down = mail_queue_service.SMTPUnavailable("connect failed: refused")
+    queue._conn = _FakeConnection({f"r{i}@x.com": down for i in range(4)})
+
+    assert queue.drain_once() == 0
+    rows = _rows(db)
+    # 서버에 넘기지 못했으므로 첫 메일도 시도 횟수 없이 큐로
+    assert {(e.status, e.attempts, e.claimed_by) for e in rows.values()} == {("queued", 0, None)}
+    assert queue._next_wait == 5
+
+    # 대기 중에는 깨워져도 선점하지 않음
+    queue._conn.outcomes.clear()
+    assert queue.drain_once() == 0 and queue._conn.sent == []
+    assert {e.status for e in _rows(db).values()} == {"queued"}
+
+    # 연속 실패마다 대기 두 배, 상한 적용
+    queue._conn.outcomes = {"r0@x.com": down}
+    for expected in (10, 12):
+        queue._connect_retry_at = 0.0
+        assert queue.drain_once() == 0
+        assert queue._next_wait == expected
+
+    # 연결되면 발송하고 실패 횟수 초기화
+    queue._conn.outcomes.clear()
+    queue._connect_retry_at = 0.0
+    assert queue.drain_once() == 4
+    assert queue._connect_failures == 0
+    assert {(e.status, e.attempts) for e in _rows(db).values()} == {("sent", 1)}
+
+
+def test_requeued_dead_letter_keeps_campaign(db, queue, monkeypatch):
+    monkeypatch.setattr(queue, "_ensure_started", lambda: None)
+    monkeypatch.setattr(mail_queue_service.settings, "email_campaign_rate_per_minute", 0)
+    db.query(OutboundEmail).filter(OutboundEmail.id == "m1").update({"campaign_id": "c1"}, synchronize_session=False)
+    db.commit()
+    queue._conn = _FakeConnection({"r1@x.com": smtplib.SMTPRecipientsRefused({"r1@x.com": (550, b"no such user")})})
+    queue.drain_once()
+    letter = db.query(EmailDeadLetter).one()
+
+    email_id = queue.requeue_dead_letter(db, letter)
+    row = _rows(db)["r1@x.com"]
+    assert (email_id, row.status, row.attempts, row.campaign_id) == ("m1", "queued", 0, "c1")
+    # 같은 수신자가 dead + queued로 두 번 집계되지 않음
+    assert db.query(OutboundEmail).filter(OutboundEmail.campaign_id == "c1").count() == 1
+
+
+def test_start_releases_previous_process_claims(db, queue, monkeypatch):
+    from datetime import datetime
+    monkeypatch.setattr(queue, "_ensure_started", lambda: None)
+    now = datetime.utcnow()
+    # 같은 워커 ID의 이전 프로세스 / 아직 살아 있을 수 있는 다른 워커가 방금 잡은 항목
+    db.query(OutboundEmail).filter(OutboundEmail.id.in_(["m0", "m1"])).update(
+        {"status": "sending", "claimed_by": f"{queue._prefix}-{'0' * 24}", "claimed_at": now}, synchronize_session=False,
+    )
+    db.query(OutboundEmail).filter(OutboundEmail.id == "m2").update(
+        {"status": "sending", "claimed_by": f"ffffffff-{'0' * 24}", "claimed_at": now}, synchronize_session=False,
+    )
+    db.commit()
+
+    queue.start()
+    rows = _rows(db)
+    assert [rows[f"r{i}@x.com"].status for i in range(3)] == ["queued", "queued", "sending"]
+
+
+@pytest.mark.parametrize("overrides, expected", [
+    ({}, False),
+    ({"smtp_user": "u@x.com", "smtp_password": "pw"}, True),
+    ({"smtp_auth": False, "smtp_from_email": "noreply@x.com"}, True),
+    ({"smtp_auth": False}, False),
+    ({"smtp_host": "", "smtp_user": "u@x.com", "smtp_password": "pw"}, False),
+])
+def test_smtp_configured(monkeypatch, overrides, expected):
+    base = {"smtp_host": "smtp.example.com", "smtp_auth": True, "smtp_user": "", "smtp_password": "", "smtp_from_email": ""}
+    for key, value in {**base, **overrides}.items():
+        monkeypatch.setattr(mail_queue_service.settings, key, value)
+    assert mail_queue_service.smtp_configured() is expected
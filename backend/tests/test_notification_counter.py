@@ -0,0 +1,66 @@
+"""읽지 않은 알림 카운터 - 최초 조회 초기화가 충돌 없이 동작하고 호출자 트랜잭션을 커밋하지 않아야 함"""
+from sqlalchemy import insert
+from app.models.notification import Notification, NotificationCounter
+from app.models.user import User
+from app.services.notification_service import get_unread_count
+
+
+def _seed(db, unread=3):
+    db.add(User(id="u1", email="u1@x.com", hashed_password="x", full_name="U1"))
+    for i in range(unread):
+        db.add(Notification(user_id="u1", title=f"t{i}", message="m"))
+    db.commit()
+
+
+def test_first_read_initializes_without_commit(db):
+    _seed(db)
+    assert get_unread_count(db, "u1") == 3
+    db.rollback()
+    assert db.get(NotificationCounter, "u1") is None
+
+
+def test_concurrent_initialization_keeps_existing_row(db):
+    _seed(db)
+    # 다른 요청이 먼저 카운터를 만든 상황 (이 세션의 identity map에는 없음)
+    db.execute(insert(NotificationCounter).values(user_id="u1", unread_count=5))
+    db.expunge_all()
+    real_get = db.get
+    calls = []
+
+    def first_get_misses(entity, ident, **kw):
+        calls.append(ident)
+        return None if len(calls) == 1 else real_get(entity, ident, **kw)
+
+    db.get = first_get_misses
+    assert get_unread_count(db, "u1") == 5
+    db.commit()
+    assert db.query(NotificationCounter).count() == 1
+
+
+def test_mark_read_twice_decrements_once(db):
+    from app.services.notification_service import mark_read
+    _seed(db)
+    assert get_unread_count(db, "u1") == 3
+    db.commit()
+    notif_id = db.query(Notification.id).filter(Notification.user_id == "u1").first()[0]
+
+    mark_read(db, "u1", notif_id)
+    mark_read(db, "u1", notif_id)  # 페이지 클릭 + 다른 탭에서 같은 알림
+    db.expire_all()
+    assert db.get(NotificationCounter, "u1").unread_count == 2
+
+
+def test_counter_clamped_and_reconciled(db):
+    from app.services.notification_service import _bump_unread, reconcile_unread_counts
+    _seed(db)
+    db.execute(insert(NotificationCounter).values(user_id="u1", unread_count=1))
+    db.commit()
+    _bump_unread(db, ["u1"], -5)
+    db.commit()
+    db.expire_all()
+    assert db.get(NotificationCounter, "u1").unread_count == 0
+
+    assert reconcile_unread_counts(db) == 1
+    db.expire_all()
+    assert db.get(NotificationCounter, "u1").unread_count == 3
+    assert reconcile_unread_counts(db) == 0
@@ -0,0 +1,38 @@
+"""관리자 알림 팬아웃 - 중복 방지 키는 창이 지나면 정리되어야 함"""
+from app.services import notification_fanout_service as fanout_module
+from app.services.notification_fanout_service import NotificationFanout
+
+
+def test_recent_keys_pruned_after_window(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(fanout_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(fanout_module.settings, "low_stock_alert_window_minutes", 1)
+    f = NotificationFanout()
+    monkeypatch.setattr(f, "_process", lambda job: None)
+    monkeypatch.setattr(f, "_ensure_started", lambda: None)
+    monkeypatch.setattr(f._queue, "put", lambda job: None)
+
+    for i in range(100):
+        f.submit(dedupe_key=f"part-{i}", title="t", message="m")
+    assert len(f._recent_keys) == 100
+
+    clock[0] += 61
+    f.submit(dedupe_key="part-new", title="t", message="m")
+    assert list(f._recent_keys) == ["part-new"]
+
+
+def test_duplicate_within_window_is_dropped(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(fanout_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(fanout_module.settings, "low_stock_alert_window_minutes", 1)
+    f = NotificationFanout()
+    jobs = []
+    monkeypatch.setattr(f, "_process", jobs.append)
+    monkeypatch.setattr(fanout_module.settings, "notification_fanout_async", False)
+
+    f.submit(dedupe_key="a", title="t", message="m")
+    clock[0] += 30
+    f.submit(dedupe_key="a", title="t", message="m")
+    clock[0] += 31
+    f.submit(dedupe_key="a", title="t", message="m")
+    assert len(jobs) == 2
@@ -0,0 +1,34 @@
+"""아웃박스 읽기 - 아직 커밋 중일 수 있는 seq 빈 자리 앞에서 멈춤 (첫 페이지 포함)"""
+from datetime import datetime, timedelta
+from app.models.outbox import OutboxEvent
+from app.services.outbox_service import read_events
+
+
+def _event(seq: int, age_seconds: float = 0) -> OutboxEvent:
+    return OutboxEvent(
+        seq=seq, entity="parts", entity_id=f"p{seq}", op="insert", payload="{}",
+        created_at=datetime.utcnow() - timedelta(seconds=age_seconds),
+    )
+
+
+def test_first_page_stops_before_recent_gap(db):
+    # seq 1이 아직 커밋 전 (2만 보임)
+    db.add(_event(2))
+    db.commit()
+
+    page = read_events(db, after=0)
+    assert page["events"] == [] and page["next_after"] == 0 and page["has_more"]
+
+    db.add(_event(1))
+    db.commit()
+    page = read_events(db, after=0)
+    assert [e["seq"] for e in page["events"]] == [1, 2] and page["next_after"] == 2
+
+
+def test_old_gap_is_skipped(db):
+    # 보존 기간 삭제 / 롤백으로 생긴 빈 자리는 유예 시간이 지나면 건너뜀
+    db.add_all([_event(5, age_seconds=3600), _event(6, age_seconds=3600), _event(8)])
+    db.commit()
+
+    page = read_events(db, after=0)
+    assert [e["seq"] for e in page["events"]] == [5, 6] and page["next_after"] == 6 and page["has_more"]
@@ -0,0 +1,63 @@
+"""keyset 커서 페이지네이션 - 커서를 따라가면 끝까지 중복 없이 도달해야 함"""
+from sqlalchemy import text
+from app.models.activity_log import ActivityLog
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.pagination_service import paginate
+
+
+def _walk(query, columns, limit):
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = paginate(query, columns, limit=limit, cursor=cursor)
+        seen.extend(r.id for r in rows)
+        pages += 1
+        assert pages <= 20, "cursor did not advance"
+        if cursor is None:
+            return seen
+
+
+def test_activity_log_cursor_walks_to_end(db):
+    # 같은 초에 생성된 행들 (기존 server_default 경로에서 커서가 멈추던 경우)
+    for i in range(5):
+        db.add(ActivityLog(user_id="u", user_email="u@x.com", user_name="U", action="login"))
+    db.commit()
+
+    query = db.query(ActivityLog)
+    ids = _walk(query, [ActivityLog.created_at, ActivityLog.id], limit=2)
+    assert len(ids) == 5
+    assert len(set(ids)) == 5
+
+
+def test_notification_cursor_walks_to_end(db):
+    db.add(User(id="u1", email="u1@x.com", hashed_password="x", full_name="U1"))
+    for i in range(7):
+        db.add(Notification(user_id="u1", title=f"t{i}", message="m"))
+    db.commit()
+
+    query = db.query(Notification).filter(Notification.user_id == "u1")
+    ids = _walk(query, [Notification.created_at, Notification.id], limit=3)
+    assert sorted(ids) == sorted(n.id for n in query.all())
+
+
+def test_cursor_stored_format_matches_binding(db):
+    db.add(ActivityLog(user_id="u", user_email="u@x.com", user_name="U", action="login"))
+    db.commit()
+    stored = db.execute(text("SELECT created_at FROM activity_logs")).scalar()
+    assert "." in stored  # 마이크로초까지 저장 - 커서 바인딩 형식과 동일
+
+
+def test_missing_indexes_created_on_existing_tables(db):
+    from sqlalchemy import inspect
+    from app.database import ensure_indexes
+
+    engine = db.get_bind()
+    # 인덱스 도입 전에 만들어진 테이블
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_notifications_user_created"))
+        conn.execute(text("DROP INDEX ix_customers_created_at"))
+
+    ensure_indexes(engine)
+    ensure_indexes(engine)  # 이미 있으면 그대로
+    assert "ix_notifications_user_created" in {i["name"] for i in inspect(engine).get_indexes("notifications")}
+    assert "ix_customers_created_at" in {i["name"] for i in inspect(engine).get_indexes("customers")}
@@ -0,0 +1,33 @@
+"""부품 검색 - PostgreSQL pg_trgm 쿼리가 인덱스 표현식 그대로 컴파일되어야 함"""
+from sqlalchemy.dialects import postgresql
+from app.services.part_search_service import _pg_trgm_query, _PG_SEARCH_EXPR
+
+
+def test_pg_trgm_query_compiles_for_postgresql(db):
+    query = _pg_trgm_query(db, ["GT1749", "터빈"], limit=15, brand="Garrett", category=None)
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    assert f"{_PG_SEARCH_EXPR} ILIKE" in sql
+    assert sql.count("word_similarity(") == 2
+    assert f", {_PG_SEARCH_EXPR})" in sql
+    assert "parts.brand =" in sql
+    assert "ORDER BY" in sql and "LIMIT" in sql
+
+
+def test_fts5_short_terms_are_not_dropped(db, monkeypatch):
+    from app.models.part import Part
+    from app.services import part_search_service
+    from app.services.part_search_service import ensure_search_index, search_part_ids
+
+    monkeypatch.setattr(part_search_service, "_backend", None)  # 테스트 후 원래 값으로 복원
+    ensure_search_index(db.get_bind())
+    assert part_search_service._backend == "fts5"
+    db.add_all([
+        Part(id="p-nr", part_number="MAN-001", name="Nozzle ring", brand="MAN", turbo_model="NR 29", category="Nozzle Ring"),
+        Part(id="p-met", part_number="MHI-042", name="Bearing", brand="MHI", turbo_model="MET 42", category="Bearing"),
+    ])
+    db.commit()
+
+    assert set(search_part_ids(db, ["NR", "29"])) == {"p-nr"}
+    assert set(search_part_ids(db, ["NR", "MET"])) == {"p-nr", "p-met"}
+    assert search_part_ids(db, ["Nozzle"]) == ["p-nr"]  # 3자 이상만이면 FTS 랭킹
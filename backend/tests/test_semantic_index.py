@@ -0,0 +1,49 @@
+"""의미 검색 인덱스 - BM25 순위와 델타(추가/삭제) 반영"""
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.models.part import Part
+from app.services import semantic_index_service
+from app.services.semantic_index_service import SemanticIndex
+
+
+@pytest.fixture
+def index(db, monkeypatch, tmp_path):
+    monkeypatch.setattr(semantic_index_service.settings, "semantic_index_dir", str(tmp_path))
+    monkeypatch.setattr(semantic_index_service.settings, "semantic_index_refresh_seconds", 3600)
+    db.add_all([
+        Part(id="p-met", part_number="MHI-042", name="Journal bearing", brand="MHI", turbo_model="MET 42", category="Bearing"),
+        Part(id="p-mhi-nr", part_number="MHI-100", name="Nozzle ring", brand="MHI", turbo_model="MET 66", category="Nozzle Ring"),
+        Part(id="p-abb", part_number="ABB-200", name="Nozzle ring", brand="ABB", turbo_model="TPL 73", category="Nozzle Ring"),
+    ])
+    db.commit()
+    return SemanticIndex()
+
+
+def _keys(hits):
+    return [key for key, _, _ in hits]
+
+
+def test_bm25_ranks_brand_synonym_and_category(db, index):
+    hits = index.search(db, "bearing wear on our Mitsubishi turbo")
+
+    # mitsubishi → mhi 동의어, bearing까지 맞는 문서가 가장 위
+    assert _keys(hits)[:2] == ["parts:p-met", "parts:p-mhi-nr"]
+    assert "parts:p-abb" not in _keys(hits)
+    assert hits[0][2] > hits[1][2] > 0
+
+
+def test_delta_add_and_delete(db, index):
+    assert _keys(index.search(db, "TPL")) == ["parts:p-abb"]
+
+    db.add(Part(id="p-tpl", part_number="ABB-300", name="Turbine blade", brand="ABB", turbo_model="TPL 85", category="Turbine"))
+    db.delete(db.get(Part, "p-abb"))
+    db.commit()
+    index.add_pending({("parts", "p-tpl"), ("parts", "p-abb")})
+
+    # 재빌드 없이 델타 세그먼트로 반영
+    built_at = index._segment.built_at
+    assert _keys(index.search(db, "TPL")) == ["parts:p-tpl"]
+    assert index._segment.built_at == built_at
+    assert "parts:p-abb" in index._deleted
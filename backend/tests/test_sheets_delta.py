@@ -0,0 +1,160 @@
+"""Sheets 증분 동기화 엔진 - 제자리 갱신 / 삭제 행을 꼬리 행으로 채움 / 행 수 확장 / 요청 묶음 / 실패 시 인덱스 초기화"""
+import re
+import pytest
+from app.config import get_settings
+from app.models.part import Part
+from app.models.sheet_sync import SheetRowIndex
+from app.services.google_sheets_service import SHEETS, plan_sheet, sync_sheet, _pool
+
+SPEC = SHEETS["parts"]
+_RANGE_RE = re.compile(r"A(\d+):[A-Z]+(\d+)$")
+
+
+class _APIError(Exception):
+    def __init__(self, code: int):
+        super().__init__(f"API error {code}")
+        self.code = code
+
+
+class _Worksheet:
+    """gspread Worksheet 흉내 - 그리드 크기(row_count)를 넘는 쓰기는 API처럼 거부"""
+
+    def __init__(self, spreadsheet, row_count: int):
+        self.spreadsheet, self.row_count = spreadsheet, row_count
+
+    def update(self, range_name, values):
+        self.spreadsheet.cells[1] = values[0]
+
+    def add_rows(self, n):
+        self.row_count += n
+
+    def batch_clear(self, ranges):
+        for r in ranges:
+            first, last = map(int, _RANGE_RE.search(r).groups())
+            for n in range(first, last + 1):
+                self.spreadsheet.cells.pop(n, None)
+
+
+class _Spreadsheet:
+    id = "sheet-delta-test"
+
+    def __init__(self, row_count: int = 1000):
+        self.ws = _Worksheet(self, row_count)
+        self.cells: dict[int, list] = {}
+        self.batches: list[list[str]] = []
+        self.fail_with: Exception | None = None
+
+    def worksheet(self, title):
+        return self.ws
+
+    def values_batch_update(self, body):
+        if self.fail_with:
+            raise self.fail_with
+        self.batches.append([d["range"] for d in body["data"]])
+        for d in body["data"]:
+            first, last = map(int, _RANGE_RE.search(d["range"]).groups())
+            assert last <= self.ws.row_count, "exceeds grid limits"
+            for n, row in zip(range(first, last + 1), d["values"]):
+                self.cells[n] = row
+
+    def keys(self) -> list[str]:
+        """2행부터 마지막 행까지 ID 열 (빈 행은 None)"""
+        last = max(self.cells, default=1)
+        return [self.cells[n][-1] if n in self.cells else None for n in range(2, last + 1)]
+
+
+@pytest.fixture(autouse=True)
+def _no_throttle(monkeypatch):
+    monkeypatch.setattr(get_settings(), "google_sheets_requests_per_minute", 0)
+    _pool.clear()
+    yield
+    _pool.clear()
+
+
+def _seed(db, n: int):
+    db.add_all(
+        Part(id=f"p{i}", part_number=f"PN-{i}", name=f"Part {i}", brand="MAN", turbo_model="NR29/S", category="Nozzle Ring")
+        for i in range(1, n + 1)
+    )
+    db.commit()
+
+
+def _row_of(spreadsheet: _Spreadsheet, key: str) -> int:
+    return spreadsheet.keys().index(key) + 2
+
+
+def test_changed_row_updated_in_place(db):
+    _seed(db, 5)
+    sheet = _Spreadsheet()
+    assert sync_sheet(db, sheet, SPEC).mode == "full"
+    row = _row_of(sheet, "p3")
+
+    db.get(Part, "p3").name = "Renamed"
+    db.commit()
+    result = sync_sheet(db, sheet, SPEC)
+
+    assert (result.mode, result.updated, result.added, result.removed) == ("delta", 1, 0, 0)
+    assert result.ranges == [f"'{SPEC.title}'!A{row}:K{row}"]
+    assert sheet.cells[row][1] == "Renamed"
+
+
+def test_deleted_row_refilled_from_tail(db):
+    _seed(db, 5)
+    sheet = _Spreadsheet()
+    sync_sheet(db, sheet, SPEC)
+    hole, tail_key = _row_of(sheet, "p2"), sheet.keys()[-1]
+
+    db.delete(db.get(Part, "p2"))
+    db.commit()
+    result = sync_sheet(db, sheet, SPEC)
+
+    assert (result.removed, result.moved, result.rows) == (1, 1, 4)
+    # 마지막 행이 빈 자리로 옮겨지고 꼬리 행은 비워져 데이터 영역이 연속
+    assert sheet.cells[hole][-1] == tail_key
+    assert sorted(sheet.keys()) == ["p1", "p3", "p4", "p5"]
+    index = dict(db.query(SheetRowIndex.row_key, SheetRowIndex.row_number).filter(SheetRowIndex.sheet == SPEC.title))
+    assert index == {key: _row_of(sheet, key) for key in sheet.keys()}
+
+
+def test_grows_sheet_past_row_count(db):
+    _seed(db, 3)
+    sheet = _Spreadsheet(row_count=4)
+    sync_sheet(db, sheet, SPEC)
+    assert sheet.ws.row_count == 4
+
+    db.add_all(Part(id=f"n{i}", part_number=f"NEW-{i}", name="New", brand="ABB", turbo_model="TPL", category="Bearing") for i in range(3))
+    db.commit()
+    result = sync_sheet(db, sheet, SPEC)
+
+    assert result.added == 3
+    assert sheet.ws.row_count == 7
+    assert len(sheet.keys()) == 6 and None not in sheet.keys()
+
+
+def test_writes_batched_by_batch_rows(db, monkeypatch):
+    monkeypatch.setattr(get_settings(), "google_sheets_batch_rows", 2)
+    _seed(db, 5)
+    sheet = _Spreadsheet()
+    sync_sheet(db, sheet, SPEC)
+
+    rows_per_request = [
+        sum(int(last) - int(first) + 1 for first, last in (_RANGE_RE.search(r).groups() for r in batch))
+        for batch in sheet.batches
+    ]
+    assert rows_per_request == [2, 2, 1]
+
+
+def test_index_reset_when_api_fails(db):
+    _seed(db, 3)
+    sheet = _Spreadsheet()
+    sync_sheet(db, sheet, SPEC)
+
+    db.get(Part, "p1").name = "Changed"
+    db.commit()
+    sheet.fail_with = _APIError(400)
+    with pytest.raises(_APIError):
+        sync_sheet(db, sheet, SPEC)
+
+    # 일부만 반영됐을 수 있으므로 인덱스를 버리고 다음 동기화는 전체 재작성
+    assert db.query(SheetRowIndex).filter(SheetRowIndex.sheet == SPEC.title).count() == 0
+    assert plan_sheet(db, SPEC).result.mode == "full"
@@ -0,0 +1,36 @@
+"""Sheets 행 인덱스 해시 버전 - 예전 방식 인덱스로는 가져오기를 하지 않고 내보내기는 전체 재작성"""
+from datetime import datetime
+from app.models.part import Part
+from app.models.sheet_sync import SheetRowIndex
+from app.services.google_sheets_service import SHEETS, plan_sheet, commit_plan, index_is_current
+from app.services.sheets_import_service import import_parts_sheet
+
+TITLE = SHEETS["parts"].title
+
+
+class _NoApi:
+    def __getattr__(self, name):
+        raise AssertionError(f"Sheets API must not be called ({name})")
+
+
+def _seed_legacy_index(db):
+    db.add(Part(id="p1", part_number="PN-1", name="Nozzle", brand="MAN", turbo_model="NR29/S", category="Nozzle Ring"))
+    # 해시 버전 기록이 없는 (정규화 도입 전) 인덱스
+    db.add(SheetRowIndex(sheet=TITLE, row_key="p1", row_number=2, row_hash="0" * 32, synced_at=datetime.utcnow()))
+    db.commit()
+
+
+def test_import_skipped_for_legacy_index(db):
+    _seed_legacy_index(db)
+    stats = import_parts_sheet(db, _NoApi(), policy="sheet")
+    assert stats["index_outdated"] == 1
+
+
+def test_export_rewrites_legacy_index_in_full(db):
+    _seed_legacy_index(db)
+    plan = plan_sheet(db, SHEETS["parts"])
+    assert plan.result.mode == "full"
+
+    commit_plan(db, plan)
+    assert index_is_current(db, TITLE)
+    assert plan_sheet(db, SHEETS["parts"]).result.mode == "delta"
@@ -0,0 +1,34 @@
+"""Sheets 가져오기 - 빈 단가 칸은 잘못된 행으로 건너뛰고 다른 행의 편집은 반영"""
+from app.models.part import Part
+from app.models.inventory import Inventory
+from app.services.google_sheets_service import SHEETS, plan_sheet, commit_plan
+from app.services.sheets_import_service import import_parts_sheet, _COLUMNS
+
+SPEC = SHEETS["parts"]
+
+
+class _Spreadsheet:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def values_batch_get(self, ranges, params=None):
+        return {"valueRanges": [{"values": self.rows}]}
+
+
+def test_blank_unit_price_is_invalid_and_does_not_roll_back_other_rows(db):
+    db.add_all([
+        Part(id="p1", part_number="PN-1", name="Nozzle", brand="MAN", turbo_model="NR29/S", category="Nozzle Ring", unit_price=120.0),
+        Part(id="p2", part_number="PN-2", name="Bearing", brand="MHI", turbo_model="MET42", category="Bearing", unit_price=80.0),
+    ])
+    db.commit()
+    commit_plan(db, plan_sheet(db, SPEC))  # 내보낸 상태의 행 인덱스
+    rows = {key: list(row) for key, row in SPEC.rows(db)}
+
+    rows["p1"][_COLUMNS["unit_price"]] = ""  # 단가 칸을 지움
+    rows["p2"][_COLUMNS["quantity"]] = 7
+    stats = import_parts_sheet(db, _Spreadsheet(list(rows.values())), policy="sheet")
+
+    assert stats["invalid"] == 1 and stats["applied"] == 1
+    db.expire_all()
+    assert db.get(Part, "p1").unit_price == 120.0
+    assert db.query(Inventory).filter(Inventory.part_id == "p2").one().quantity == 7
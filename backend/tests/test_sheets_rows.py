@@ -0,0 +1,80 @@
+"""Sheets 내보내기 행 생성기 - 행 수와 무관하게 SQL 문 수가 일정해야 함 (행별 조회 없음)"""
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import event, insert
+from app.models.customer import Customer
+from app.models.inquiry import Inquiry
+from app.models.inventory import Inventory
+from app.models.part import Part
+from app.models.service_order import ServiceOrder
+from app.services.google_sheets_service import _part_rows, _order_rows, _customer_rows, _inquiry_rows
+
+LARGE = 50_000
+
+
+def _seed(db, n: int):
+    now = datetime(2026, 1, 1)
+    db.execute(insert(Customer), [
+        {"id": f"c{i}", "company_name": f"Co {i}", "contact_name": "K", "email": f"c{i}@x.com", "country": "KR", "created_at": now}
+        for i in range(n)
+    ])
+    db.execute(insert(Part), [
+        {"id": f"p{i}", "part_number": f"PN-{i}", "name": "Nozzle", "brand": "MAN", "turbo_model": "NR29/S",
+         "category": "Nozzle Ring", "unit_price": 1.0, "created_at": now, "updated_at": now}
+        for i in range(n)
+    ])
+    # 절반만 재고 행이 있음 (LEFT JOIN 경로)
+    db.execute(insert(Inventory), [
+        {"id": f"v{i}", "part_id": f"p{i}", "quantity": i % 10, "min_quantity": 5, "warehouse": "Busan HQ", "last_updated": now}
+        for i in range(0, n, 2)
+    ])
+    # 고객이 없는 주문/문의 포함
+    db.execute(insert(ServiceOrder), [
+        {"id": f"o{i}", "customer_id": f"c{i}" if i % 3 else "missing", "order_type": "repair", "turbo_brand": "MAN",
+         "turbo_model": "NR29/S", "status": "pending", "created_at": now, "updated_at": now}
+        for i in range(n)
+    ])
+    db.execute(insert(Inquiry), [
+        {"id": f"q{i}", "customer_id": f"c{i}" if i % 2 else None, "subject": "s", "message": "m",
+         "contact_email": "q@x.com", "is_resolved": False, "created_at": now}
+        for i in range(n)
+    ])
+    db.commit()
+
+
+@contextmanager
+def _count_statements(db):
+    counter = {"n": 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter["n"] += 1
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _statements_for(db, rows_fn) -> tuple[int, int]:
+    with _count_statements(db) as counter:
+        produced = sum(1 for _ in rows_fn(db))
+    return counter["n"], produced
+
+
+_SHEETS = [_part_rows, _order_rows, _customer_rows, _inquiry_rows]
+
+
+def test_statement_count_constant(db):
+    _seed(db, 10)
+    small = {fn.__name__: _statements_for(db, fn) for fn in _SHEETS}
+    assert all(produced == 10 for _, produced in small.values())
+
+    for model in (Inquiry, ServiceOrder, Inventory, Part, Customer):
+        db.query(model).delete()
+    _seed(db, LARGE)
+    for fn in _SHEETS:
+        statements, produced = _statements_for(db, fn)
+        assert produced == LARGE
+        assert statements == small[fn.__name__][0], fn.__name__
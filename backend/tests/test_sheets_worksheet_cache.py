@@ -0,0 +1,57 @@
+"""Sheets 워크시트 핸들 캐시 - 전체 재작성은 시트의 실제 행 수를 다시 조회해 비워야 함"""
+from app.models.part import Part
+from app.services.google_sheets_service import SHEETS, sync_sheet, _pool
+
+
+class _Server:
+    def __init__(self, rows):
+        self.rows = rows
+
+
+class _Worksheet:
+    """gspread Worksheet처럼 조회 시점의 행 수를 들고 있는 핸들"""
+
+    def __init__(self, server):
+        self.server, self.row_count, self.cleared = server, server.rows, []
+
+    def update(self, range_name, values):
+        pass
+
+    def add_rows(self, n):
+        self.server.rows += n
+        self.row_count = self.server.rows
+
+    def batch_clear(self, ranges):
+        self.cleared.extend(ranges)
+
+
+class _Spreadsheet:
+    id = "sheet-cache-test"
+
+    def __init__(self):
+        self.server = _Server(1000)
+        self.handles = []
+
+    def worksheet(self, title):
+        self.handles.append(_Worksheet(self.server))
+        return self.handles[-1]
+
+    def values_batch_update(self, body):
+        pass
+
+
+def test_full_sync_refreshes_row_count(db):
+    db.add(Part(id="p1", part_number="PN-1", name="Nozzle", brand="MAN", turbo_model="NR29/S", category="Nozzle Ring"))
+    db.commit()
+    spreadsheet = _Spreadsheet()
+    spec = SHEETS["parts"]
+    _pool.clear()
+    try:
+        sync_sheet(db, spreadsheet, spec, full=True)
+        # 누군가 시트에 행을 추가함 (캐시된 핸들은 모름)
+        spreadsheet.server.rows = 1500
+        sync_sheet(db, spreadsheet, spec, full=True)
+    finally:
+        _pool.clear()
+
+    assert spreadsheet.handles[-1].cleared == ["A2:K1500"]
@@ -146,6 +146,9 @@ export default function ActivityLogPage() {
                   <div>
                     <p className="text-sm font-medium text-gray-800">{u.user_name}</p>
                     <p className="text-xs text-gray-500">{u.user_email}</p>
+                    {u.last_seen && (
+                      <p className="text-xs text-gray-400">Last seen {formatDate(u.last_seen)}</p>
+                    )}
                   </div>
                 </div>
               ))}
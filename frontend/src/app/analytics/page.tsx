@@ -9,6 +9,7 @@ import {
   getInventoryValue,
   getLowStockSummary,
   syncToSheets,
+  getSyncJob,
 } from "@/lib/api";
 import {
   BarChart,
@@ -87,8 +88,14 @@ function AnalyticsContent() {
             onClick={async () => {
               setSyncing(true);
               try {
-                const res = await syncToSheets();
-                alert(`Google Sheets Sync Complete!\nParts: ${res.parts}, Orders: ${res.orders}, Customers: ${res.customers}, Inquiries: ${res.inquiries}`);
+                let job = await syncToSheets();
+                while (job.status === "queued" || job.status === "running") {
+                  await new Promise((r) => setTimeout(r, 2000));
+                  job = await getSyncJob(job.id);
+                }
+                if (job.status === "failed") throw new Error(`Sync failed: ${job.error}`);
+                const p = job.progress;
+                alert(`Google Sheets Sync Complete!\nParts: ${p.parts?.rows}, Orders: ${p.orders?.rows}, Customers: ${p.customers?.rows}, Inquiries: ${p.inquiries?.rows}`);
               } catch (e: any) {
                 alert(e.message || "Sync failed");
               } finally {
@@ -1,7 +1,7 @@
 "use client";
 
 import { useState, useRef, useEffect } from "react";
-import { sendChatMessage } from "@/lib/api";
+import { streamChatMessage } from "@/lib/api";
 import { useI18n } from "@/lib/i18n";
 
 interface Message {
@@ -26,9 +26,11 @@ export default function ChatbotPage() {
   const [input, setInput] = useState("");
   const [loading, setLoading] = useState(false);
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const conversationIdRef = useRef<string | null>(null);  // 서버 저장 대화 ID
 
-  // 언어 변경 시 초기 메시지 갱신
+  // 언어 변경 시 초기 메시지 갱신 (새 대화 시작)
   useEffect(() => {
+    conversationIdRef.current = null;
     setMessages([
       {
         role: "assistant",
@@ -51,12 +53,20 @@ export default function ChatbotPage() {
     setLoading(true);
 
     try {
-      const history = messages.map((m) => ({
-        role: m.role,
-        content: m.content,
-      }));
-      const { response } = await sendChatMessage(userMsg.content, history, lang);
-      setMessages((prev) => [...prev, { role: "assistant", content: response }]);
+      let started = false;
+      const conversationId = await streamChatMessage(userMsg.content, conversationIdRef.current, lang, (delta) => {
+        if (!started) {
+          started = true;
+          setLoading(false);
+          setMessages((prev) => [...prev, { role: "assistant", content: delta }]);
+          return;
+        }
+        setMessages((prev) => {
+          const last = prev[prev.length - 1];
+          return [...prev.slice(0, -1), { ...last, content: last.content + delta }];
+        });
+      });
+      if (conversationId) conversationIdRef.current = conversationId;
     } catch {
       setMessages((prev) => [
         ...prev,
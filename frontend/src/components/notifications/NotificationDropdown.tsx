@@ -1,7 +1,7 @@
 "use client";
 
 import { useState, useEffect, useRef } from "react";
-import { getNotifications, getUnreadCount, markNotificationRead, markAllNotificationsRead } from "@/lib/api";
+import { getNotifications, markNotificationRead, markAllNotificationsRead, subscribeNotifications } from "@/lib/api";
 
 export default function NotificationDropdown() {
   const [isOpen, setIsOpen] = useState(false);
@@ -9,11 +9,12 @@ export default function NotificationDropdown() {
   const [unreadCount, setUnreadCount] = useState(0);
   const dropdownRef = useRef<HTMLDivElement>(null);
 
-  // Poll for unread count every 30 seconds
+  // Server-Sent Events: unread count + new notifications pushed by the server
   useEffect(() => {
-    fetchUnreadCount();
-    const interval = setInterval(fetchUnreadCount, 30_000);
-    return () => clearInterval(interval);
+    return subscribeNotifications(
+      (count) => setUnreadCount(count),
+      (notification) => setNotifications(prev => [{ ...notification, is_read: false, created_at: new Date().toISOString() }, ...prev]),
+    );
   }, []);
 
   // Close dropdown when clicking outside
@@ -27,15 +28,6 @@ export default function NotificationDropdown() {
     return () => document.removeEventListener("mousedown", handleClickOutside);
   }, []);
 
-  async function fetchUnreadCount() {
-    try {
-      const data = await getUnreadCount();
-      setUnreadCount(data.count);
-    } catch {
-      // silent fail
-    }
-  }
-
   async function handleOpen() {
     setIsOpen(!isOpen);
     if (!isOpen) {
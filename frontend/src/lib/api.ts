@@ -146,6 +146,65 @@ export const markNotificationRead = (id: string) =>
 export const markAllNotificationsRead = () =>
   fetchAPI<any>("/notifications/read-all", { method: "PUT" });
 
+/**
+ * 알림 SSE 스트림 구독 (EventSource는 헤더를 보낼 수 없어 1회용 스트림 티켓을 쿼리로 전달)
+ * - 액세스 토큰은 URL에 넣지 않음 (접근 로그에 남음) → 연결/재연결마다 티켓을 새로 발급
+ * - "unread": { count }
+ * - "notification": { id, title, message, type, unread_count, ... }
+ * 반환값: 구독 해제 함수
+ */
+const STREAM_RETRY_MS = 5_000;
+
+export function subscribeNotifications(
+  onUnread: (count: number) => void,
+  onNotification?: (notification: any) => void,
+): () => void {
+  const token = typeof window !== "undefined" ? localStorage.getItem("yjt_token") : null;
+  if (!token) return () => {};
+
+  let source: EventSource | null = null;
+  let retryId: ReturnType<typeof setTimeout> | null = null;
+  let closed = false;
+
+  const retry = () => {
+    if (!closed) retryId = setTimeout(connect, STREAM_RETRY_MS);
+  };
+
+  async function connect() {
+    let ticket: string;
+    try {
+      ({ ticket } = await fetchAPI<{ ticket: string; expires_in: number }>("/notifications/stream-ticket", { method: "POST" }));
+    } catch {
+      retry();
+      return;
+    }
+    if (closed) return;
+
+    source = new EventSource(`${API_BASE}/notifications/stream?ticket=${encodeURIComponent(ticket)}`);
+    source.addEventListener("unread", (e) => {
+      onUnread(JSON.parse((e as MessageEvent).data).count);
+    });
+    source.addEventListener("notification", (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      onUnread(data.unread_count);
+      onNotification?.(data);
+    });
+    // 티켓은 1회용이라 브라우저 자동 재연결은 거부됨 → 직접 새 티켓으로 재연결
+    source.onerror = () => {
+      source?.close();
+      source = null;
+      retry();
+    };
+  }
+
+  connect();
+  return () => {
+    closed = true;
+    if (retryId) clearTimeout(retryId);
+    source?.close();
+  };
+}
+
 // ── Analytics ──
 export const getInventoryByBrand = () => fetchAPI<any[]>("/analytics/inventory-by-brand");
 export const getOrderStatusDist = () => fetchAPI<any[]>("/analytics/order-status-distribution");
@@ -154,20 +213,84 @@ export const getInventoryValue = () => fetchAPI<any[]>("/analytics/inventory-val
 export const getLowStockSummary = () => fetchAPI<any[]>("/analytics/low-stock-summary");
 
 // ── Chatbot (타임아웃 60초 - LLM 응답 대기, 다국어 지원) ──
-export const sendChatMessage = (message: string, history: any[], language: string = "ko") =>
-  fetchAPI<{ response: string }>("/chat", {
+export const sendChatMessage = (message: string, conversationId: string | null, language: string = "ko") =>
+  fetchAPI<{ response: string; conversation_id: string | null }>("/chat", {
     method: "POST",
-    body: JSON.stringify({ message, history, language }),
+    body: JSON.stringify({ message, conversation_id: conversationId, language }),
     timeout: CHAT_TIMEOUT,
   });
 
+/**
+ * 챗봇 스트리밍 (SSE) - 응답 조각이 도착할 때마다 onDelta 호출
+ * fetch + ReadableStream으로 POST 본문을 보낼 수 있게 직접 파싱
+ * 이전 대화는 서버가 보관하므로 새 메시지와 대화 ID만 전송, 완료 시 (새) 대화 ID 반환
+ */
+export async function streamChatMessage(
+  message: string,
+  conversationId: string | null,
+  language: string,
+  onDelta: (text: string) => void,
+): Promise<string | null> {
+  const controller = new AbortController();
+  const timeoutId = setTimeout(() => controller.abort(), CHAT_TIMEOUT);
+  const token = typeof window !== "undefined" ? localStorage.getItem("yjt_token") : null;
+  const headers: Record<string, string> = { "Content-Type": "application/json" };
+  if (token) headers["Authorization"] = `Bearer ${token}`;
+  try {
+    const res = await fetch(`${API_BASE}/chat/stream`, {
+      method: "POST",
+      headers,
+      body: JSON.stringify({ message, conversation_id: conversationId, language }),
+      signal: controller.signal,
+    });
+    if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const events = buffer.split("\n\n");
+      buffer = events.pop() || "";
+      for (const raw of events) {
+        const lines = raw.split("\n");
+        const event = lines.find((l) => l.startsWith("event: "))?.slice(7) || "message";
+        const data = lines.filter((l) => l.startsWith("data: ")).map((l) => l.slice(6)).join("\n");
+        if (event === "done") return data ? JSON.parse(data).conversation_id ?? null : null;
+        if (event === "error") throw new Error(JSON.parse(data).detail);
+        if (data) onDelta(JSON.parse(data).delta);
+      }
+    }
+    return null;
+  } finally {
+    clearTimeout(timeoutId);
+  }
+}
+
 // ── Sync ──
-export const syncToSheets = () =>
-  fetchAPI<any>("/sync/sheets", { method: "POST", timeout: 30_000 });
+// 동기화는 백그라운드 작업으로 실행 - 작업 ID를 받아 상태 조회
+export const syncToSheets = (full: boolean = false) =>
+  fetchAPI<any>(`/sync/sheets${full ? "?full=true" : ""}`, { method: "POST", timeout: 30_000 });
+export const getSyncJob = (jobId: string) => fetchAPI<any>(`/sync/jobs/${jobId}`);
+export const importFromSheets = () =>
+  fetchAPI<any>("/sync/sheets/import", { method: "POST", timeout: 30_000 });
+export const getSyncConflicts = (status: string = "open") =>
+  fetchAPI<any[]>(`/sync/conflicts?status=${status}`);
+export const resolveSyncConflict = (conflictId: string, use: "sheet" | "db") =>
+  fetchAPI<any>(`/sync/conflicts/${conflictId}/resolve`, { method: "POST", body: JSON.stringify({ use }) });
 
 // ── Email (관리자 전용) ──
 export const sendEmailToCustomer = (data: { to_email: string; subject: string; body: string }) =>
   fetchAPI<any>("/email/send", { method: "POST", body: JSON.stringify(data) });
+export const createEmailCampaign = (data: {
+  subject: string;
+  body: string;
+  recipients?: { email: string; name?: string; company?: string }[];
+  audience?: { source: "customers" | "vessel_users" | "order_customers"; country?: string; vessel_id?: string; order_status?: string };
+}) => fetchAPI<any>("/email/campaigns", { method: "POST", body: JSON.stringify(data), timeout: 60_000 });
+export const getEmailCampaign = (campaignId: string) => fetchAPI<any>(`/email/campaigns/${campaignId}`);
 
 // ── Inquiry AI Draft ──
 export const generateInquiryDraft = (inquiryId: string) =>